@@ -1,5 +1,7 @@
+import asyncio
 import operator
 import re # [추가] 정규표현식 사용 (파싱용)
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, List, Union, TypedDict
 
 # [Core 임포트]
@@ -7,15 +9,20 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.messages import BaseMessage
 from langchain_core.agents import AgentAction, AgentFinish
 from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables.config import run_in_executor
+from langchain_core.tools import BaseTool, StructuredTool, Tool
 from langchain_core.output_parsers import StrOutputParser 
 
 # [Graph 관련]
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+
+# [체크포인트]
+from database.checkpoint import get_checkpointer
+from config.settings import setting
 
 # [프로젝트 모듈]
 from services.llm.factory import get_llm
-from services.tools import get_all_tools
+from services.tools import get_all_tools, get_tool_map
 
 
 # ---------------------------------------------------------
@@ -32,8 +39,11 @@ def format_steps(intermediate_steps):
     return log
 
 # (2) ReActSingleInputOutputParser 대체 함수
-def parse_react_output(text: str) -> Union[AgentAction, AgentFinish]:
-    """LLM의 텍스트 출력을 분석해서 Action인지 Final Answer인지 판단"""
+# 예: Action: search_tool \n Action Input: 날씨  (한 응답에 여러 쌍이 올 수 있음)
+ACTION_PATTERN = re.compile(r"Action:[ \t]*(.*?)[ \t]*\n*[ \t]*Action Input:[ \t]*(.*)")
+
+def parse_react_output(text: str) -> Union[List[AgentAction], AgentFinish]:
+    """LLM의 텍스트 출력을 분석해서 Action 목록인지 Final Answer인지 판단"""
     
     # 1. "Final Answer:"가 포함되어 있으면 종료 신호
     if "Final Answer:" in text:
@@ -42,19 +52,20 @@ def parse_react_output(text: str) -> Union[AgentAction, AgentFinish]:
             log=text
         )
     
-    # 2. "Action:"과 "Action Input:" 패턴 찾기 (정규표현식)
-    # 예: Action: search_tool \n Action Input: 날씨
-    regex = r"Action: (.*?)[\n]*Action Input: ([\s\S]*)"
-    match = re.search(regex, text, re.DOTALL)
+    # 2. "Action:"과 "Action Input:" 쌍을 모두 찾기 (서로 독립적인 도구 호출은 한 번에 여러 개)
+    # - Action Input 은 해당 줄까지만 사용 (LLM이 줄바꿈 뒤에 붙이는 말은 버림)
+    # - log 는 각 Action 구간으로 나눠 저장 → 스크래치패드에서 Action 마다 Observation 이 붙음
+    actions = []
+    last_end = 0
+    for match in ACTION_PATTERN.finditer(text):
+        log = text[last_end:match.end()] if last_end == 0 else text[last_end:match.end()].lstrip("\n")
+        action_input = match.group(2).strip().strip('"').strip()
+        actions.append(AgentAction(tool=match.group(1).strip(), tool_input=action_input, log=log))
+        last_end = match.end()
     
-    # 3. 매칭되면 도구 실행 신호 (AgentAction)
-    if match:
-        action = match.group(1).strip()
-        action_input = match.group(2)
-        # LLM이 가끔 멍청하게 줄바꿈 뒤에 이상한 말을 붙일 때 자르는 처리
-        if "\n" in action_input:
-             action_input = action_input.split("\n")[0].strip()
-        return AgentAction(tool=action, tool_input=action_input.strip(" ").strip('"'), log=text)
+    # 3. 매칭되면 도구 실행 신호 (AgentAction 목록, 출력 순서 유지)
+    if actions:
+        return actions
     
     # 4. 포맷이 안 맞으면 그냥 전체를 답변으로 처리 (에러 방지)
     return AgentFinish(
@@ -67,32 +78,57 @@ def parse_react_output(text: str) -> Union[AgentAction, AgentFinish]:
 # ---------------------------------------------------------
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
-    agent_outcome: Union[AgentAction, AgentFinish, None]
+    agent_outcome: Union[List[AgentAction], AgentFinish, None]
     intermediate_steps: Annotated[list, operator.add]
 
 # ---------------------------------------------------------
 # 3. 커스텀 도구 실행기 (Node)
 # ---------------------------------------------------------
-def execute_tools(state: AgentState):
-    print("🛠️ [Graph] 도구 실행 노드 진입")
-    agent_action = state["agent_outcome"]
-    tools = get_all_tools()
-    tool_map = {t.name: t for t in tools}
-    
-    output = None
-    if agent_action.tool in tool_map:
+# 동기 도구(get_kospi_index 등) 전용 스레드 풀 - 한 턴에 도구가 여러 개여도 동시 실행 수 제한
+_tool_executor = ThreadPoolExecutor(max_workers=setting.TOOL_MAX_WORKERS, thread_name_prefix="tool")
+
+def _is_async_tool(tool: BaseTool) -> bool:
+    """코루틴 구현이 있는 도구인지 (없으면 ainvoke 가 기본 스레드 풀로 넘기므로 직접 제한된 풀 사용)"""
+    tool = getattr(tool, "inner", tool)  # 결과 캐시 래퍼(CachedTool)는 원래 도구 기준
+    # @tool / StructuredTool / Tool 은 _arun 을 항상 재정의하므로 coroutine 유무로만 판단
+    if isinstance(tool, (StructuredTool, Tool)):
+        return tool.coroutine is not None
+    return type(tool)._arun is not BaseTool._arun
+
+def make_execute_tools(tool_map: dict):
+    """
+    도구 실행 노드 생성
+    - tool_map(이름 → 도구)은 그래프 컴파일 시 한 번만 만들어서 주입 (매 스텝 재생성 방지)
+    - 한 번의 LLM 응답에 담긴 여러 Action 을 동시에 실행 (async 도구는 그대로, 동기 도구는 _tool_executor)
+    - 결과는 Action 순서대로 intermediate_steps 에 추가
+    """
+    async def run_one(agent_action: AgentAction) -> str:
+        if agent_action.tool not in tool_map:
+            return f"Error: Tool '{agent_action.tool}' not found."
         tool_to_use = tool_map[agent_action.tool]
         try:
-            output = tool_to_use.invoke(agent_action.tool_input)
+            if _is_async_tool(tool_to_use):
+                output = await tool_to_use.ainvoke(agent_action.tool_input)
+            else:
+                # 실행 컨텍스트(콜백/트레이스)를 유지한 채 제한된 스레드 풀에서 실행
+                output = await run_in_executor(_tool_executor, tool_to_use.invoke, agent_action.tool_input)
         except Exception as e:
             output = f"Tool Error: {str(e)}"
-    else:
-        output = f"Error: Tool '{agent_action.tool}' not found."
-        
-    print(f"   -> 도구 결과: {str(output)[:50]}...")
-    return {
-        "intermediate_steps": [(agent_action, str(output))]
-    }
+        return str(output)
+
+    async def execute_tools(state: AgentState):
+        agent_actions = state["agent_outcome"]
+        print(f"🛠️ [Graph] 도구 실행 노드 진입 ({len(agent_actions)}개)")
+
+        outputs = await asyncio.gather(*(run_one(action) for action in agent_actions))
+
+        for action, output in zip(agent_actions, outputs):
+            print(f"   -> {action.tool} 결과: {output[:50]}...")
+        return {
+            "intermediate_steps": list(zip(agent_actions, outputs))
+        }
+
+    return execute_tools
 
 # ---------------------------------------------------------
 # 4. 그래프 생성 함수
@@ -100,6 +136,7 @@ def execute_tools(state: AgentState):
 def create_my_graph_agent():
     llm = get_llm()
     tools = get_all_tools()
+    tool_map = get_tool_map()
     
     tool_names = ", ".join([t.name for t in tools])
 
@@ -113,6 +150,7 @@ def create_my_graph_agent():
     [생각의 과정 가이드]
     1. 사용자의 질문을 해결하는 데 도구가 필요한지 생각합니다.
     2. 도구가 필요하다면 'Action'과 'Action Input'을 출력합니다.
+       서로 결과에 의존하지 않는 도구가 여러 개 필요하면 'Action'/'Action Input' 쌍을 연속으로 모두 출력합니다. (동시에 실행됩니다)
     3. 도구 사용 결과(Observation)가 나오면, 그것을 보고 최종 답변(Final Answer)을 합니다.
     
     [출력 형식 예시 - 반드시 이 형식을 지키세요!]
@@ -125,9 +163,22 @@ def create_my_graph_agent():
     Thought: 도구 결과를 보니 3건이 검색되었네. 이걸 사용자에게 알려주자.
     Final Answer: SCM팀의 진행중인 요청은 총 3건입니다. 주요 내용은...
     
+    [여러 도구를 한 번에 쓰는 예시]
+    
+    Question: 오늘 날짜랑 코스피 지수 알려줘
+    Thought: 날짜와 코스피 지수는 서로 관계없으니 두 도구를 한 번에 호출하자.
+    Action: get_current_date
+    Action Input: ""
+    Action: get_kospi_index
+    Action Input: ""
+    Observation: (각 도구 실행 결과가 Action 순서대로 나옵니다)
+    Thought: 두 결과를 모두 받았으니 답변하자.
+    Final Answer: 오늘은 ...이고, 코스피 지수는 ...입니다.
+    
     [중요 규칙]
     - 'Action Input'에는 도구에 들어갈 인자 값만 쉼표(,)나 따옴표로 명확히 적으세요.
     - 도구가 필요 없으면 바로 'Final Answer:'를 출력하세요.
+    - 앞 도구의 결과가 있어야 정할 수 있는 호출은 한 번에 쓰지 말고, Observation 을 본 뒤 다음 Action 으로 진행하세요.
     - 상태(status) 값 매핑: '신규'->'NEW', '진행중'->'IN_PROGRESS', '완료'->'DONE', '반려'->'REJECTED'
     
     이제 시작합니다!
@@ -156,12 +207,12 @@ def create_my_graph_agent():
     # ---------------------------------------------------------
     # Node 정의
     # ---------------------------------------------------------
-    def run_agent(state: AgentState):
+    async def run_agent(state: AgentState):
         print("🤖 [Graph] 에이전트 생각 중...")
         messages = state['messages']
         user_input = messages[-1].content if messages else ""
         
-        outcome = agent_runnable.invoke({
+        outcome = await agent_runnable.ainvoke({
             "input": user_input,
             "intermediate_steps": state.get("intermediate_steps", [])
         })
@@ -180,7 +231,7 @@ def create_my_graph_agent():
     workflow = StateGraph(AgentState)
 
     workflow.add_node("agent", run_agent)
-    workflow.add_node("action", execute_tools)
+    workflow.add_node("action", make_execute_tools(tool_map))
 
     workflow.set_entry_point("agent")
 
@@ -195,7 +246,7 @@ def create_my_graph_agent():
 
     workflow.add_edge("action", "agent")
 
-    memory = MemorySaver()
+    memory = get_checkpointer("graph")
     app = workflow.compile(checkpointer=memory)
 
     return app
\ No newline at end of file
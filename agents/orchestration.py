@@ -3,7 +3,7 @@ from services.middlewares import get_all_middleware
 from services.llm import get_llm
 from services.prompt import get_prompt
 
-from langgraph.checkpoint.memory import InMemorySaver
+from database.checkpoint import get_checkpointer
 from langchain.agents import create_agent, AgentState
 
 
@@ -31,7 +31,7 @@ def create_my_agent():
         tools=tools,  # Agent가 사용할 도구 목록
         middleware=base_middleware,
         state_schema=CustomAgentState,  # 사용자 정의 상태 스키마 등록
-        checkpointer=InMemorySaver()   # 단기 메모리 저장소
+        checkpointer=get_checkpointer("agent")   # 단기 메모리 저장소 (SQLite + LRU)
     )
     
     return agent
@@ -0,0 +1,90 @@
+# benchmarks/bench_checkpointer.py
+"""
+체크포인터 비교: InMemorySaver(기존) vs BoundedSqliteSaver(변경 후)
+- 10,000개의 대화(thread)에 각각 몇 턴씩 대화를 쌓은 뒤(= 유휴 상태)
+  프로세스 메모리(RSS) 증가량과 최근/오래된 thread의 상태 조회 시간을 측정합니다.
+
+실행: python -m benchmarks.bench_checkpointer
+"""
+import gc
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+import psutil
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+from langgraph.graph.message import add_messages
+
+from database.checkpoint.saver import BoundedSqliteSaver
+
+THREADS = 10_000
+TURNS = 3
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def echo(state: State):
+    return {"messages": [AIMessage(content="답변 " * 50)]}
+
+
+def build_graph(checkpointer):
+    workflow = StateGraph(State)
+    workflow.add_node("echo", echo)
+    workflow.set_entry_point("echo")
+    workflow.add_edge("echo", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+def run(name: str, checkpointer):
+    gc.collect()
+    before = rss_mb()
+    app = build_graph(checkpointer)
+
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        for i in range(THREADS):
+            app.invoke({"messages": [HumanMessage(content=f"질문 {turn}")]},
+                       {"configurable": {"thread_id": f"t{i}"}})
+    fill_time = time.perf_counter() - start
+    gc.collect()
+    after = rss_mb()
+
+    def lookup(thread_id: str) -> float:
+        t0 = time.perf_counter()
+        for _ in range(100):
+            app.get_state({"configurable": {"thread_id": thread_id}})
+        return (time.perf_counter() - t0) / 100 * 1000
+
+    print(f"📊 [{name}] threads={THREADS}, turns={TURNS}")
+    print(f" - 적재 시간: {fill_time:.1f}초")
+    print(f" - RSS 증가: {after - before:.1f} MB")
+    print(f" - 최근 thread 조회: {lookup(f't{THREADS - 1}'):.3f} ms")
+    print(f" - 오래된 thread 조회: {lookup('t0'):.3f} ms")
+
+
+def main():
+    run("InMemorySaver", InMemorySaver())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(str(Path(tmp) / "bench.db"), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        saver = BoundedSqliteSaver(conn, max_hot_threads=1000, keep_last=2)
+        saver.setup()
+        run("BoundedSqliteSaver", saver)
+        print(f" - 캐시 통계: {saver.stats}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
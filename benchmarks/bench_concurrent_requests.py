@@ -0,0 +1,70 @@
+# benchmarks/bench_concurrent_requests.py
+"""
+동시 요청 처리량 비교: 동기 invoke(기존) vs 비동기 ainvoke(변경 후)
+- 응답에 1초가 걸리는 가짜(Stub) LLM으로 에이전트를 만들고 N개의 요청을 동시에 보냅니다.
+- 기대 결과: invoke 는 약 N초, ainvoke 는 약 1초
+
+실행: python -m benchmarks.bench_concurrent_requests
+"""
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+LLM_LATENCY = 1.0   # 가짜 LLM 응답 시간(초)
+CONCURRENCY = 8     # 동시 요청 수
+
+
+class SlowFakeChatModel(BaseChatModel):
+    """고정된 지연 후 답변하는 테스트용 LLM"""
+    latency: float = LLM_LATENCY
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="완료"))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+async def run(agent, use_async: bool) -> float:
+    async def one_request(i: int):
+        inputs = {"messages": [("user", f"질문 {i}")]}
+        if use_async:
+            await agent.ainvoke(inputs)
+        else:
+            agent.invoke(inputs)  # 기존 chat_endpoint 방식 (이벤트 루프 차단)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(CONCURRENCY)))
+    return time.perf_counter() - start
+
+
+def main():
+    agent = create_agent(model=SlowFakeChatModel(), tools=[])
+
+    blocking = asyncio.run(run(agent, use_async=False))
+    non_blocking = asyncio.run(run(agent, use_async=True))
+
+    print(f"📊 동시 요청 {CONCURRENCY}개 / LLM 지연 {LLM_LATENCY:.1f}초")
+    print(f" - invoke  (동기): {blocking:.2f}초")
+    print(f" - ainvoke (비동기): {non_blocking:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
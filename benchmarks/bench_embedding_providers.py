@@ -0,0 +1,66 @@
+# benchmarks/bench_embedding_providers.py
+"""
+임베딩 Provider 비교: OpenAI(클라우드) vs 로컬 CPU(torch) vs 로컬 CPU(ONNX int8)
+- 같은 청크 집합(data/reports PDF)으로 적재 처리량(chunks/sec)과 질문 1건당 지연 시간을 측정합니다.
+- 캐시를 거치지 않도록 Provider에서 직접 임베딩 객체를 생성합니다.
+
+실행: python -m benchmarks.bench_embedding_providers [--chunks 256] [--queries 20]
+"""
+import argparse
+import statistics
+import time
+
+from config import EmbeddingType, embedding_configs
+from database.verctor.loader import find_pdf_files, load_pdf_file, split_documents
+from services.embedding.provider import CloudEmbeddingProvider, LocalEmbeddingProvider
+
+QUERIES = ["나이키의 2023년 매출은?", "주요 위험 요인은 무엇인가?", "Nike revenue by region", "배당 정책"]
+
+
+def load_chunks(limit: int):
+    docs = []
+    for file_path in find_pdf_files("data/reports"):
+        docs.extend(load_pdf_file(str(file_path)))
+    return [chunk.page_content for chunk in split_documents(docs)][:limit]
+
+
+def measure(name: str, embedding, chunks, query_count: int):
+    embedding.embed_query("warm up")  # 모델 로딩/커넥션 준비 제외
+
+    start = time.perf_counter()
+    embedding.embed_documents(chunks)
+    ingest_seconds = time.perf_counter() - start
+
+    latencies = []
+    for i in range(query_count):
+        t0 = time.perf_counter()
+        embedding.embed_query(QUERIES[i % len(QUERIES)])
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    print(f"📊 [{name}]")
+    print(f" - 적재: {len(chunks)} chunks / {ingest_seconds:.2f}초 ({len(chunks) / ingest_seconds:.1f} chunks/sec)")
+    print(f" - 질문 지연: p50 {statistics.median(latencies):.1f} ms / max {max(latencies):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    chunks = load_chunks(args.chunks)
+
+    cloud_conf = embedding_configs[EmbeddingType.OPENAI_EMBEDDING_3_SMALL]
+    if cloud_conf["api_key"]:
+        measure("OpenAI text-embedding-3-small", CloudEmbeddingProvider().create_embedding(cloud_conf), chunks, args.queries)
+    else:
+        print("⚠️ OPENAI_API_KEY 가 없어 클라우드 측정은 건너뜁니다.")
+
+    local_conf = embedding_configs[EmbeddingType.LOCAL_MULTILINGUAL_E5_SMALL]
+    measure("Local torch fp32", LocalEmbeddingProvider().create_embedding({**local_conf, "backend": "torch"}), chunks, args.queries)
+    measure("Local ONNX int8", LocalEmbeddingProvider().create_embedding(
+        {**local_conf, "backend": "onnx", "quantize_int8": True}), chunks, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_guardrails.py
+"""
+가드레일 턴당 비용 비교: 기존 방식(PIIMiddleware 3개 + 금칙어 re.search/in 반복) vs GuardrailMiddleware
+- 긴 대화 이력(턴 수 N)을 만들고, 한 턴(사용자 입력 → 도구 호출 → 도구 결과 → 최종 응답) 동안
+  에이전트가 호출하는 before_model / after_model 훅만 직접 실행해 가드레일에 쓰인 시간을 측정합니다.
+- 각 메시지에는 id 를 부여합니다 (에이전트 실행 시 add_messages 가 부여하는 것과 동일).
+
+실행: python -m benchmarks.bench_guardrails [--turns 50 200 800] [--measure 20]
+"""
+import argparse
+import re
+import statistics
+import time
+import uuid
+
+from langchain.agents.middleware import PIIMiddleware
+from langchain.messages import AIMessage, HumanMessage, ToolMessage
+
+from services.middlewares.guardrail_middleware import GuardrailMiddleware, POLICY_WORDS
+
+USER_TEXT = "이번 주 삼성전자 주가 흐름과 반도체 업황을 정리해 주세요. 참고 자료는 보고서 기준으로 부탁드립니다. " * 3
+TOOL_TEXT = "2025-01-02 종가 53,400원 / 거래량 12,345,678주 / 외국인 순매수 1,234억 원. " * 40
+ANSWER_TEXT = "요약하면 메모리 가격 반등 기대감으로 외국인 매수가 이어졌고, 단기 변동성은 여전히 큽니다. " * 8
+
+
+# --- 변경 전 방식 (기존 message_middleware / pii_detection 과 동일한 동작) ---
+def legacy_pii():
+    return [
+        PIIMiddleware("email", strategy="redact", apply_to_input=True),
+        PIIMiddleware("credit_card", detector=r"\b(?:\d[ -]*?){13,19}\b", strategy="mask", apply_to_input=True),
+        PIIMiddleware("api_key", detector=r"sk-[a-zA-Z0-9]{32}", strategy="block"),
+    ]
+
+LEGACY_POLICY_PATTERNS = [r"password", r"api[_-]?key", r"secret", r"주민등록번호", r"internal", r"confidential"]
+
+def legacy_check_security(state):
+    text = str(state["messages"][-1].content)
+    return any(re.search(p, text, re.IGNORECASE) for p in LEGACY_POLICY_PATTERNS)
+
+def legacy_validate_response(state):
+    words = ["정치", "대통령", "선거", "정부", "야당", "여당", "보수", "진보", "민주당", "국민의힘", "정당",
+             "종교", "기독교", "천주교", "불교", "이슬람", "힌두교", "신앙", "예수", "하느님", "알라", "교회", "성당", "사찰"]
+    content = str(state["messages"][-1].content).lower()
+    return any(word.lower() in content for word in words)
+
+
+class LegacyGuardrails:
+    def __init__(self):
+        self.pii = legacy_pii()
+
+    def before_model(self, state):
+        for middleware in self.pii:
+            middleware.before_model(state, None)
+        legacy_check_security(state)
+
+    def after_model(self, state):
+        legacy_validate_response(state)
+
+
+class NewGuardrails:
+    def __init__(self):
+        self.middleware = GuardrailMiddleware()
+
+    def before_model(self, state):
+        self.middleware.before_model(state, None)
+
+    def after_model(self, state):
+        self.middleware.after_model(state, None)
+
+
+def turn_messages(turn: int):
+    call_id = f"call_{turn}"
+    return [
+        HumanMessage(content=USER_TEXT, id=str(uuid.uuid4())),
+        AIMessage(content="", id=str(uuid.uuid4()),
+                  tool_calls=[{"name": "stock_price", "args": {"code": "005930"}, "id": call_id}]),
+        ToolMessage(content=TOOL_TEXT, tool_call_id=call_id, id=str(uuid.uuid4())),
+        AIMessage(content=ANSWER_TEXT, id=str(uuid.uuid4())),
+    ]
+
+
+def run_turn(guard, history: list, turn: int) -> float:
+    """한 턴 동안 가드레일 훅에 쓰인 시간 (모델 호출 2회: 도구 호출 전/후)"""
+    human, call, tool, answer = turn_messages(turn)
+    elapsed = 0.0
+    for before, produced in (([human], call), ([tool], answer)):
+        history.extend(before)
+        start = time.perf_counter()
+        guard.before_model({"messages": history})
+        elapsed += time.perf_counter() - start
+        history.append(produced)
+        start = time.perf_counter()
+        guard.after_model({"messages": history})
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench(label: str, make_guard, turns: int, measure: int):
+    guard, history = make_guard(), []
+    for turn in range(turns):  # 긴 이력 준비 (이 구간도 같은 가드레일 인스턴스로 진행)
+        run_turn(guard, history, turn)
+    costs = [run_turn(guard, history, turns + i) * 1000 for i in range(measure)]
+    print(f" - [{label}] 이력 {len(history):5d}개 메시지 / 턴당 p50 {statistics.median(costs):7.3f} ms "
+          f"/ 최대 {max(costs):7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--measure", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"📊 가드레일 턴당 비용 (금칙어 {len(POLICY_WORDS)}개 + 정치/종교 금칙어, PII 탐지기 3종)")
+    for turns in args.turns:
+        print(f"[이전 대화 {turns}턴]")
+        bench("기존 방식", LegacyGuardrails, turns, args.measure)
+        bench("GuardrailMiddleware", NewGuardrails, turns, args.measure)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_llm_http_pool.py
+"""
+LLM API 호출 오버헤드 비교: 기본 클라이언트 vs 공유 커넥션 풀(keep-alive)
+- 로컬에 OpenAI 호환 Stub 서버(/v1/chat/completions)를 띄우고 같은 요청을 반복합니다.
+- 서버 응답은 즉시 반환하므로 측정값은 거의 순수한 클라이언트/연결 오버헤드입니다.
+- Stub 서버가 받은 새 TCP 연결 수도 함께 출력합니다.
+
+실행: python -m benchmarks.bench_llm_http_pool [--calls 200] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_openai import ChatOpenAI
+
+from config.llm_config import LLM_HTTP_DEFAULT
+from services.llm.provider import APILLMProvider
+
+RESPONSE = {
+    "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "stub",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubHandler.connections += 1  # 핸들러 1개 = TCP 연결 1개
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def report(label: str, latencies, elapsed: float):
+    ms = sorted(l * 1000 for l in latencies)
+    print(f" - [{label}] p50 {statistics.median(ms):6.2f} ms / p95 {ms[int(len(ms) * 0.95) - 1]:6.2f} ms "
+          f"/ {len(ms) / elapsed:7.1f} calls/sec / 새 연결 {StubHandler.connections}개")
+    StubHandler.connections = 0
+
+
+def run_sync(make_llm, calls: int):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        make_llm().invoke("ping")
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+async def run_async(make_llm, calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            t0 = time.perf_counter()
+            await make_llm().ainvoke("ping")
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    conf = {"provider": "hanwha_system", "model_name": "stub", "base_url": base_url,
+            "temperature": 0.0, "api_key": "stub", "http": LLM_HTTP_DEFAULT}
+
+    # 변경 전: 요청마다 모델 객체 + 기본 HTTP 클라이언트 생성
+    before = lambda: ChatOpenAI(base_url=base_url, api_key="stub", model="stub", temperature=0.0)
+    # 변경 후: Provider가 공유 커넥션 풀을 주입 (객체를 새로 만들어도 풀은 재사용)
+    after = lambda: APILLMProvider().create_llm(conf)
+
+    print(f"📊 OpenAI 호환 Stub 서버 ({base_url}) / {args.calls}회 호출")
+    print("[동기 invoke]")
+    report("기본 클라이언트", *run_sync(before, args.calls))
+    report("공유 커넥션 풀", *run_sync(after, args.calls))
+
+    print(f"[비동기 ainvoke, 동시성 {args.concurrency}]")
+    report("기본 클라이언트", *asyncio.run(run_async(before, args.calls, args.concurrency)))
+    report("공유 커넥션 풀", *asyncio.run(run_async(after, args.calls, args.concurrency)))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_llm_limiter.py
+"""
+LLM 동시 호출 한도(AIMD) 동작 확인 - 동시 요청이 많아지면 느려지고 503을 내는 Stub 서버 사용
+- Stub 서버: 동시 처리 CAPACITY 건까지는 BASE_LATENCY, 넘으면 초과분에 비례해 느려지고
+  2 × CAPACITY 를 넘으면 503 반환 (vLLM 내부 큐가 밀리는 상황 흉내)
+- 한도 없음 vs AdaptiveConcurrencyLimiter 적용 시 성공/실패 수, 지연 시간, 최종 한도를 비교합니다.
+
+실행: python -m benchmarks.bench_llm_limiter [--requests 300] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from services.llm.limiter import AdaptiveConcurrencyLimiter, AsyncLimitedTransport
+
+CAPACITY = 8          # Stub 서버가 느려지지 않고 처리하는 동시 요청 수
+BASE_LATENCY = 0.05   # 정상 응답 시간(초)
+
+
+class DegradingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    in_flight = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with DegradingHandler.lock:
+            DegradingHandler.in_flight += 1
+            current = DegradingHandler.in_flight
+        try:
+            if current > CAPACITY * 2:
+                status, body = 503, {"error": {"message": "overloaded"}}
+            else:
+                time.sleep(BASE_LATENCY * (1 + max(0, current - CAPACITY)))
+                status, body = 200, {"choices": [{"message": {"content": "ok"}}]}
+        finally:
+            with DegradingHandler.lock:
+                DegradingHandler.in_flight -= 1
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+async def run(label: str, url: str, requests: int, concurrency: int, limiter=None):
+    transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=256))
+    if limiter is not None:
+        transport = AsyncLimitedTransport(transport, limiter)
+
+    statuses, latencies = {}, []
+    semaphore = asyncio.Semaphore(concurrency)  # 클라이언트 쪽 동시 사용자 수
+
+    async with httpx.AsyncClient(transport=transport, timeout=60) as client:
+        async def one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await client.post(url, json={"messages": [{"role": "user", "content": "ping"}]})
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    ms = sorted(l * 1000 for l in latencies) or [0.0]
+    print(f" - [{label}] 응답 코드 {statuses} / 성공 p50 {statistics.median(ms):7.1f} ms "
+          f"p95 {ms[int(len(ms) * 0.95) - 1]:7.1f} ms / 총 {elapsed:5.2f}초")
+    if limiter is not None:
+        print(f"   limiter: {limiter.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DegradingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    print(f"📊 Stub 서버 용량 {CAPACITY} / 동시 사용자 {args.concurrency} / 요청 {args.requests}건")
+    asyncio.run(run("한도 없음", url, args.requests, args.concurrency))
+    limiter = AdaptiveConcurrencyLimiter("stub", initial_limit=16, max_queue=args.concurrency, queue_timeout=30)
+    asyncio.run(run("AIMD 한도", url, args.requests, args.concurrency, limiter))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_llm_router.py
+"""
+LLM 복제 서버 라우팅/장애 조치 확인 - 지연/장애를 주입한 Stub 서버 여러 대 사용
+- fast: 정상 (BASE_LATENCY)
+- slow: 평소 4배 느리고 가끔(10%) 매우 느림 (긴 꼬리 지연)
+- flaky: 30% 확률로 503, --down 옵션이면 연결 자체가 안 됨
+- 단일 서버(첫 번째 = slow) 직접 연결 vs EndpointRouter (재시도/격리) vs EndpointRouter + hedge 비교
+
+실행: python -m benchmarks.bench_llm_router [--requests 300] [--concurrency 16] [--down]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from services.llm.router import EndpointRouter, AsyncRoutingTransport
+
+BASE_LATENCY = 0.05   # 정상 응답 시간(초)
+
+
+def make_handler(latency: float, tail_ratio: float = 0.0, error_ratio: float = 0.0):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if random.random() < error_ratio:
+                status, body = 503, {"error": {"message": "unavailable"}}
+            else:
+                time.sleep(latency * (10 if random.random() < tail_ratio else 1))
+                status, body = 200, {"choices": [{"message": {"content": "ok"}}]}
+
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+    return StubHandler
+
+
+def start_server(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(label: str, primary: str, requests: int, concurrency: int, router=None):
+    transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=256))
+    if router is not None:
+        transport = AsyncRoutingTransport(transport, router, primary)
+
+    statuses, latencies = {}, []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, timeout=10) as client:
+        async def one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                try:
+                    response = await client.post(f"{primary}/chat/completions",
+                                                 json={"messages": [{"role": "user", "content": "ping"}]})
+                    code = response.status_code
+                except httpx.TransportError as e:
+                    code = type(e).__name__
+                statuses[code] = statuses.get(code, 0) + 1
+                if code == 200:
+                    latencies.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    ms = sorted(l * 1000 for l in latencies) or [0.0]
+    print(f" - [{label}] 응답 {statuses} / 성공 p50 {statistics.median(ms):7.1f} ms "
+          f"p99 {ms[max(0, int(len(ms) * 0.99) - 1)]:7.1f} ms / 총 {elapsed:5.2f}초")
+    if router is not None:
+        print(f"   router: {json.dumps(router.stats(), ensure_ascii=False)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--down", action="store_true", help="flaky 서버를 아예 내린 상태로 측정")
+    args = parser.parse_args()
+
+    servers = [
+        start_server(make_handler(BASE_LATENCY * 4, tail_ratio=0.1)),     # slow
+        start_server(make_handler(BASE_LATENCY)),                         # fast
+        start_server(make_handler(BASE_LATENCY, error_ratio=0.3)),        # flaky
+    ]
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/v1" for server in servers]
+    if args.down:
+        servers[2].shutdown()
+        servers[2].server_close()
+
+    print(f"📊 Stub 서버 slow/fast/flaky{'(down)' if args.down else ''} / 동시 {args.concurrency} / 요청 {args.requests}건")
+    asyncio.run(run("단일 서버", urls[0], args.requests, args.concurrency))
+    router = EndpointRouter("stub", urls, eject_after=3, cooldown=5.0, max_attempts=3)
+    asyncio.run(run("라우터", urls[0], args.requests, args.concurrency, router))
+    router = EndpointRouter("stub", urls, eject_after=3, cooldown=5.0, max_attempts=3,
+                            hedge=True, hedge_min_delay=BASE_LATENCY * 2)
+    asyncio.run(run("라우터+hedge", urls[0], args.requests, args.concurrency, router))
+
+    for server in servers[:2] if args.down else servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/bench_local_llm_batching.py
+"""
+로컬 모델(HyperCLOVAX 0.5B, CPU) 동시 요청 처리량 비교
+- 기존 방식: 요청마다 HuggingFace pipeline 호출 (batch size 1, 스레드 풀에서 동시 실행)
+- micro-batching: BatchedGenerationEngine 이 동시에 들어온 요청을 묶어서 generate (prefix 캐시 끔)
+- 배포 기본값: 모델 설정("batching" + "prefix_cache")으로 만든 엔진 (LocalLLMProvider 와 같은 구성)
+
+프롬프트는 advisor 프롬프트(시스템 메시지) + 짧은 사용자 질문입니다.
+동시성 1/4/16 에서 생성 토큰 처리량(tokens/sec)과 요청당 평균 지연 시간을 출력합니다.
+모델은 slm/naver-hyperclovax/install_0_5b.py 로 미리 받아 두어야 합니다.
+가중치를 받을 수 없는 환경에서는 --stand-in 으로 비슷한 규모(약 0.5B)의 무작위 초기화 Llama +
+글자 단위 토크나이저를 사용합니다 (출력 내용은 의미 없음, 처리량 비교용).
+
+실행: python -m benchmarks.bench_local_llm_batching [--max-new-tokens 64] [--rounds 2] [--stand-in]
+
+기록 (--stand-in 0.49B, 프롬프트 317 토큰, CPU 1코어, torch 2.14 / transformers 4.57, --max-new-tokens 32 --rounds 1):
+  동시성 | pipeline (batch 1) | micro-batching | 배포 기본값 (batching + prefix 캐시)
+     1   |     3.0 tokens/sec |   3.1          |   3.2
+     4   |     3.2            |   4.6          |   4.3
+    16   |     3.1            |   5.3          |   8.0
+  - prefix 캐시: hit 17 / miss 5 (공통 시스템 프롬프트 1개), CPU 1코어에서는 prefill 이 병목이라 동시성이 높을수록 효과가 큼
+  - 동시성 4 에서는 prefix hit/miss 요청이 다른 배치로 나뉘어 micro-batching 단독보다 약간 낮음
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+
+from config import llm_configs, ModelType, ACTIVE_PROMPT
+from services.prompt import PromptLoader
+from services.llm.local_engine import create_generation_engine
+
+QUESTIONS = [
+    "안녕하세요! 자기소개 좀 해주세요.",
+    "코스피 지수가 무엇인지 설명해 주세요.",
+    "나이키의 주요 사업 부문을 알려주세요.",
+    "오늘 날씨가 좋으면 무엇을 하면 좋을까요?",
+    "파이썬에서 리스트와 튜플의 차이는?",
+    "서비스 요청 처리 절차를 간단히 요약해 주세요.",
+    "머신러닝과 딥러닝의 차이를 한 문단으로 설명해 주세요.",
+    "좋은 보고서를 쓰는 방법은?",
+]
+ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+def load_model(model_path: str):
+    tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+    model = AutoModelForCausalLM.from_pretrained(
+        model_path, trust_remote_code=True, torch_dtype=torch.float32  # CPU는 fp32
+    ).eval()
+    return model, tokenizer
+
+
+def stand_in_model(vocab_size: int = 110592):
+    """가중치 없이 처리량만 비교할 때 쓰는 약 0.5B 규모 Llama (무작위 초기화) + 글자 단위 토크나이저"""
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    # 특수 토큰 + ASCII + 한글/한자 영역 글자 (글자 1개 = 토큰 1개 → 생성 결과를 다시 토큰화해도 개수가 같음)
+    vocab = {"<pad>": 0, "<eos>": 1, "<unk>": 2, "\n": 3}
+    code = 32
+    while len(vocab) < vocab_size:
+        if code == 127:
+            code = 0x3400
+        elif 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        vocab.setdefault(chr(code), len(vocab))
+        code += 1
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Split("", "isolated")
+    backend.decoder = decoders.Fuse()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, pad_token="<pad>", eos_token="<eos>",
+                                        unk_token="<unk>")
+
+    torch.manual_seed(0)
+    config = LlamaConfig(vocab_size=vocab_size, hidden_size=1024, intermediate_size=4096, num_hidden_layers=24,
+                         num_attention_heads=16, num_key_value_heads=8, max_position_embeddings=4096,
+                         tie_word_embeddings=True)
+    return LlamaForCausalLM(config).eval(), tokenizer
+
+
+def build_prompt(tokenizer, template, question: str) -> str:
+    messages = [{"role": ROLES[m.type], "content": m.content} for m in template.format_messages(input=question)]
+    if tokenizer.chat_template:
+        return tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=False)
+    return "".join(f"<|{m['role']}|>\n{m['content']}\n" for m in messages) + "<|assistant|>\n"
+
+
+def run(label: str, generate, tokenizer, prompts, concurrency: int, rounds: int):
+    prompts = [prompts[i % len(prompts)] for i in range(concurrency * rounds)]
+
+    def one(prompt):
+        t0 = time.perf_counter()
+        text = generate(prompt)
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"]), time.perf_counter() - t0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, prompts))
+    elapsed = time.perf_counter() - start
+
+    tokens = sum(count for count, _ in results)
+    avg_latency = sum(latency for _, latency in results) / len(results)
+    print(f" - [{label}] 동시성 {concurrency:>2}: {tokens / elapsed:7.1f} tokens/sec "
+          f"/ 요청 평균 {avg_latency:6.2f}초 / 총 {elapsed:6.2f}초", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=2, help="동시성 단위 반복 횟수")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    parser.add_argument("--stand-in", action="store_true", help="HyperCLOVAX 가중치 대신 같은 규모의 무작위 모델 사용")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    conf = llm_configs[ModelType.HYPERCLOVA_LOCAL_0_5B]
+    model, tokenizer = stand_in_model() if args.stand_in else load_model(str(conf["model_path"]))
+    gen_kwargs = {"max_new_tokens": args.max_new_tokens, "do_sample": False,
+                  "repetition_penalty": conf["pipeline_kwargs"].get("repetition_penalty", 1.0)}
+    template = PromptLoader.load(ACTIVE_PROMPT)
+    prompts = [build_prompt(tokenizer, template, question) for question in QUESTIONS]
+
+    # 엔진 구성은 모델 설정 그대로 (생성 파라미터만 비교용으로 고정)
+    pipe = pipeline("text-generation", model=model, tokenizer=tokenizer, return_full_text=False, **gen_kwargs)
+    batching_only = create_generation_engine(model, tokenizer, {**conf, "pipeline_kwargs": gen_kwargs,
+                                                                "prefix_cache": {"enabled": False}})
+    shipped = create_generation_engine(model, tokenizer, {**conf, "pipeline_kwargs": gen_kwargs})
+
+    pipe(prompts[0])  # 워밍업
+    batching_only.generate(prompts[0])
+    shipped.generate(prompts[0])
+
+    name = "stand-in (무작위 초기화)" if args.stand_in else "HyperCLOVAX 0.5B"
+    params = sum(p.numel() for p in model.parameters()) / 1e9
+    print(f"📊 {name} {params:.2f}B / CPU / 프롬프트 {len(tokenizer(prompts[0])['input_ids'])} 토큰 내외 "
+          f"/ max_new_tokens={args.max_new_tokens} / batching={conf['batching']} / prefix_cache={conf['prefix_cache']}")
+    for concurrency in (1, 4, 16):
+        run("pipeline (batch 1)", lambda p: pipe(p)[0]["generated_text"], tokenizer, prompts, concurrency, args.rounds)
+        run("micro-batching    ", batching_only.generate, tokenizer, prompts, concurrency, args.rounds)
+        run("배포 기본값       ", shipped.generate, tokenizer, prompts, concurrency, args.rounds)
+    print(f"📈 micro-batching 엔진 통계: {batching_only.stats()}")
+    print(f"📈 배포 기본값 엔진 통계: {shipped.stats()}")
+    batching_only.close()
+    shipped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_multi_action.py
+"""
+그래프 에이전트 다중 Action 동시 실행 확인 - 스크립트된 Fake LLM + 지연을 주입한 도구
+- 질문: "오늘 날짜, 코스피 지수, 삼성전자 10-K 요약" (서로 독립적인 도구 3개)
+- 변경 전: LLM 이 Action 을 하나씩 출력 → LLM + 도구 왕복 3번
+- 변경 후: LLM 이 Action 3개를 한 번에 출력 → 도구 동시 실행 (async 도구는 그대로, 동기 도구는 스레드 풀)
+- agents.graph 의 parse_react_output / make_execute_tools 를 그대로 사용하고 LLM 호출만 sleep 으로 대체합니다.
+
+실행: python -m benchmarks.bench_multi_action [--llm-latency 0.8] [--tool-latency 0.5] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.agents import AgentFinish
+from langchain_core.tools import StructuredTool
+
+from agents.graph import format_steps, make_execute_tools, parse_react_output
+
+SEQUENTIAL_SCRIPT = [
+    "오늘 날짜부터 확인하자.\nAction: get_current_date\nAction Input: \"\"",
+    "코스피 지수를 확인하자.\nAction: get_kospi_index\nAction Input: \"\"",
+    "10-K 문서를 찾아보자.\nAction: get_retrieve_context\nAction Input: 삼성전자 10-K 요약",
+    "모든 정보를 모았다.\nFinal Answer: 오늘 날짜, 코스피 지수, 10-K 요약입니다.",
+]
+
+PARALLEL_SCRIPT = [
+    "세 가지는 서로 관계없으니 한 번에 호출하자.\n"
+    "Action: get_current_date\nAction Input: \"\"\n"
+    "Action: get_kospi_index\nAction Input: \"\"\n"
+    "Action: get_retrieve_context\nAction Input: 삼성전자 10-K 요약",
+    "모든 정보를 모았다.\nFinal Answer: 오늘 날짜, 코스피 지수, 10-K 요약입니다.",
+]
+
+
+def make_tools(latency: float):
+    def get_current_date(query: str = "") -> str:
+        time.sleep(latency / 10)
+        return "2025-01-02"
+
+    def get_kospi_index(query: str = "") -> str:  # 동기 도구 (외부 API 호출 흉내)
+        time.sleep(latency)
+        return "KOSPI 2,500.00"
+
+    async def get_retrieve_context(query: str) -> str:  # async 도구 (벡터 검색 흉내)
+        await asyncio.sleep(latency)
+        return f"'{query}' 관련 문서 3건"
+
+    return {
+        "get_current_date": StructuredTool.from_function(get_current_date, name="get_current_date",
+                                                         description="오늘 날짜"),
+        "get_kospi_index": StructuredTool.from_function(get_kospi_index, name="get_kospi_index",
+                                                        description="코스피 지수"),
+        "get_retrieve_context": StructuredTool.from_function(coroutine=get_retrieve_context,
+                                                             name="get_retrieve_context",
+                                                             description="문서 검색"),
+    }
+
+
+async def run_agent_loop(script, execute_tools, llm_latency: float):
+    """그래프의 agent ↔ action 루프와 같은 순서로 실행 (LLM 은 스크립트 응답 + 지연)"""
+    state = {"intermediate_steps": []}
+    round_trips = 0
+    for text in script:
+        format_steps(state["intermediate_steps"])  # 프롬프트 구성 비용 포함
+        await asyncio.sleep(llm_latency)
+        round_trips += 1
+        outcome = parse_react_output(text)
+        if isinstance(outcome, AgentFinish):
+            return state["intermediate_steps"], round_trips
+        result = await execute_tools({"agent_outcome": outcome})
+        state["intermediate_steps"] += result["intermediate_steps"]
+    raise RuntimeError("스크립트가 Final Answer 로 끝나지 않았습니다")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--tool-latency", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    execute_tools = make_execute_tools(make_tools(args.tool_latency))
+    print(f"📊 LLM {args.llm_latency}s / 도구 {args.tool_latency}s / {args.repeat}회 반복")
+
+    for label, script in (("Action 1개씩", SEQUENTIAL_SCRIPT), ("Action 동시 실행", PARALLEL_SCRIPT)):
+        elapsed = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            steps, round_trips = asyncio.run(run_agent_loop(script, execute_tools, args.llm_latency))
+            elapsed.append(time.perf_counter() - start)
+        order = [action.tool for action, _ in steps]
+        print(f" - [{label}] 평균 {statistics.mean(elapsed):5.2f}s / LLM 호출 {round_trips}회 / 결과 순서 {order}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_prefix_cache.py
+"""
+공통 prefix KV 캐시 효과 측정 (로컬 HyperCLOVAX 0.5B, CPU)
+- 프롬프트: advisor 프롬프트(시스템 메시지 + few-shot 예시) + 짧은 사용자 질문
+- 첫 토큰까지의 시간(TTFT ≈ prefill 시간)을 max_new_tokens=1 생성으로 측정합니다.
+  · 캐시 없음: 매번 전체 프롬프트 prefill
+  · 캐시 사용: 저장된 prefix KV 복사 + 질문 부분만 prefill
+
+실행: python -m benchmarks.bench_prefix_cache [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+
+import torch
+from transformers import AutoTokenizer
+
+from config import llm_configs, ModelType, ACTIVE_PROMPT
+from services.prompt import PromptLoader
+from services.llm.quantization import load_causal_lm
+from services.llm.prefix_cache import PrefixKVCache
+
+QUESTIONS = ["오늘 코스피 어때?", "SCM팀 진행중 요청 보여줘", "나이키 매출 알려줘", "오늘 날짜는?"]
+ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+def build_prompt(tokenizer, template, question: str) -> list:
+    messages = [{"role": ROLES[m.type], "content": m.content} for m in template.format_messages(input=question)]
+    return tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=True)
+
+
+@torch.inference_mode()
+def ttft_ms(model, tokenizer, input_ids, past_key_values=None) -> float:
+    ids = torch.tensor([input_ids])
+    start = time.perf_counter()
+    model.generate(input_ids=ids, attention_mask=torch.ones_like(ids), past_key_values=past_key_values,
+                   max_new_tokens=1, do_sample=False, pad_token_id=tokenizer.pad_token_id or tokenizer.eos_token_id)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conf = llm_configs[ModelType.HYPERCLOVA_LOCAL_0_5B]
+    model_path = str(conf["model_path"])
+    tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+    model = load_causal_lm(model_path, {**conf["model_kwargs"], "device_map": "cpu"}, conf.get("quantization")).eval()
+    template = PromptLoader.load(ACTIVE_PROMPT)
+    prompts = [build_prompt(tokenizer, template, q) for q in QUESTIONS]
+
+    ttft_ms(model, tokenizer, prompts[0])  # 워밍업
+
+    # 1. 캐시 없이 전체 prefill
+    baseline = [ttft_ms(model, tokenizer, p) for _ in range(args.repeat) for p in prompts]
+
+    # 2. prefix 캐시 사용 (서로 다른 요청 3개로 공통 prefix 탐지/계산 - 계산한 요청은 miss 로 집계)
+    cache = PrefixKVCache(model, max_entries=8, min_prefix_tokens=32)
+    for p in prompts[:3]:
+        cache.lookup(p)
+    cached = []
+    for _ in range(args.repeat):
+        for p in prompts:
+            _, past_key_values = cache.lookup(p)
+            cached.append(ttft_ms(model, tokenizer, p, past_key_values))
+
+    stats = cache.stats()
+    print(f"📊 HyperCLOVAX 0.5B / CPU / 프롬프트 {len(prompts[0])} 토큰 내외")
+    print(f" - 캐시 없음 : TTFT p50 {statistics.median(baseline):7.1f} ms / 평균 {statistics.mean(baseline):7.1f} ms")
+    print(f" - prefix 캐시: TTFT p50 {statistics.median(cached):7.1f} ms / 평균 {statistics.mean(cached):7.1f} ms "
+          f"(hit {stats['hits']} / miss {stats['misses']}, 재사용 토큰 {stats['reused_tokens']}, "
+          f"새 prefill 토큰 {stats['prefill_tokens']})")
+
+
+if __name__ == "__main__":
+    main()
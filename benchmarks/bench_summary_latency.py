@@ -0,0 +1,97 @@
+# benchmarks/bench_summary_latency.py
+"""
+대화 요약 위치에 따른 턴 지연 비교: 요청 중 동기 요약(SummarizationMiddleware) vs 백그라운드 요약
+- 메인/요약 모델은 고정 지연(sleep)을 가진 Fake 모델, 대화 상태는 InMemorySaver 에 저장
+- 여러 대화(thread)를 번갈아 진행 → 같은 대화의 다음 턴까지 다른 대화 턴만큼의 간격(사용자 입력 시간)이 생김
+- 턴별 지연 p50 / p99 / 최대와, 요약 모델 호출이 요청 안에서 일어난 턴 수를 출력합니다.
+
+실행: python -m benchmarks.bench_summary_latency [--threads 8] [--turns 30] [--summary-latency 0.5]
+"""
+import argparse
+import statistics
+import threading
+import time
+from typing import Any, List
+
+from langchain.agents import create_agent
+from langchain.agents.middleware import SummarizationMiddleware
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+from services.middlewares.background_summary import BackgroundSummarizationMiddleware
+
+USER_TEXT = "지난 분기 실적과 이번 분기 전망을 비교해서 투자 포인트를 정리해 주세요. " * 6
+REPLY_TEXT = "매출은 전 분기 대비 증가했고 영업이익률도 개선되었습니다. 다만 환율 변동성이 리스크입니다. " * 8
+PROMPT = "이전 대화 내용을 간결하게 요약하세요."
+
+
+class SlowFakeChatModel(BaseChatModel):
+    """고정 지연 후 같은 응답을 돌려주는 테스트용 모델 (요청 스레드에서 호출된 횟수 기록)"""
+    latency: float
+    reply: str
+    calls_in_request: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if not threading.current_thread().name.startswith("summary"):
+            self.calls_in_request += 1
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def run(label: str, middleware, summary_model: SlowFakeChatModel, args):
+    agent = create_agent(model=SlowFakeChatModel(latency=args.main_latency, reply=REPLY_TEXT),
+                         tools=[], middleware=[middleware], checkpointer=InMemorySaver())
+    latencies, slow_turns = [], 0
+    for turn in range(args.turns):
+        for thread in range(args.threads):
+            before = summary_model.calls_in_request
+            start = time.perf_counter()
+            agent.invoke({"messages": [{"role": "user", "content": USER_TEXT}]},
+                         config={"configurable": {"thread_id": f"{label}-{thread}"}})
+            latencies.append((time.perf_counter() - start) * 1000)
+            slow_turns += summary_model.calls_in_request > before
+
+    ms = sorted(latencies)
+    print(f" - [{label}] p50 {statistics.median(ms):7.1f} ms / p99 {ms[int(len(ms) * 0.99) - 1]:7.1f} ms "
+          f"/ 최대 {ms[-1]:7.1f} ms / 요청 중 요약 {slow_turns}턴 (전체 {len(ms)}턴)")
+    if isinstance(middleware, BackgroundSummarizationMiddleware):
+        print(f"   summary: {middleware.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--main-latency", type=float, default=0.1)
+    parser.add_argument("--summary-latency", type=float, default=0.5)
+    parser.add_argument("--threshold", type=int, default=2000, help="요약 시작 토큰 수")
+    parser.add_argument("--keep", type=int, default=6, help="요약 후 남길 메시지 수")
+    args = parser.parse_args()
+
+    print(f"📊 대화 {args.threads}개 × {args.turns}턴 / 메인 {args.main_latency}s, 요약 {args.summary_latency}s "
+          f"/ 요약 기준 {args.threshold} 토큰")
+
+    summary_model = SlowFakeChatModel(latency=args.summary_latency, reply="요약: 실적 비교와 투자 포인트 논의")
+    run("동기 요약", SummarizationMiddleware(model=summary_model, max_tokens_before_summary=args.threshold,
+                                          messages_to_keep=args.keep, summary_prompt=PROMPT),
+        summary_model, args)
+
+    summary_model = SlowFakeChatModel(latency=args.summary_latency, reply="요약: 실적 비교와 투자 포인트 논의")
+    run("백그라운드 요약", BackgroundSummarizationMiddleware(model=summary_model, summary_prompt=PROMPT,
+                                                      max_tokens_before_summary=args.threshold,
+                                                      max_tokens_before_sync=args.threshold * 2,
+                                                      messages_to_keep=args.keep),
+        summary_model, args)
+
+
+if __name__ == "__main__":
+    main()
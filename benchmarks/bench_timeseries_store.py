@@ -0,0 +1,87 @@
+# benchmarks/bench_timeseries_store.py
+"""
+코스피 조회 비교: 매번 전체 이력 조회(기존 get_kospi_index) vs 로컬 시세 저장소(TimeSeriesStore)
+- 데이터 소스는 네트워크 대신 stub (tests/test_timeseries_store.py 의 StubSource - 1990년부터의 영업일 가짜 시세,
+  요청 1번 + 행 수에 비례한 지연)
+- 저장소: 최초 1회 전체 이력 → 이후 마지막 저장일부터만 받음 (증분), 조회는 메모리 스냅샷
+- 임시 폴더의 Parquet 파일을 사용하고, 재시작(새 인스턴스)하면 파일에서 바로 읽는지도 확인합니다.
+
+실행: python -m benchmarks.bench_timeseries_store [--repeat 200] [--request-latency 0.3]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from database.timeseries.store import TimeSeriesStore
+from tests.test_timeseries_store import StubSource
+
+
+def latest_from_full_history(source: StubSource) -> str:
+    """기존 방식 - 전체 이력을 받아 마지막 두 행만 사용"""
+    df = source("KS11")
+    change = df["Close"].iloc[-1] - df["Close"].iloc[-2]
+    return f"{df['Close'].iloc[-1]:.2f} ({change:+.2f})"
+
+
+def measure(func, repeat: int):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--request-latency", type=float, default=0.3, help="요청 1번 지연(초)")
+    parser.add_argument("--row-latency", type=float, default=20e-6, help="행당 전송/파싱 지연(초)")
+    args = parser.parse_args()
+
+    source = StubSource(args.request_latency, args.row_latency, end="2025-01-02")
+    print(f"📊 stub 이력 {len(source.frame())}행 / 요청 지연 {args.request_latency}s")
+
+    # 1. 기존 방식 (요청마다 전체 이력)
+    full_us = measure(lambda: latest_from_full_history(source), max(1, args.repeat // 50))
+    print(f" - [전체 이력 조회] 호출당 {full_us / 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 2. 저장소 - 최초 전체 이력 1회 + 스냅샷 조회
+        store = TimeSeriesStore("KS11", directory, source=source, refresh_interval=3600)
+        source.requests.clear()
+        start = time.perf_counter()
+        store.ensure_loaded()
+        print(f" - [저장소 최초 적재] {(time.perf_counter() - start) * 1000:8.1f} ms / 요청 {source.requests}")
+        snapshot_us = measure(lambda: store.change(1), args.repeat)
+        print(f" - [저장소 스냅샷 조회] 호출당 {snapshot_us:8.1f} µs → {store.change(1)}")
+
+        # 3. 다음 영업일 데이터가 생긴 뒤 증분 갱신 (마지막 저장일부터만 요청)
+        source.end = pd.Timestamp("2025-01-06")
+        source.requests.clear()
+        start = time.perf_counter()
+        store.refresh()
+        print(f" - [증분 갱신] {(time.perf_counter() - start) * 1000:8.1f} ms / 요청 {source.requests} "
+              f"→ 최신 {store.change(1)['date']}")
+
+        # 4. 새 쿼리 - N 거래일 변화 / 이동평균 (스냅샷 범위 밖은 전체 이력 사용)
+        for days in (20, 250):
+            query_us = measure(lambda: (store.change(days), store.moving_average(days)), args.repeat)
+            change = store.change(days)
+            print(f" - [{days} 거래일 변화 + 이동평균] {query_us:8.1f} µs → {change['change_percent']:+.2f}%, "
+                  f"MA {store.moving_average(days):.2f}")
+
+        # 5. 재시작 - 파일에서 읽고, 빠진 구간만 요청
+        source.requests.clear()
+        restarted = TimeSeriesStore("KS11", directory, source=source, refresh_interval=3600)
+        start = time.perf_counter()
+        restarted.load()
+        print(f" - [재시작 후 파일 로드] {(time.perf_counter() - start) * 1000:8.1f} ms / 요청 {source.requests}")
+        print(f"   stats: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
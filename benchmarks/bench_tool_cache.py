@@ -0,0 +1,96 @@
+# benchmarks/bench_tool_cache.py
+"""
+도구 결과 캐시(CachedTool) 확인 - 지연을 주입한 도구로 동시 요청/반복 요청 시 실제 실행 횟수 비교
+- 동시 요청: 같은 인자로 N개를 동시에 호출 → 캐시 없음: N번 실행 / 캐시: 1번 실행 + 나머지는 결과 공유(shared)
+- 반복 요청: TTL 안에서 같은 인자로 다시 호출 → 캐시: 실행 없이 즉시 반환(hit)
+- stale: TTL 이 지난 뒤 호출 → 이전 값을 즉시 반환하고 백그라운드에서 갱신
+
+실행: python -m benchmarks.bench_tool_cache [--concurrency 10] [--tool-latency 0.5]
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.tools import StructuredTool
+
+from services.cache.tool_cache import CachedTool, ToolResultCache
+
+
+def make_tools(latency: float):
+    calls = {"sync": 0, "async": 0}
+    lock = threading.Lock()
+
+    def get_kospi_index(query: str = "") -> str:  # 동기 도구 (외부 API 호출 흉내)
+        with lock:
+            calls["sync"] += 1
+        time.sleep(latency)
+        return f"KOSPI 2,500.00 ({calls['sync']}번째 조회)"
+
+    async def tavily_search(query: str) -> str:  # async 도구 (웹 검색 흉내)
+        calls["async"] += 1
+        await asyncio.sleep(latency)
+        return f"'{query}' 검색 결과 5건"
+
+    sync_tool = StructuredTool.from_function(get_kospi_index, name="get_kospi_index", description="코스피 지수")
+    async_tool = StructuredTool.from_function(coroutine=tavily_search, name="tavily_search", description="웹 검색")
+    return sync_tool, async_tool, calls
+
+
+def run_sync(tool, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: tool.invoke({"query": ""}), range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def run_async(tool, concurrency: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(tool.ainvoke({"query": "  삼성전자   실적 "}) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tool-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"📊 동시 요청 {args.concurrency}개 / 도구 지연 {args.tool_latency}s")
+
+    # 1. 캐시 없음
+    sync_tool, async_tool, calls = make_tools(args.tool_latency)
+    sync_elapsed = run_sync(sync_tool, args.concurrency)
+    async_elapsed = asyncio.run(run_async(async_tool, args.concurrency))
+    print(f" - [캐시 없음] 동기 {sync_elapsed:4.2f}s / 실행 {calls['sync']}회, "
+          f"비동기 {async_elapsed:4.2f}s / 실행 {calls['async']}회")
+
+    # 2. 캐시 (동시 요청 → 1번 실행, 반복 요청 → hit)
+    cache = ToolResultCache()
+    sync_tool, async_tool, calls = make_tools(args.tool_latency)
+    cached_sync = CachedTool.wrap(sync_tool, cache, ttl=1.0, stale_ttl=30.0)
+    cached_async = CachedTool.wrap(async_tool, cache, ttl=60.0)
+    sync_elapsed = run_sync(cached_sync, args.concurrency)
+    async_elapsed = asyncio.run(run_async(cached_async, args.concurrency))
+    print(f" - [캐시 동시] 동기 {sync_elapsed:4.2f}s / 실행 {calls['sync']}회, "
+          f"비동기 {async_elapsed:4.2f}s / 실행 {calls['async']}회")
+
+    sync_elapsed = run_sync(cached_sync, args.concurrency)
+    async_elapsed = asyncio.run(run_async(cached_async, args.concurrency))
+    print(f" - [캐시 반복] 동기 {sync_elapsed:4.2f}s / 실행 {calls['sync']}회, "
+          f"비동기 {async_elapsed:4.2f}s / 실행 {calls['async']}회")
+
+    # 3. TTL 경과 후 → 이전 값 즉시 반환 + 백그라운드 갱신
+    time.sleep(1.1)
+    start = time.perf_counter()
+    stale_value = cached_sync.invoke({"query": ""})
+    stale_elapsed = time.perf_counter() - start
+    time.sleep(args.tool_latency + 0.2)
+    print(f" - [stale] {stale_elapsed * 1000:5.1f} ms 에 '{stale_value}' 반환 → 갱신 후 "
+          f"'{cached_sync.invoke({'query': ''})}'")
+    print(f"   cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,102 @@
 # common/callbacks.py
-from langchain_core.callbacks import BaseCallbackHandler
-from langchain_core.messages import BaseMessage 
-from sqlalchemy.orm import Session
-from database.rdm import RunTrace
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from config import answer_cache_configs
+from database.rdm import save_trace_start, save_trace_end
+from services.cache.tool_cache import TOOL_CACHE_EVENT
 from datetime import datetime
 import uuid
 
-class DBLoggingCallbackHandler(BaseCallbackHandler):
-    def __init__(self, session_id: str, db: Session):
+class DBLoggingCallbackHandler(AsyncCallbackHandler):
+    """
+    도구 실행 내역을 RunTrace 테이블에 기록하는 콜백 핸들러
+    - DB 기록은 Write-Behind writer 큐로 넘기므로 요청 처리를 기다리게 하지 않습니다.
+    - 사용한 도구 목록/에러 여부를 모아 두어 답변 캐시 TTL 결정에 사용합니다.
+      (예외뿐 아니라 도구가 반환한 오류 문구(error_markers)도 에러로 처리 → 실패한 조회로 만든 답변은 캐시 안 함)
+    - 도구 결과 캐시 사용 여부(hit/stale/miss/shared)를 trace outputs 의 "cache" 에 함께 기록합니다.
+    """
+    def __init__(self, session_id: str):
         self.session_id = session_id
-        self.db = db
-        self.run_map = {} # 실행 중인 작업의 ID를 추적하기 위함
+        self.run_map = {} # 실행 중인 작업의 시작 시간 (종료/에러 시 제거)
+        self.tools_used = [] # 이번 요청에서 호출된 도구 이름
+        self.has_error = False
+        self.cache_status = {} # 도구 run_id → 결과 캐시 사용 여부 (tool_cache 이벤트)
 
     # 1. 도구 실행 시작 시
-    def on_tool_start(self, serialized: dict, input_str: str, **kwargs):
+    async def on_tool_start(self, serialized: dict, input_str: str, **kwargs):
         try:
             run_id = str(kwargs.get("run_id", uuid.uuid4()))
             name = serialized.get("name", "unknown_tool")
-            
+            start_time = datetime.now()
+            self.tools_used.append(name)
+
             # DB에 '시작' 상태로 기록
-            trace = RunTrace(
-                id=run_id,
+            await save_trace_start(
+                run_id=run_id,
                 session_id=self.session_id,
                 type="tool",
                 name=name,
                 inputs={"input": input_str},
-                status="started",
-                start_time=datetime.now()
+                start_time=start_time
             )
-            self.db.add(trace)
-            self.db.commit()
-            self.run_map[run_id] = trace # 메모리에 잠시 저장
-            
+            self.run_map[run_id] = start_time
+
         except Exception as e:
             # [중요] 로그 저장이 실패해도 챗봇은 죽지 않게 방어
             print(f"로그 저장 실패 (start): {e}")
-            self.db.rollback()
 
     # 2. 도구 실행 완료 시
-    def on_tool_end(self, output: str, **kwargs):
+    async def on_tool_end(self, output: str, **kwargs):
         try:
             run_id = str(kwargs.get("run_id"))
-            trace = self.run_map.get(run_id)
-            
-            if trace:
-                final_output = output
-                if isinstance(output, BaseMessage):
-                    final_output = output.content
-                elif not isinstance(output, (dict, list, str, int, float, bool, type(None))):
-                    final_output = str(output)
-                trace.outputs = {"output": final_output}
-                trace.status = "success"
-                trace.end_time = datetime.now()
-                trace.duration = (trace.end_time - trace.start_time).total_seconds()
-                
-                self.db.add(trace) # Update
-                self.db.commit()
+            start_time = self.run_map.pop(run_id, None)
+            final_output = output
+            if isinstance(output, BaseMessage):
+                final_output = output.content
+            elif not isinstance(output, (dict, list, str, int, float, bool, type(None))):
+                final_output = str(output)
+            if isinstance(final_output, str) and \
+                    any(marker in final_output for marker in answer_cache_configs.get("error_markers", [])):
+                self.has_error = True
+
+            if start_time:
+                end_time = datetime.now()
+                outputs = {"output": final_output}
+                cache_status = self.cache_status.pop(run_id, None)
+                if cache_status:
+                    outputs["cache"] = cache_status
+
+                await save_trace_end(
+                    run_id,
+                    outputs=outputs,
+                    status="success",
+                    end_time=end_time,
+                    duration=(end_time - start_time).total_seconds()
+                )
         except Exception as e:
              print(f"로그 저장 실패 (end): {e}")
-             self.db.rollback()
+
     # 3. 도구 에러 발생 시
-    def on_tool_error(self, error: BaseException, **kwargs):
+    async def on_tool_error(self, error: BaseException, **kwargs):
+        self.has_error = True
         try:
             run_id = str(kwargs.get("run_id"))
-            trace = self.run_map.get(run_id)
-            
-            if trace:
-                trace.error_message = str(error)
-                trace.status = "error"
-                trace.end_time = datetime.now()
-                
-                self.db.add(trace)
-                self.db.commit()
+            start_time = self.run_map.pop(run_id, None)
+            self.cache_status.pop(run_id, None)
+
+            if start_time:
+                end_time = datetime.now()
+                await save_trace_end(
+                    run_id,
+                    error_message=str(error),
+                    status="error",
+                    end_time=end_time,
+                    duration=(end_time - start_time).total_seconds()
+                )
         except Exception as e:
             print(f"로그 저장 실패 (error): {e}")
-            self.db.rollback()
\ No newline at end of file
+
+    # 4. 도구 결과 캐시 이벤트 (CachedTool 이 실행 중에 전달)
+    async def on_custom_event(self, name: str, data, *, run_id, **kwargs):
+        if name == TOOL_CACHE_EVENT:
+            self.cache_status[str(run_id)] = data.get("status")
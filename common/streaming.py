@@ -0,0 +1,72 @@
+# common/streaming.py
+import json
+from typing import Any
+
+# ReAct 텍스트 출력에서 최종 답변이 시작되는 지점
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Server-Sent Events 프레임 문자열을 생성합니다.
+    예: event: token\\ndata: {"content": "안녕"}\\n\\n
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def extract_chunk_text(chunk: Any) -> str:
+    """
+    LLM 스트리밍 청크(AIMessageChunk)에서 사용자에게 보여줄 텍스트만 추출합니다.
+    (Gemini 처럼 content가 리스트로 오는 경우도 처리)
+    """
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return ""
+
+
+def summarize_tool_output(output: Any, limit: int = 200) -> str:
+    """도구 실행 결과(ToolMessage, str 등)를 화면 표시용 짧은 문자열로 변환"""
+    text = getattr(output, "content", output)
+    text = str(text)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class FinalAnswerStreamFilter:
+    """
+    ReAct 형식(Thought/Action/Final Answer)으로 출력하는 LLM의 토큰 중
+    'Final Answer:' 이후의 텍스트만 통과시키는 필터 (LangGraph 에이전트용)
+    - LLM 호출(run_id)마다 버퍼를 따로 관리합니다.
+    """
+
+    def __init__(self, marker: str = FINAL_ANSWER_MARKER):
+        self.marker = marker
+        self._buffers: dict[str, str] = {}   # marker 이전까지 누적된 텍스트
+        self._opened: set[str] = set()       # marker가 이미 등장한 run_id
+
+    def feed(self, run_id: str, token: str) -> str:
+        """토큰을 넣고, 화면에 내보낼 텍스트를 반환 (없으면 빈 문자열)"""
+        if run_id in self._opened:
+            return token
+
+        buffer = self._buffers.get(run_id, "") + token
+        index = buffer.find(self.marker)
+        if index < 0:
+            self._buffers[run_id] = buffer
+            return ""
+
+        # marker 발견 → 이후 텍스트부터 스트리밍 시작
+        self._buffers.pop(run_id, None)
+        self._opened.add(run_id)
+        return buffer[index + len(self.marker):].lstrip()
+
+    def close(self, run_id: str):
+        """LLM 호출이 끝나면 버퍼 정리"""
+        self._buffers.pop(run_id, None)
+        self._opened.discard(run_id)
@@ -1,3 +1,5 @@
 from .llm_config import llm_configs, ACTIVE_MODEL, ModelType, MIDDLEWARE_SUMMARY_MODEL
 from .embedding_config import embedding_configs, EmbeddingType, ACTIVE_EMBEDDING
-from .prompt_config import ACTIVE_PROMPT
\ No newline at end of file
+from .prompt_config import ACTIVE_PROMPT
+from .retriever_config import retriever_configs, RetrievalMode, ACTIVE_RETRIEVAL_MODE
+from .cache_config import answer_cache_configs, tool_cache_configs
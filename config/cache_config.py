@@ -0,0 +1,41 @@
+# 도구가 예외 대신 반환하는 오류 문구 (이 문구가 있는 도구 결과/그 결과로 만든 답변은 캐시하지 않음)
+TOOL_ERROR_MARKERS = ["오류 발생", "❌"]
+
+# 답변 캐시 설정 (반복되는 질문은 에이전트를 실행하지 않고 이전 최종 답변을 반환)
+# ※ 캐시 키는 질문 문장만 사용하므로 이전 대화가 없는 스레드의 첫 질문만 조회/저장합니다.
+#   (대화 중 후속 질문은 같은 문장이라도 맥락에 따라 답이 달라짐 → 항상 에이전트 실행)
+answer_cache_configs = {
+    "enabled": True,
+    "similarity_threshold": 0.95,   # 임베딩 코사인 유사도가 이 값 이상이면 같은 질문으로 간주
+    "max_entries": 5000,            # 메모리에 보관할 최대 답변 수 (초과 시 오래된 항목부터 삭제)
+    "min_query_chars": 6,           # 정규화 후 이보다 짧은 질문은 캐시하지 않음
+
+    # 답변 유효 시간(초) - 답변에 사용된 도구 중 가장 짧은 값을 적용
+    "default_ttl": 3600,            # 도구 없이 생성된 답변
+    "unknown_tool_ttl": 300,        # tool_ttls 에 없는 도구를 사용한 답변
+    # ※ 키는 trace 에 기록되는 실제 도구 이름(tool.name) - 레지스트리 이름과 다를 수 있음 (예: Tavily)
+    "tool_ttls": {
+        "get_current_date": 300,            # 날짜/시간
+        "get_kospi_index": 60,              # 시세
+        "get_kospi_trend": 600,             # 시세 추세 (일별 종가 기준)
+        "tavily_search_results_json": 1800, # 웹 검색 (레지스트리 이름: tavily_search)
+        "search_service_requests": 300,     # 업무 요청 현황 (DB)
+        "get_retrieve_context": 86400,      # 10-K 문서 검색 (RAG)
+    },
+    "error_markers": TOOL_ERROR_MARKERS,  # 도구 결과에 포함되면 도구 오류로 보고 답변을 캐시하지 않음
+}
+
+# 도구 실행 결과 캐시 (같은 인자로 호출된 도구 결과를 재사용, 동시에 들어온 같은 호출은 1번만 실행)
+# - tools 에 없는 도구는 캐시하지 않음 (부작용이 있는 도구는 넣지 말 것, 등록 시 cache=False 로도 제외 가능)
+# - ttl: 그대로 재사용하는 시간(초) / stale_ttl: ttl 이후 이전 값을 바로 반환하고 백그라운드에서 갱신하는 시간(초)
+# - skip_if_contains: 결과에 이 문구가 있으면 캐시하지 않음 (오류를 문자열로 반환하는 도구)
+tool_cache_configs = {
+    "enabled": True,
+    "max_entries": 2000,
+    "tools": {
+        "get_current_date": {"ttl": 30},
+        "tavily_search": {"ttl": 1800, "stale_ttl": 3600},
+        "search_service_requests": {"ttl": 60, "skip_if_contains": TOOL_ERROR_MARKERS},
+        "get_retrieve_context": {"ttl": 600},
+    },
+}
@@ -2,9 +2,11 @@ from config.settings import setting
 
 class EmbeddingType:
     OPENAI_EMBEDDING_3_SMALL = "text-embedding-3-small"
+    LOCAL_MULTILINGUAL_E5_SMALL = "multilingual-e5-small"
 
 # =========================================================
 # ▼ [여기를 수정하세요] 사용할 Embedding 을 여기서 선택합니다.
+# ※ 임베딩 모델을 바꾸면 벡터 차원이 달라지므로 문서를 다시 적재해야 합니다.
 # =========================================================
 ACTIVE_EMBEDDING = EmbeddingType.OPENAI_EMBEDDING_3_SMALL
 # =========================================================
@@ -15,6 +17,32 @@ embedding_configs = {
     EmbeddingType.OPENAI_EMBEDDING_3_SMALL: {
         "provider": "openai",
         "model_name": "text-embedding-3-small",
-        "api_key": setting.OPENAI_API_KEY
+        "api_key": setting.OPENAI_API_KEY,
+        # 임베딩 캐시 (메모리 LRU + SQLite 디스크)
+        "cache": {
+            "enabled": True,
+            "memory_max_entries": 10000,   # 메모리에 보관할 벡터 수
+            "disk_max_mb": 512             # 디스크 캐시 최대 용량(MB)
+        }
+    },
+
+    # 2. 로컬 CPU 임베딩 (multilingual-e5-small, 한국어 지원)
+    EmbeddingType.LOCAL_MULTILINGUAL_E5_SMALL: {
+        "provider": "local",
+        "model_name": "intfloat/multilingual-e5-small",
+        "device": "cpu",
+        "backend": "torch",            # "torch" 또는 "onnx" (onnx 는 optimum[onnxruntime] 필요)
+        "quantize_int8": False,        # onnx 백엔드에서 int8 동적 양자화 사용 여부
+        "num_threads": 4,              # CPU 추론 스레드 수
+        "batch_size": 32,              # 한 번에 인코딩할 문장 수
+        "max_wait_ms": 5,              # 동시 질문을 모으는 최대 대기 시간 (micro-batching)
+        "query_prefix": "query: ",     # e5 계열 모델 입력 규칙
+        "document_prefix": "passage: ",
+        "normalize": True,
+        "cache": {
+            "enabled": True,
+            "memory_max_entries": 10000,
+            "disk_max_mb": 512
+        }
     },
 }
\ No newline at end of file
@@ -17,12 +17,107 @@ ACTIVE_MODEL = ModelType.HANWHA_SYSTEM_CUSTOM_EXAONE
 MIDDLEWARE_SUMMARY_MODEL = ModelType.HANWHA_SYSTEM_CUSTOM_EXAONE
 # =========================================================
 
+# 역할별 파라미터 변경 (예: "summary": {"temperature": 0.0})
+# - 같은 모델을 쓰는 역할끼리는 객체/가중치를 공유하고, 여기 적은 값만 다른 view를 사용
+MODEL_ROLE_OVERRIDES = {
+    "main": {},
+    "summary": {},
+}
+
+# 응답 캐시 설정 예시 (모델별 "cache" 항목, 생략하면 캐시 사용 안 함)
+# - 같은 모델 + 같은 메시지 목록 + 같은 파라미터(stop 등)이면 저장된 응답을 재사용
+# - temperature가 max_temperature보다 높은 모델은 켜져 있어도 자동으로 캐시하지 않음
+LLM_CACHE_DEFAULT = {
+    "enabled": True,
+    "max_temperature": 0.3,
+    "ttl_seconds": 86400,   # 응답 유효 시간 (None이면 만료 없음)
+    "max_mb": 256           # 모델별 디스크 캐시 최대 용량(MB)
+}
+
+# 원격 LLM API HTTP 연결 설정 (모델별 "http" 항목)
+# - 같은 base_url 을 쓰는 모델은 커넥션 풀을 공유 (keep-alive로 TLS 핸드셰이크 반복 방지)
+# - http2 는 h2 패키지가 설치된 경우에만 적용
+LLM_HTTP_DEFAULT = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 60.0,   # 유휴 연결 유지 시간(초)
+    "connect_timeout": 5.0,
+    "read_timeout": 120.0,      # 응답(토큰 생성) 대기 시간
+    "write_timeout": 30.0,
+    "pool_timeout": 10.0,       # 풀에서 빈 연결을 기다리는 시간
+    "http2": True,
+    "max_retries": 2
+}
+
+# 원격 LLM API 동시 호출 한도 (모델별 "limiter" 항목, OpenAI 호환 API에 적용)
+# - 응답 지연/429·5xx 에 따라 한도를 자동 조정(AIMD)하고, 한도를 넘는 요청은 대기열에서 기다림
+# - 대기열이 가득 차거나 queue_timeout 을 넘기면 즉시 거절 → 사용자에게 '요청이 많다'는 안내
+LLM_LIMITER_DEFAULT = {
+    "enabled": True,
+    "initial_limit": 8,         # 시작 동시 호출 수
+    "min_limit": 1,
+    "max_limit": 64,
+    "max_queue": 100,           # 대기 가능한 최대 요청 수
+    "queue_timeout": 30.0,      # 대기 최대 시간(초)
+    "latency_tolerance": 3.0,   # 평균 지연의 몇 배를 넘으면 과부하로 볼지
+    "backoff": 0.7              # 과부하 시 한도 감소 비율
+}
+
+# 원격 LLM 복제 서버 라우팅 설정 (모델별 "router" 항목, "base_urls" 에 2개 이상일 때 적용)
+# - EWMA 지연 × 진행 중 요청 수가 가장 작은 서버 선택, 연속 실패한 서버는 cooldown 동안 제외
+# - 연결 실패/타임아웃/502·503·504 는 다른 서버로 재시도, hedge 사용 시 p95 지연을 넘긴 요청은 다른 서버에도 전송
+LLM_ROUTER_DEFAULT = {
+    "enabled": True,
+    "ewma_alpha": 0.3,          # 지연 이동 평균 반영 비율
+    "eject_after": 3,           # 연속 실패 몇 번이면 제외할지
+    "cooldown": 30.0,           # 제외 시간(초)
+    "max_attempts": 2,          # 서버를 바꿔 시도할 최대 횟수
+    "hedge": False,             # 느린 요청을 다른 서버에도 보낼지 (서버 부하 증가)
+    "hedge_min_delay": 2.0      # hedge 최소 대기 시간(초, 기본은 최근 p95 지연)
+}
+
+# 로컬 모델 동시 요청 micro-batching 설정 (모델별 "batching" 항목, 생략하면 사용 안 함)
+LOCAL_BATCHING_DEFAULT = {
+    "enabled": True,
+    "max_batch_size": 8,        # 한 번의 generate에 묶을 최대 요청 수
+    "max_wait_ms": 10,          # 첫 요청 이후 추가 요청을 기다리는 시간
+    "max_padding_ratio": 0.3    # 입력 길이 차이로 생기는 패딩 토큰 허용 비율
+}
+
+# 로컬 모델 공통 prefix KV 캐시 설정 (모델별 "prefix_cache" 항목, 생략하면 사용 안 함)
+# - 시스템 프롬프트/few-shot/ReAct 템플릿처럼 매번 같은 앞부분의 KV를 재사용해 prefill 시간 단축
+# - batching 과 함께 쓸 때: 같은 prefix 를 재사용하는 요청끼리만 한 배치로 묶임
+#   (prefix 가 다른 요청 / prefix 가 없는 요청은 별도 generate → 동시 요청이 여러 prefix 로 갈리면 배치가 작아짐)
+# - 비용: prefix 마다 KV 메모리(max_entries 개) + 배치마다 KV 복사, 처음 반복된 prefix 는 계산만 하고 다음 요청부터 재사용
+# - 프롬프트가 짧거나 요청마다 앞부분이 달라 hit_rate(/metrics)가 낮으면 끄는 편이 배치 효율이 좋음
+LOCAL_PREFIX_CACHE_DEFAULT = {
+    "enabled": True,
+    "max_entries": 8,           # 보관할 prefix 수 (LRU)
+    "min_prefix_tokens": 64     # 이보다 짧게 겹치는 앞부분은 캐시하지 않음
+}
+
+# 대화 이력 토큰 예산 (모델별 "context" 항목, ContextBudgetMiddleware 가 사용)
+# - 이력이 max_history_tokens 를 넘으면 오래된 메시지부터 target_ratio 까지 줄임 (매 턴 삭제 방지)
+# - tokenizer: "tiktoken"(encoding 지정) / "model"(로컬 모델 토크나이저)
+# - 요약 기준도 예산에서 계산 → 요약(BackgroundSummarizationMiddleware)이 먼저 동작하고, 이 예산은 그 뒤의 안전장치
+#   (기본 8000 기준: 4000 토큰에서 백그라운드 요약 등록, 7000 토큰에서 요청 중 동기 요약)
+LLM_CONTEXT_DEFAULT = {
+    "max_history_tokens": 8000,
+    "target_ratio": 0.75,       # 줄일 때 목표 크기 (예산 대비)
+    "summary_ratio": 0.5,       # 백그라운드 요약 시작 (예산 대비)
+    "summary_sync_ratio": 0.875,  # 요약이 아직 없을 때 요청 중 동기 요약 (예산 대비, 1.0 미만이어야 예산보다 먼저 동작)
+    "tokenizer": "tiktoken",
+    "encoding": "o200k_base",
+    "keep_first": True,         # 첫 메시지(요약/초기 지시) 유지
+    "cache_size": 10000         # 메시지별 토큰 수 캐시 크기
+}
+
 # 모델별 세부 설정 관리
 llm_configs = {
     # 1. 로컬 모델 (HyperCLOVA X 1.5B)
     ModelType.HYPERCLOVA_LOCAL_1_5B: {
         "provider": "local",
-        "model_path": setting.SLM_BASE_DIR / "HyperCLOVAX-SEED-Text-Instruct-1.5B",
+        "model_path": setting.SLM_NAVER_DIR / "HyperCLOVAX-SEED-Text-Instruct-1.5B",
         "model_kwargs": {
             "device_map": "auto",
             "trust_remote_code": True
@@ -31,13 +126,21 @@ llm_configs = {
             "max_new_tokens": 512,
             "temperature": 0.1,
             "repetition_penalty": 1.1
-        }
+        },
+        # CPU 양자화 실행 (mode: None=원본 가중치, device_map 그대로 - GPU 가 있으면 GPU 사용)
+        # GPU 없는 노드에서만 "int8_dynamic" 으로 지정 (torch int8 동적 양자화, CPU 전용 → device_map 무시)
+        # 변환 결과는 database/cache/quantized 에 저장되어 재시작 시 재사용됩니다.
+        "quantization": {"mode": None, "num_threads": None},
+        "batching": LOCAL_BATCHING_DEFAULT,
+        "prefix_cache": LOCAL_PREFIX_CACHE_DEFAULT,
+        "cache": LLM_CACHE_DEFAULT,
+        "context": {**LLM_CONTEXT_DEFAULT, "max_history_tokens": 3000, "tokenizer": "model"}
     },
     
     # 2. 로컬 모델 (0.5B - 테스트용)
     ModelType.HYPERCLOVA_LOCAL_0_5B: {
         "provider": "local",
-        "model_path": setting.SLM_BASE_DIR / "HyperCLOVAX-SEED-Text-Instruct-0.5B",
+        "model_path": setting.SLM_NAVER_DIR / "HyperCLOVAX-SEED-Text-Instruct-0.5B",
         "model_kwargs": {
             "device_map": "auto",
             "trust_remote_code": True
@@ -45,7 +148,12 @@ llm_configs = {
         "pipeline_kwargs": {
             "max_new_tokens": 256,
             "temperature": 0.1
-        }
+        },
+        "quantization": {"mode": None, "num_threads": None},
+        "batching": LOCAL_BATCHING_DEFAULT,
+        "prefix_cache": LOCAL_PREFIX_CACHE_DEFAULT,
+        "cache": LLM_CACHE_DEFAULT,
+        "context": {**LLM_CONTEXT_DEFAULT, "max_history_tokens": 1500, "tokenizer": "model"}
     },
 
     # 3. OpenAI (GPT-4)
@@ -53,21 +161,32 @@ llm_configs = {
         "provider": "openai",
         "model_name": "gpt-4o",
         "temperature": 0.7,
-        "api_key": setting.OPENAI_API_KEY
+        "api_key": setting.OPENAI_API_KEY,
+        "http": LLM_HTTP_DEFAULT,
+        "limiter": LLM_LIMITER_DEFAULT,
+        "context": {**LLM_CONTEXT_DEFAULT, "max_history_tokens": 16000}
     },
     # 4. Gemini (2.5-Flash)
     ModelType.GEMINI_2_5_FLASH: {
         "provider": "google",
         "model_name": "gemini-2.5-flash",
         "temperature": 0.7,
-        "api_key": setting.GOOGLE_API_KEY
+        "api_key": setting.GOOGLE_API_KEY,
+        "http": LLM_HTTP_DEFAULT,
+        "context": {**LLM_CONTEXT_DEFAULT, "max_history_tokens": 16000}
     },
     # 5. Hanwha System - Custom EXAONE
     ModelType.HANWHA_SYSTEM_CUSTOM_EXAONE: {
         "provider": "hanwha_system",
         "model_name": "LGAI-EXAONE/EXAONE-4.0-32B-FP8",
-        "base_url": setting.HANWHA_SYSTEM_EXAONE_URL,
+        "base_url": setting.HANWHA_SYSTEM_EXAONE_URLS[0],
+        "base_urls": setting.HANWHA_SYSTEM_EXAONE_URLS,   # 복제 서버 목록 (1대면 라우팅 없이 직접 연결)
         "temperature": 1.0,
-        "api_key": setting.HANWHA_SYSTEM_EXAONE_KEY
+        "api_key": setting.HANWHA_SYSTEM_EXAONE_KEY,
+        "http": LLM_HTTP_DEFAULT,
+        "limiter": LLM_LIMITER_DEFAULT,
+        "router": LLM_ROUTER_DEFAULT,
+        "cache": LLM_CACHE_DEFAULT,  # temperature 1.0 → 현재는 자동으로 캐시 생략
+        "context": LLM_CONTEXT_DEFAULT
     }
 }
\ No newline at end of file
@@ -0,0 +1,21 @@
+class RetrievalMode:
+    VECTOR = "vector"      # 벡터 유사도 검색만 사용 (매 질문마다 임베딩 호출)
+    LEXICAL = "lexical"    # BM25 키워드 검색만 사용 (임베딩 호출 없음)
+    HYBRID = "hybrid"      # BM25 + 벡터 결과를 RRF로 결합
+
+# =========================================================
+# ▼ [여기를 수정하세요] 사용할 검색 방식을 여기서 선택합니다.
+# =========================================================
+ACTIVE_RETRIEVAL_MODE = RetrievalMode.HYBRID
+# =========================================================
+
+retriever_configs = {
+    "k": 2,                     # 최종 반환 문서 수
+    "candidate_k": 10,          # 결합 전 각 검색 방식에서 가져올 후보 수
+    "rrf_k": 60,                # Reciprocal Rank Fusion 상수
+
+    # BM25 결과가 확실하면 벡터 검색(임베딩 호출) 생략
+    "lexical_shortcut": True,
+    "lexical_min_score": 8.0,   # 1위 BM25 점수 최소값
+    "lexical_margin": 1.5,      # 1위 점수 / 2위 점수 최소 비율
+}
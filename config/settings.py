@@ -16,6 +16,15 @@ class Setting:
     # DB 저장 폴더
     DB_DIR = BASE_DIR / "database" / "rdm"
     
+    # LangGraph 체크포인트(대화 상태) 저장 폴더
+    CHECKPOINT_DIR = BASE_DIR / "database" / "checkpoint"
+
+    # 캐시(임베딩 등) 저장 폴더
+    CACHE_DIR = BASE_DIR / "database" / "cache"
+
+    # 시세 이력(Parquet) 저장 폴더
+    TIMESERIES_DIR = BASE_DIR / "database" / "timeseries"
+
     # 로컬 모델 저장 폴더 (slm)
     SLM_BASE_DIR = BASE_DIR / "slm"
     
@@ -34,6 +43,20 @@ class Setting:
 
     # --- [Base URL] (.env에서 가져옴) ---
     HANWHA_SYSTEM_EXAONE_URL = os.getenv("HANWHA_SYSTEM_EXAONE_URL")
+    # 복제 서버가 여러 대면 쉼표로 구분해 지정 (없으면 HANWHA_SYSTEM_EXAONE_URL 1대)
+    HANWHA_SYSTEM_EXAONE_URLS = [url.strip() for url in os.getenv("HANWHA_SYSTEM_EXAONE_URLS", "").split(",")
+                                 if url.strip()] or [HANWHA_SYSTEM_EXAONE_URL]
+
+    # --- [체크포인트 설정] ---
+    CHECKPOINT_MAX_HOT_THREADS = 1000  # 메모리에 유지할 최근 대화(thread) 수 (LRU)
+    CHECKPOINT_KEEP_LAST = 2           # thread 별로 보관할 최신 체크포인트 수 (나머지 삭제)
+
+    # --- [도구 실행 설정] ---
+    TOOL_MAX_WORKERS = 8  # 동기 도구 동시 실행 스레드 수 (그래프 에이전트의 다중 Action)
+
+    # --- [시세 저장소 설정] ---
+    TIMESERIES_REFRESH_INTERVAL = 600  # 백그라운드 증분 갱신 주기(초)
+    TIMESERIES_SNAPSHOT_SIZE = 120     # 메모리 스냅샷에 유지할 최근 거래일 수
 
     # --- [앱 설정] ---
     APP_NAME = "My AI Assistant"
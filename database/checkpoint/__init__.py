@@ -0,0 +1,37 @@
+# database/checkpoint/__init__.py
+import sqlite3
+import threading
+from config.settings import setting
+from common.utils import ensure_directory
+from .saver import BoundedSqliteSaver
+
+_checkpointers: dict = {}
+_lock = threading.Lock()
+
+def get_checkpointer(name: str = "agent") -> BoundedSqliteSaver:
+    """
+    에이전트별 체크포인터를 반환합니다. (프로세스당 1개, 같은 이름이면 재사용)
+    - 파일 경로: database/checkpoint/{name}.db
+    - 여러 uvicorn 워커가 같은 파일을 공유할 수 있도록 WAL 모드 + busy timeout 사용
+    """
+    with _lock:
+        if name in _checkpointers:
+            return _checkpointers[name]
+
+        ensure_directory(setting.CHECKPOINT_DIR)
+        conn = sqlite3.connect(
+            str(setting.CHECKPOINT_DIR / f"{name}.db"),
+            check_same_thread=False,  # 스레드 풀(비동기 API)에서도 사용
+            timeout=30                # 다른 워커가 쓰는 중이면 최대 30초 대기
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        saver = BoundedSqliteSaver(
+            conn,
+            max_hot_threads=setting.CHECKPOINT_MAX_HOT_THREADS,
+            keep_last=setting.CHECKPOINT_KEEP_LAST
+        )
+        saver.setup()
+        _checkpointers[name] = saver
+        return saver
@@ -0,0 +1,175 @@
+# database/checkpoint/saver.py
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BoundedSqliteSaver(SqliteSaver):
+    """
+    SQLite(WAL) 기반 LangGraph 체크포인터 + 최근 대화(thread) LRU 메모리 캐시
+    - 모든 체크포인트는 SQLite에 바로 기록(write-through) → 재시작/멀티 워커에서도 대화 유지
+    - 메모리에는 최근 max_hot_threads 개 thread의 최신 체크포인트만 보관 (오래된 것은 제거)
+    - thread 별로 최신 keep_last 개의 체크포인트만 남기고 나머지는 삭제(prune)
+    - 캐시 사용 전 DB의 최신 checkpoint_id와 비교하므로 다른 워커 프로세스가 갱신한 대화도 안전
+    """
+
+    def __init__(self, conn, *, max_hot_threads: int = 1000, keep_last: int = 2, serde=None):
+        super().__init__(conn, serde=serde)
+        self.max_hot_threads = max_hot_threads
+        self.keep_last = keep_last
+        self._hot: OrderedDict = OrderedDict()  # (thread_id, checkpoint_ns) -> CheckpointTuple
+        self._hot_lock = threading.Lock()
+        self.stats = {"hot_hits": 0, "hot_misses": 0, "pruned": 0}
+
+    # --- [메모리 캐시 관리] ---
+    def _remember(self, key: tuple, checkpoint_tuple: CheckpointTuple):
+        with self._hot_lock:
+            self._hot[key] = checkpoint_tuple
+            self._hot.move_to_end(key)
+            while len(self._hot) > self.max_hot_threads:
+                self._hot.popitem(last=False)  # 가장 오래 사용하지 않은 thread 제거
+
+    def _forget(self, key: tuple):
+        with self._hot_lock:
+            self._hot.pop(key, None)
+
+    def _latest_checkpoint_id(self, thread_id: str, checkpoint_ns: str) -> Optional[str]:
+        """PK 인덱스만 사용하는 가벼운 조회 (blob 역직렬화 없음)"""
+        with self.cursor(transaction=False) as cur:
+            cur.execute(
+                "SELECT checkpoint_id FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            )
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        """최신 keep_last 개를 제외한 이전 체크포인트와 그 writes 삭제"""
+        keep = (
+            "SELECT checkpoint_id FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT ?"
+        )
+        params = (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last)
+        with self.cursor() as cur:
+            cur.execute(
+                f"DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND checkpoint_id NOT IN ({keep})",
+                params,
+            )
+            cur.execute(
+                f"DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND checkpoint_id NOT IN ({keep})",
+                params,
+            )
+            self.stats["pruned"] += cur.rowcount
+
+    # --- [동기 API] ---
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        # 특정 checkpoint_id 조회(타임 트래블 등)는 캐시 없이 DB에서 바로 조회
+        if get_checkpoint_id(config):
+            return super().get_tuple(config)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = (thread_id, checkpoint_ns)
+
+        with self._hot_lock:
+            cached = self._hot.get(key)
+        if cached is not None:
+            if self._latest_checkpoint_id(thread_id, checkpoint_ns) == cached.config["configurable"]["checkpoint_id"]:
+                with self._hot_lock:
+                    if key in self._hot:
+                        self._hot.move_to_end(key)
+                self.stats["hot_hits"] += 1
+                return cached
+            self._forget(key)  # 다른 워커가 갱신함
+
+        self.stats["hot_misses"] += 1
+        checkpoint_tuple = super().get_tuple(config)
+        if checkpoint_tuple is not None:
+            self._remember(key, checkpoint_tuple)
+        return checkpoint_tuple
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint,
+            metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = (thread_id, checkpoint_ns)
+
+        # 방금 기록한 체크포인트를 그대로 캐시 (다음 턴에서 DB 역직렬화 생략)
+        parent_id = config["configurable"].get("checkpoint_id")
+        self._remember(key, CheckpointTuple(
+            config=next_config,
+            checkpoint=checkpoint,
+            metadata=get_checkpoint_metadata(config, metadata),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=[],
+        ))
+
+        if self.keep_last > 0:
+            self._prune(thread_id, checkpoint_ns)
+        return next_config
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]],
+                   task_id: str, task_path: str = "") -> None:
+        super().put_writes(config, writes, task_id, task_path)
+        # pending writes가 바뀌었으므로 다음 조회는 DB에서
+        self._forget((str(config["configurable"]["thread_id"]), config["configurable"].get("checkpoint_ns", "")))
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self._hot_lock:
+            for key in [k for k in self._hot if k[0] == str(thread_id)]:
+                del self._hot[key]
+
+    # --- [비동기 API] ---
+    # SQLite 작업은 짧고 내부 lock으로 직렬화되므로 스레드 풀에서 동기 API를 실행
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]],
+                          task_id: str, task_path: str = "") -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.delete_thread, thread_id)
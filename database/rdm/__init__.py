@@ -1,2 +1,7 @@
-from .connection import engine, Base, get_db
-from .models import ChatSession, ChatMessage, RunTrace
\ No newline at end of file
+from .connection import engine, async_engine, Base, get_db
+from .models import ChatSession, ChatMessage, RunTrace
+from .writer import WriteBehindWriter, get_writer
+from .crud import (
+    get_or_create_session, save_message, save_error_trace,
+    save_trace_start, save_trace_end, save_cache_trace
+)
@@ -1,27 +1,38 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from config.settings import setting  # settings 객체 가져오기
 
 # 1.  database 폴더 안에 DB 파일 생성
 # 결과 경로: 프로젝트루트/database/rdm/chat_history.db
 DB_URL = f"sqlite:///{setting.DB_DIR}/chat_history.db"
 
+# 비동기 드라이버(aiosqlite) 주소 - 요청 처리 경로(FastAPI)에서 사용
+ASYNC_DB_URL = f"sqlite+aiosqlite:///{setting.DB_DIR}/chat_history.db"
+
 # 2. 엔진 생성 (SQLite 필수 옵션 포함)
+# - 동기 엔진: 테이블 생성(create_all), 동기 도구(db_test) 등에서 사용
 engine = create_engine(
     DB_URL, 
     connect_args={"check_same_thread": False} # FastAPI 멀티스레드 호환용
 )
 
+# - 비동기 엔진: 이벤트 루프를 막지 않고 DB 입출력 처리
+async_engine = create_async_engine(ASYNC_DB_URL)
+
 # 3. 세션 생성기
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # commit 후에도 객체 속성 접근 가능 (lazy load 방지)
+)
 
 # 4. 모델 베이스
 Base = declarative_base()
 
-# 5. DB 세션 의존성 함수 (FastAPI용)
-def get_db():
-    db = SessionLocal()
-    try:
+# 5. DB 세션 의존성 함수 (FastAPI용, 비동기)
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
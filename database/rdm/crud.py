@@ -0,0 +1,112 @@
+# database/rdm/crud.py
+import uuid
+from datetime import datetime
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from common.logger import get_logger
+from .models import ChatSession, ChatMessage, RunTrace
+from .writer import get_writer
+
+logger = get_logger(__name__)
+
+# 모든 기록은 Write-Behind writer 큐에 넣고 바로 반환합니다.
+# (실제 DB 반영은 백그라운드에서 트랜잭션 단위로 묶어서 처리)
+
+# --- [헬퍼 함수] 세션 관리 ---
+async def get_or_create_session(session_id: str, user_id: str):
+    """세션이 없으면 생성 (이미 있으면 무시하는 멱등 upsert)"""
+    writer = get_writer()
+    if writer.is_known_session(session_id):
+        return
+
+    statement = (
+        sqlite_insert(ChatSession)
+        .values(session_id=session_id, user_id=user_id, created_at=datetime.now())
+        .on_conflict_do_nothing(index_elements=["session_id"])
+    )
+    # 기록이 끝난 뒤에만 캐시 (기록에 실패하면 다음 요청에서 다시 upsert)
+    await writer.submit(statement, on_written=lambda: writer.remember_session(session_id))
+
+# --- [헬퍼 함수] 메시지 저장 ---
+async def save_message(session_id: str, role: str, content: str):
+    await get_writer().submit(
+        insert(ChatMessage).values(
+            id=str(uuid.uuid4()),
+            session_id=session_id,
+            role=role,
+            content=content,
+            created_at=datetime.now()
+        )
+    )
+
+# --- [헬퍼 함수] RunTrace 시작/종료 기록 (콜백 핸들러용) ---
+async def save_trace_start(run_id: str, session_id: str, type: str, name: str,
+                           inputs: dict, start_time: datetime):
+    await get_writer().submit(
+        insert(RunTrace).values(
+            id=run_id,
+            session_id=session_id,
+            type=type,
+            name=name,
+            inputs=inputs,
+            status="started",
+            start_time=start_time
+        )
+    )
+
+async def save_trace_end(run_id: str, **values):
+    """시작 기록 이후의 결과(outputs, status, end_time 등) 반영"""
+    await get_writer().submit(
+        update(RunTrace).where(RunTrace.id == run_id).values(**values)
+    )
+
+# --- [헬퍼 함수] 답변 캐시 적중 기록 ---
+async def save_cache_trace(session_id: str, query: str, match: str, matched_query: str,
+                           similarity: float, tools: list, saved_seconds: float, duration: float):
+    """
+    에이전트 실행 없이 캐시 답변을 반환한 경우 RunTrace에 type='answer_cache'로 기록합니다.
+    (적중률 / 절약 시간 집계용)
+    """
+    now = datetime.now()
+    await get_writer().submit(
+        insert(RunTrace).values(
+            id=str(uuid.uuid4()),
+            session_id=session_id,
+            type="answer_cache",
+            name=f"{match}_hit",
+            inputs={"user_query": query},
+            outputs={"matched_query": matched_query, "similarity": similarity,
+                     "tools": tools, "saved_seconds": round(saved_seconds, 3)},
+            status="success",
+            start_time=now,
+            end_time=now,
+            duration=duration
+        )
+    )
+
+# --- [헬퍼 함수] 에러 발생 시 Trace 테이블에 기록 ---
+async def save_error_trace(session_id: str, error: Exception, query: str):
+    """
+    시스템 에러가 발생했을 때 RunTrace 테이블에 'error' 상태로 기록합니다.
+    """
+    try:
+        now = datetime.now()
+        await get_writer().submit(
+            insert(RunTrace).values(
+                id=str(uuid.uuid4()),
+                session_id=session_id,
+                type="system_error",   # 에러 타입 명시
+                name="chat_endpoint_exception",
+                inputs={"user_query": query}, # 어떤 질문에서 에러가 났는지 저장
+                outputs=None,
+                status="error",
+                error_message=str(error), # 에러 메시지 저장
+                start_time=now,
+                end_time=now
+            )
+        )
+        logger.info(f"에러 로그 저장 요청 완료 (Session: {session_id})")
+
+    except Exception as e:
+        # 에러 로그 저장조차 실패했을 경우 (최악의 상황)
+        logger.error(f"에러 로그 DB 저장 실패: {e}")
@@ -0,0 +1,159 @@
+# database/rdm/writer.py
+import asyncio
+from collections import OrderedDict
+from typing import Callable, Optional
+from sqlalchemy.sql import Executable
+from common.logger import get_logger
+from .connection import AsyncSessionLocal
+
+logger = get_logger(__name__)
+
+# 종료 신호 (큐에 넣으면 남은 작업을 모두 기록한 뒤 writer 종료)
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """
+    Write-Behind 방식의 DB 기록기
+    - 요청 처리 경로에서는 SQL 문을 큐에 넣기만 하고 바로 반환합니다.
+    - 백그라운드 작업이 큐를 비우면서 여러 INSERT/UPDATE를 하나의 트랜잭션으로 묶어 기록합니다.
+      (batch_size 만큼 모이거나 flush_interval 초가 지나면 flush)
+    - 큐는 start() 한 이벤트 루프(서버 lifespan)에 속함 → 다른 루프/스레드(도구 스레드의 콜백 등)에서 온
+      요청은 run_coroutine_threadsafe 로 그 루프에 넘겨서 넣습니다.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_queue: int = 10000,
+                 batch_size: int = 200, flush_interval: float = 0.5,
+                 max_known_sessions: int = 100000):
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_known_sessions = max_known_sessions
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # 큐/writer 작업이 속한 이벤트 루프
+        # DB 에 기록이 끝난 세션 ID 캐시 - 중복 upsert 방지
+        self.known_sessions: OrderedDict = OrderedDict()
+
+        # 통계
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "failed": 0}
+
+    # --- [수명 관리] ---
+    def start(self):
+        """현재 이벤트 루프에서 백그라운드 writer 시작 (이미 실행 중이면 무시)"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = self._loop.create_task(self._run())
+        logger.info(f"[WRITER] Write-Behind writer 시작 (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    async def stop(self):
+        """남은 작업을 모두 기록한 뒤 종료 (서버 종료 시 호출)"""
+        if not self._task or self._task.done():
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        logger.info(f"[WRITER] Write-Behind writer 종료 (stats={self.stats})")
+
+    # --- [기록 요청] ---
+    async def submit(self, statement: Executable, on_written: Optional[Callable[[], None]] = None):
+        """
+        SQL 문을 큐에 넣습니다.
+        큐가 가득 차면 빈 자리가 생길 때까지 대기합니다 (backpressure).
+        on_written: 해당 문장이 DB 에 기록된 뒤 writer 루프에서 호출 (실패해서 버려지면 호출 안 함)
+        """
+        self.start()
+        item = (statement, on_written)
+        if asyncio.get_running_loop() is self._loop:
+            await self._queue.put(item)
+        else:
+            # 다른 이벤트 루프(스레드)에서 호출 → writer 루프에서 put 실행 후 완료를 기다림
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop))
+        self.stats["queued"] += 1
+
+    def is_known_session(self, session_id: str) -> bool:
+        if session_id in self.known_sessions:
+            self.known_sessions.move_to_end(session_id)
+            return True
+        return False
+
+    def remember_session(self, session_id: str):
+        self.known_sessions[session_id] = True
+        if len(self.known_sessions) > self.max_known_sessions:
+            self.known_sessions.popitem(last=False)
+
+    # --- [백그라운드 처리] ---
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            # 첫 작업 이후 flush_interval 동안 batch_size 까지 모아서 한 번에 기록
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+        # 종료 신호 이후 남은 작업 정리
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                remaining.append(item)
+        if remaining:
+            await self._flush(remaining)
+
+    async def _flush(self, batch: list):
+        try:
+            async with self.session_factory() as db:
+                async with db.begin():
+                    for statement, _ in batch:
+                        await db.execute(statement)
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+            written = batch
+        except Exception as e:
+            # 묶음 전체가 실패하면 한 건씩 다시 시도 (문제 있는 행만 버림)
+            logger.error(f"[WRITER] 배치 기록 실패, 개별 재시도: {e}")
+            written = []
+            for item in batch:
+                try:
+                    async with self.session_factory() as db:
+                        async with db.begin():
+                            await db.execute(item[0])
+                    self.stats["written"] += 1
+                    written.append(item)
+                except Exception as row_error:
+                    self.stats["failed"] += 1
+                    logger.error(f"[WRITER] 기록 실패 (버림): {row_error}")
+
+        # 기록이 끝난 문장만 완료 콜백 호출
+        for _, on_written in written:
+            if on_written is not None:
+                on_written()
+
+
+# 프로세스 전역 writer
+_writer = WriteBehindWriter()
+
+def get_writer() -> WriteBehindWriter:
+    return _writer
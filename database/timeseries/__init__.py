@@ -0,0 +1,26 @@
+# database/timeseries/__init__.py
+import threading
+from config.settings import setting
+from .store import TimeSeriesStore, Snapshot, DataSource, finance_data_reader_source
+
+_stores: dict = {}
+_lock = threading.Lock()
+
+def get_timeseries_store(symbol: str = "KS11") -> TimeSeriesStore:
+    """
+    심볼별 시세 저장소를 반환합니다. (프로세스당 1개, 같은 심볼이면 재사용)
+    - 파일 경로: database/timeseries/{symbol}.parquet
+    - 백그라운드 갱신은 서버 lifespan 에서 start() / stop()
+    """
+    with _lock:
+        if symbol not in _stores:
+            _stores[symbol] = TimeSeriesStore(
+                symbol,
+                setting.TIMESERIES_DIR,
+                refresh_interval=setting.TIMESERIES_REFRESH_INTERVAL,
+                snapshot_size=setting.TIMESERIES_SNAPSHOT_SIZE
+            )
+        return _stores[symbol]
+
+def get_timeseries_stats() -> dict:
+    return {symbol: store.stats() for symbol, store in _stores.items()}
@@ -0,0 +1,233 @@
+# database/timeseries/store.py
+import importlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+from common.logger import get_logger
+from common.utils import ensure_directory
+
+logger = get_logger(__name__)
+
+# 저장하는 컬럼 (데이터 소스마다 부가 컬럼이 달라서 공통 OHLCV 만 float 로 보관)
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# (symbol, start, end) → 날짜 인덱스 DataFrame. start=None 이면 전체 이력
+DataSource = Callable[[str, Optional[str], Optional[str]], pd.DataFrame]
+
+
+def finance_data_reader_source(symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """기본 데이터 소스 - FinanceDataReader (import 비용이 크므로 처음 조회할 때 로드)"""
+    fdr = importlib.import_module("FinanceDataReader")
+    return fdr.DataReader(symbol, start, end)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """최근 N 거래일 종가 (불변 객체 - 갱신 시 통째로 교체하므로 읽을 때 잠금 불필요)"""
+    dates: Tuple[str, ...]
+    closes: Tuple[float, ...]
+    updated_at: float
+
+
+class TimeSeriesStore:
+    """
+    지수/종목 일별 시세 로컬 저장소 (Parquet)
+    - 처음 한 번만 전체 이력을 받고, 이후에는 마지막 저장일부터의 구간만 받아 병합 (증분 갱신)
+      ※ 마지막 저장일도 다시 받음 - 장중에 저장된 당일 값을 종가로 덮어쓰기 위해
+    - 백그라운드 스레드가 refresh_interval 마다 갱신, 실패해도 이전 데이터로 계속 응답
+    - 조회는 메모리의 최근 snapshot_size 거래일 스냅샷에서 처리 (스냅샷보다 긴 구간만 전체 이력 사용)
+    - 파일은 임시 파일에 쓴 뒤 교체 → 다른 워커 프로세스가 읽는 중이어도 깨진 파일을 보지 않음
+    """
+
+    def __init__(self, symbol: str, directory: Path, source: DataSource = finance_data_reader_source,
+                 refresh_interval: float = 600.0, snapshot_size: int = 120):
+        self.symbol = symbol
+        self.path = Path(directory) / f"{symbol}.parquet"
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.snapshot_size = snapshot_size
+
+        self._frame: Optional[pd.DataFrame] = None  # 전체 이력 (갱신 시 교체)
+        self._snapshot: Optional[Snapshot] = None
+        self._refresh_lock = threading.Lock()       # 갱신은 한 번에 하나만
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._last_attempt = 0.0                    # 마지막 갱신 시도 시각 (실패해도 기록 → 재시도 간격 유지)
+
+        # 통계
+        self.stats_counter = {"refreshes": 0, "failures": 0, "fetched_rows": 0, "full_fetches": 0}
+        self._last_refresh_ms = 0.0
+
+    # --- [수명 관리] ---
+    def start(self):
+        """백그라운드 갱신 시작 (시작하자마자 1회 갱신)"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name=f"timeseries-{self.symbol}", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._stop_event.wait(self.refresh_interval)
+
+    # --- [저장/갱신] ---
+    def load(self) -> bool:
+        """로컬 Parquet 파일을 메모리로 읽기 (파일이 없거나 깨졌으면 False)"""
+        if not self.path.exists():
+            return False
+        try:
+            frame = pd.read_parquet(self.path, engine="pyarrow")
+        except Exception as e:
+            logger.warning(f"[TIMESERIES] {self.path.name} 읽기 실패 (전체 이력을 다시 받습니다): {e}")
+            return False
+        if frame.empty:
+            return False
+        self._publish(frame)
+        # 파일이 갱신된 시각을 마지막 갱신 시도로 간주 → 다른 워커가 방금 받은 데이터면 다시 받지 않음
+        self._last_attempt = max(self._last_attempt, self.path.stat().st_mtime)
+        logger.info(f"[TIMESERIES] {self.symbol} 로컬 이력 로드: {len(frame)}행 (~{self._snapshot.dates[-1]})")
+        return True
+
+    def refresh(self, wait: bool = False) -> bool:
+        """누락 구간만 받아 병합 후 저장 (wait=False 면 이미 다른 스레드가 갱신 중일 때 건너뜀)"""
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        self._last_attempt = time.time()
+        start_time = time.perf_counter()
+        try:
+            if self._frame is None:
+                self.load()
+            frame = self._frame
+
+            # 1. 받을 구간 결정 (저장된 데이터가 없으면 전체 이력)
+            start = frame.index[-1].strftime("%Y-%m-%d") if frame is not None and len(frame) else None
+            fetched = self._normalize(self.source(self.symbol, start, None))
+            self.stats_counter["fetched_rows"] += len(fetched)
+            if start is None:
+                self.stats_counter["full_fetches"] += 1
+            if fetched.empty:
+                return True
+
+            # 2. 병합 (같은 날짜는 새로 받은 값 우선)
+            if frame is not None and len(frame):
+                merged = pd.concat([frame[frame.index < fetched.index[0]], fetched])
+                merged = merged[~merged.index.duplicated(keep="last")]
+            else:
+                merged = fetched
+
+            # 3. 저장 후 메모리 교체
+            self._write(merged)
+            self._publish(merged)
+            self.stats_counter["refreshes"] += 1
+            return True
+        except Exception as e:
+            self.stats_counter["failures"] += 1
+            logger.warning(f"[TIMESERIES] {self.symbol} 갱신 실패 (이전 데이터 유지): {e}")
+            return False
+        finally:
+            self._last_refresh_ms = (time.perf_counter() - start_time) * 1000
+            self._refresh_lock.release()
+
+    @staticmethod
+    def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+        if frame is None or frame.empty:
+            return pd.DataFrame(columns=COLUMNS, dtype=float)
+        frame = frame[[column for column in COLUMNS if column in frame.columns]].astype(float)
+        frame.index = pd.to_datetime(frame.index).normalize()
+        frame.index.name = "Date"
+        return frame.sort_index()
+
+    def _write(self, frame: pd.DataFrame):
+        ensure_directory(self.path.parent)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        frame.to_parquet(tmp_path, engine="pyarrow")
+        os.replace(tmp_path, self.path)
+
+    def _publish(self, frame: pd.DataFrame):
+        recent = frame.tail(self.snapshot_size)
+        self._snapshot = Snapshot(
+            dates=tuple(recent.index.strftime("%Y-%m-%d")),
+            closes=tuple(recent["Close"].tolist()),
+            updated_at=time.time(),
+        )
+        self._frame = frame
+
+    def ensure_loaded(self) -> Optional[Snapshot]:
+        """
+        조회 전 호출 - 메모리에 데이터가 없으면 파일 로드 → 그래도 없으면 지금 받음 (최초 1회만 대기)
+        백그라운드 갱신(start)을 쓰지 않는 경우에는 refresh_interval 이 지났을 때 조회 쪽에서 갱신을 예약
+        """
+        if self._snapshot is None:
+            with self._refresh_lock:
+                if self._snapshot is None:
+                    self.load()
+            if self._snapshot is None:
+                self.refresh(wait=True)
+        elif self._worker is None and time.time() - self._last_attempt > self.refresh_interval:
+            self._last_attempt = time.time()
+            threading.Thread(target=self.refresh, name=f"timeseries-{self.symbol}-once", daemon=True).start()
+        return self._snapshot
+
+    # --- [조회] ---
+    def _closes(self, count: int) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+        """최근 count 거래일 (날짜, 종가) - 스냅샷 범위 안이면 스냅샷, 넘으면 전체 이력"""
+        snapshot = self.ensure_loaded()
+        if snapshot is None or count < 1:  # count < 1 이면 음수 슬라이스가 엉뚱한 구간을 잘라냄
+            return (), ()
+        if count <= len(snapshot.closes):
+            return snapshot.dates[-count:], snapshot.closes[-count:]
+        recent = self._frame["Close"].tail(count)
+        return tuple(recent.index.strftime("%Y-%m-%d")), tuple(recent.tolist())
+
+    def change(self, days: int = 1) -> Optional[dict]:
+        """days 거래일 전 종가 대비 최신 종가 변화 (데이터가 부족하면 None, days 는 1 이상)"""
+        if days < 1:
+            raise ValueError(f"days 는 1 이상이어야 합니다: {days}")
+        dates, closes = self._closes(days + 1)
+        if len(closes) < days + 1:
+            return None
+        base, last = closes[0], closes[-1]
+        return {
+            "date": dates[-1], "base_date": dates[0], "close": last, "base_close": base,
+            "change": last - base, "change_percent": (last - base) / base * 100,
+        }
+
+    def moving_average(self, window: int) -> Optional[float]:
+        """최근 window 거래일 종가 단순 이동평균 (데이터가 부족하면 None, window 는 1 이상)"""
+        if window < 1:
+            raise ValueError(f"window 는 1 이상이어야 합니다: {window}")
+        _, closes = self._closes(window)
+        if len(closes) < window:
+            return None
+        return sum(closes) / window
+
+    def history(self, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """전체 이력 중 [start, end] 구간 (분석용, 복사본 반환)"""
+        self.ensure_loaded()
+        if self._frame is None:
+            return pd.DataFrame(columns=COLUMNS, dtype=float)
+        return self._frame.loc[start:end].copy()
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            **self.stats_counter,
+            "rows": 0 if self._frame is None else len(self._frame),
+            "last_date": snapshot.dates[-1] if snapshot and snapshot.dates else None,
+            "snapshot_age_s": round(time.time() - snapshot.updated_at, 1) if snapshot else None,
+            "last_refresh_ms": round(self._last_refresh_ms, 1),
+        }
@@ -0,0 +1,170 @@
+# database/verctor/ingest.py
+"""
+문서 적재(Ingestion) CLI - PDF → 청크 → 임베딩 → Chroma 저장
+
+실행: python -m database.verctor.ingest --path data/reports
+
+- PDF 페이지를 프로세스 풀에서 병렬로 파싱하고, 완료된 페이지부터 바로 청크로 분할합니다.
+- 청크 ID는 (파일 경로, 청크 내용)의 해시값이라 같은 내용은 항상 같은 ID가 됩니다.
+  → 변경이 없는 문서를 다시 적재하면 임베딩 작업이 0건
+  → 파일이 바뀌면 바뀐 청크만 임베딩하고, 사라진 청크는 삭제
+- 임베딩은 batch_size 단위로 묶어 최대 concurrency 개까지 동시에 요청합니다.
+- 같은 청크 ID로 BM25 키워드 색인(하이브리드 검색용)도 함께 갱신합니다.
+"""
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List
+
+from langchain_core.documents import Document
+
+from common.logger import get_logger
+from services.embedding import get_embedding
+from database.verctor.loader import find_pdf_files, count_pdf_pages, extract_pdf_pages, get_text_splitter
+from database.verctor.lexical import BM25Index
+from database.verctor.store import CHROMA_PATH, LEXICAL_INDEX_PATH, get_vector_db
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    pages: int = 0
+    chunks: int = 0
+    new_chunks: int = 0
+    deleted_chunks: int = 0
+    embedding_batches: int = 0
+    parse_seconds: float = 0.0
+    embed_seconds: float = 0.0
+
+
+def chunk_id(source: str, text: str) -> str:
+    """청크 내용 기반 고정 ID"""
+    return hashlib.sha256(f"{source}\0{text}".encode("utf-8")).hexdigest()
+
+
+def parse_pdf(pool: ProcessPoolExecutor, file_path: str, source: str,
+              pages_per_task: int, stats: IngestStats) -> Dict[str, Document]:
+    """PDF를 페이지 범위 단위로 병렬 파싱 → 완료된 순서대로 청크 분할 (ID → Document)"""
+    splitter = get_text_splitter()
+    page_count = count_pdf_pages(file_path)
+    tasks = [
+        pool.submit(extract_pdf_pages, (file_path, start, min(start + pages_per_task, page_count)))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+    chunks: Dict[str, Document] = {}
+    for future in as_completed(tasks):
+        for page_no, text in future.result():
+            if not text.strip():
+                continue
+            page_doc = Document(page_content=text, metadata={"source": source, "page": page_no})
+            for chunk in splitter.split_documents([page_doc]):
+                chunks.setdefault(chunk_id(source, chunk.page_content), chunk)
+
+    stats.pages += page_count
+    return chunks
+
+
+def embed_and_upsert(collection, embedding, ids: List[str], docs: List[Document],
+                     batch_size: int, concurrency: int, stats: IngestStats):
+    """batch_size 단위로 임베딩(최대 concurrency 개 동시 요청) 후 Chroma에 upsert"""
+    batches = [(ids[i:i + batch_size], docs[i:i + batch_size]) for i in range(0, len(ids), batch_size)]
+
+    def run(batch):
+        batch_ids, batch_docs = batch
+        vectors = embedding.embed_documents([doc.page_content for doc in batch_docs])
+        return batch_ids, batch_docs, vectors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch_ids, batch_docs, vectors in executor.map(run, batches):
+            collection.upsert(
+                ids=batch_ids,
+                embeddings=vectors,
+                documents=[doc.page_content for doc in batch_docs],
+                metadatas=[doc.metadata for doc in batch_docs]
+            )
+            stats.embedding_batches += 1
+
+
+def ingest(path: str, workers: int, pages_per_task: int, batch_size: int, concurrency: int) -> IngestStats:
+    stats = IngestStats()
+    os.makedirs(CHROMA_PATH, exist_ok=True)
+    collection = get_vector_db()._collection
+    embedding = get_embedding()
+    lexical_index = BM25Index.load(LEXICAL_INDEX_PATH)
+
+    pdf_files = find_pdf_files(path)
+    logger.info(f"[INGEST] 대상 PDF {len(pdf_files)}개 ({path})")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file_path in pdf_files:
+            source = file_path.as_posix()
+            stats.files += 1
+
+            # 1. 파싱 + 청크 분할
+            start = time.perf_counter()
+            chunks = parse_pdf(pool, str(file_path), source, pages_per_task, stats)
+            stats.parse_seconds += time.perf_counter() - start
+            stats.chunks += len(chunks)
+
+            # 2. 기존 청크와 비교 (추가할 것 / 삭제할 것)
+            existing_ids = set(collection.get(where={"source": source}, include=[])["ids"])
+            new_ids = [cid for cid in chunks if cid not in existing_ids]
+            stale_ids = [cid for cid in existing_ids if cid not in chunks]
+
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+                stats.deleted_chunks += len(stale_ids)
+            for cid in stale_ids:
+                lexical_index.remove(cid)
+            for cid, chunk in chunks.items():  # 기존 청크도 색인에 없으면 추가 (색인 도입 전 적재분)
+                lexical_index.add(cid, chunk.page_content, chunk.metadata)
+
+            # 3. 새 청크만 임베딩 + 저장
+            if new_ids:
+                start = time.perf_counter()
+                embed_and_upsert(collection, embedding, new_ids, [chunks[cid] for cid in new_ids],
+                                 batch_size, concurrency, stats)
+                stats.embed_seconds += time.perf_counter() - start
+                stats.new_chunks += len(new_ids)
+
+            logger.info(f"[INGEST] {source}: 청크 {len(chunks)}개 (신규 {len(new_ids)}, 삭제 {len(stale_ids)})")
+
+    # 4. BM25 색인 저장 (실행 중인 서버는 파일 변경을 감지해 다시 로드)
+    lexical_index.save(LEXICAL_INDEX_PATH)
+    logger.info(f"[INGEST] BM25 색인 저장: {LEXICAL_INDEX_PATH} (문서 {len(lexical_index)}개)")
+
+    return stats
+
+
+def print_summary(stats: IngestStats, elapsed: float):
+    pages_per_sec = stats.pages / stats.parse_seconds if stats.parse_seconds else 0.0
+    chunks_per_sec = stats.new_chunks / stats.embed_seconds if stats.embed_seconds else 0.0
+    print("📊 적재 결과")
+    print(f" - 파일: {stats.files}개 / 페이지: {stats.pages}개 ({pages_per_sec:.1f} pages/sec)")
+    print(f" - 청크: 전체 {stats.chunks}개 / 신규 임베딩 {stats.new_chunks}개 ({chunks_per_sec:.1f} chunks/sec) / 삭제 {stats.deleted_chunks}개")
+    print(f" - 임베딩 배치: {stats.embedding_batches}회")
+    print(f"⏱️ 총 소요 시간: {elapsed:.2f}초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 문서를 벡터 DB(Chroma)에 적재합니다.")
+    parser.add_argument("--path", default="data/reports", help="PDF 폴더 경로")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="PDF 파싱 프로세스 수")
+    parser.add_argument("--pages-per-task", type=int, default=8, help="프로세스 작업 1개당 페이지 수")
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩 요청 1회당 청크 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 임베딩 요청 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = ingest(args.path, args.workers, args.pages_per_task, args.batch_size, args.concurrency)
+    print_summary(stats, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
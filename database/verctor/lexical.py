@@ -0,0 +1,140 @@
+# database/verctor/lexical.py
+import gzip
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# 한글 음절 포함 여부
+_HANGUL = re.compile(r"[가-힣]")
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 친화 토크나이저
+    - 한글이 포함된 어절: 문자 2-gram (조사/어미가 붙어도 어간이 매칭되도록) + 1글자 어절은 그대로
+    - 영문/숫자: 단어 단위 (티커, 연도 등)
+    """
+    tokens: List[str] = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", text).lower()):
+        if _HANGUL.search(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """
+    프로세스 내 BM25 역색인 (Chroma 컬렉션과 같은 청크 ID 사용)
+    - 적재 시 청크를 추가/삭제하고 디스크(gzip JSON)에 저장
+    - 검색 시 임베딩 호출 없이 키워드 기반 점수 계산
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs: Dict[str, dict] = {}  # id -> {"text", "metadata", "tf", "length"}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)  # term -> {id: tf}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, doc_id: str):
+        return doc_id in self.docs
+
+    def add(self, doc_id: str, text: str, metadata: Optional[dict] = None):
+        if doc_id in self.docs:
+            return
+        tf = Counter(tokenize(text))
+        length = sum(tf.values())
+        self.docs[doc_id] = {"text": text, "metadata": metadata or {}, "tf": dict(tf), "length": length}
+        for term, count in tf.items():
+            self.postings[term][doc_id] = count
+        self.total_length += length
+
+    def remove(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for term in doc["tf"]:
+            self.postings[term].pop(doc_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+        self.total_length -= doc["length"]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """(청크 ID, BM25 점수) 상위 k개"""
+        if not self.docs:
+            return []
+        n_docs = len(self.docs)
+        avg_length = self.total_length / n_docs
+        scores: Dict[str, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self.docs[doc_id]["length"]
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def get_document(self, doc_id: str) -> Document:
+        doc = self.docs[doc_id]
+        return Document(id=doc_id, page_content=doc["text"], metadata=doc["metadata"])
+
+    # --- [저장 / 로드] ---
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(
+                {"k1": self.k1, "b": self.b,
+                 "docs": {doc_id: {"text": d["text"], "metadata": d["metadata"]} for doc_id, d in self.docs.items()}},
+                f, ensure_ascii=False
+            )
+        os.replace(tmp_path, path)  # 검색 중인 프로세스가 깨진 파일을 읽지 않도록 교체
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        index.k1, index.b = data.get("k1", index.k1), data.get("b", index.b)
+        for doc_id, doc in data["docs"].items():
+            index.add(doc_id, doc["text"], doc["metadata"])
+        return index
+
+
+class LexicalIndexStore:
+    """디스크의 BM25 색인을 읽어 두고, 파일이 갱신(재적재)되면 다시 로드"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[BM25Index] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> BM25Index:
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        if self._index is None or mtime != self._mtime:
+            with self._lock:
+                if self._index is None or mtime != self._mtime:
+                    self._index = BM25Index.load(self.path)
+                    self._mtime = mtime
+        return self._index
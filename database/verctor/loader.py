@@ -1,24 +1,54 @@
+from pathlib import Path
+from typing import List, Tuple
+from pypdf import PdfReader
+from langchain_core.documents import Document
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
 
-def load_pdf_file(file_path="../data/reports/nke-10k-2023_korean.pdf"):
-    file_path = "../data/reports/nke-10k-2023_korean.pdf"
+# 청크 분할 기본 설정
+CHUNK_SIZE = 1000       # 각 청크(chunk)의 최대 문자 수
+CHUNK_OVERLAP = 200     # 청크 간 중첩(overlap) 문자 수
+
+
+def load_pdf_file(file_path: str) -> List[Document]:
+    """PDF 파일 전체를 페이지 단위 Document 리스트로 로드"""
     loader = PyPDFLoader(file_path)
 
     docs = loader.load()
     return docs
 
-def split_documents(directory_path="./data"):
-    docs = load_pdf_file
-    
+
+def get_text_splitter() -> RecursiveCharacterTextSplitter:
     # RecursiveCharacterTextSplitter 설정
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,              # 각 청크(chunk)의 최대 문자 수
-        chunk_overlap=200,           # 청크 간 중첩(overlap) 문자 수
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
         add_start_index=True        # 각 청크의 시작 인덱스를 메타데이터로 추가
     )
 
-    all_splits = text_splitter.split_documents(docs)  
+
+def split_documents(docs: List[Document]) -> List[Document]:
+    """Document 리스트를 청크 단위로 분할"""
+    text_splitter = get_text_splitter()
+
+    all_splits = text_splitter.split_documents(docs)
     return all_splits
-    
\ No newline at end of file
+
+
+def find_pdf_files(directory_path: str) -> List[Path]:
+    """폴더(하위 폴더 포함) 안의 PDF 파일 목록"""
+    return sorted(Path(directory_path).rglob("*.pdf"))
+
+
+def count_pdf_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(args: Tuple[str, int, int]) -> List[Tuple[int, str]]:
+    """
+    PDF의 [start, end) 페이지 텍스트 추출 (프로세스 풀 작업 단위)
+    - 반환: [(페이지 번호, 텍스트), ...]
+    """
+    file_path, start, end = args
+    reader = PdfReader(file_path)
+    return [(page_no, reader.pages[page_no].extract_text() or "") for page_no in range(start, end)]
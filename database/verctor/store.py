@@ -1,30 +1,139 @@
 import os
+import threading
+import time
+from typing import Dict, List
 from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from config import retriever_configs, RetrievalMode, ACTIVE_RETRIEVAL_MODE
 from services.embedding import get_embedding
 from common.logger import get_logger
+from database.verctor.lexical import LexicalIndexStore
 
 logger = get_logger(__name__)
 
 CHROMA_PATH = "./chroma_db"
+COLLECTION_NAME = "example_collection"  # 저장/조회 시 동일한 컬렉션 사용
+LEXICAL_INDEX_PATH = os.path.join(CHROMA_PATH, "bm25_index.json.gz")  # 적재 시 함께 생성되는 BM25 색인
+
+
+class VectorStoreService:
+    """
+    프로세스 전역 벡터 DB 서비스
+    - 디스크의 Chroma 컬렉션은 처음 사용할 때 한 번만 열고, 이후 모든 요청이 재사용합니다.
+    - 임베딩 클라이언트도 get_embedding()의 공유 객체(커넥션 풀)를 사용합니다.
+    - Chroma 클라이언트는 동시 조회를 지원하므로 초기화 시에만 lock을 사용합니다.
+    - 검색 방식(ACTIVE_RETRIEVAL_MODE): vector / lexical(BM25) / hybrid(RRF 결합)
+    """
+
+    def __init__(self, persist_directory: str = CHROMA_PATH, collection_name: str = COLLECTION_NAME,
+                 lexical_index_path: str = LEXICAL_INDEX_PATH):
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name
+        self.lexical = LexicalIndexStore(lexical_index_path)
+        self._db = None
+        self._lock = threading.Lock()
+        self.stats = {"vector_searches": 0, "lexical_searches": 0, "lexical_shortcuts": 0}
+
+    def get_db(self) -> Chroma:
+        """Chroma 핸들 반환 (없으면 생성)"""
+        if self._db is not None:
+            return self._db
+
+        with self._lock:
+            if self._db is None:
+                if not os.path.exists(self.persist_directory):
+                    logger.info(f"[VECTOR DB] '{self.persist_directory}' 가 존재하지 않습니다. 먼저 문서를 로드하세요.")
+                    raise FileNotFoundError(f"'{self.persist_directory}' 가 존재하지 않습니다. 먼저 문서를 로드하세요.")
+
+                logger.info(f"[VECTOR DB] Chroma 컬렉션 연결: {self.persist_directory} ({self.collection_name})")
+                self._db = Chroma(
+                    collection_name=self.collection_name,
+                    persist_directory=self.persist_directory,
+                    embedding_function=get_embedding()
+                )
+        return self._db
+
+    def vector_search(self, query: str, k: int) -> List[Document]:
+        """질문과 유사한 문서 k개 검색 (임베딩 호출 발생)"""
+        self.stats["vector_searches"] += 1
+        return self.get_db().similarity_search(query, k=k)
+
+    def lexical_search(self, query: str, k: int) -> List[tuple]:
+        """BM25 키워드 검색 → [(Document, 점수), ...]"""
+        self.stats["lexical_searches"] += 1
+        index = self.lexical.get()
+        return [(index.get_document(doc_id), score) for doc_id, score in index.search(query, k)]
+
+    def search(self, query: str, k: int = None, mode: str = None) -> List[Document]:
+        """설정된 검색 방식으로 문서 k개 검색"""
+        conf = retriever_configs
+        k = k or conf["k"]
+        mode = mode or ACTIVE_RETRIEVAL_MODE
+
+        if mode == RetrievalMode.VECTOR:
+            return self.vector_search(query, k)
+        if mode == RetrievalMode.LEXICAL:
+            return [doc for doc, _ in self.lexical_search(query, k)]
+
+        # [hybrid] 1. BM25 후보 (임베딩 호출 없음)
+        lexical_hits = self.lexical_search(query, conf["candidate_k"])
+
+        # 2. BM25 1위가 확실하면 벡터 검색 생략
+        if conf["lexical_shortcut"] and lexical_hits:
+            top = lexical_hits[0][1]
+            second = lexical_hits[1][1] if len(lexical_hits) > 1 else 0.0
+            if top >= conf["lexical_min_score"] and top >= second * conf["lexical_margin"]:
+                self.stats["lexical_shortcuts"] += 1
+                return [doc for doc, _ in lexical_hits[:k]]
+
+        # 3. 벡터 후보와 RRF(Reciprocal Rank Fusion)로 결합
+        vector_hits = self.vector_search(query, conf["candidate_k"])
+        return self._fuse([[doc for doc, _ in lexical_hits], vector_hits], k, conf["rrf_k"])
+
+    @staticmethod
+    def _fuse(rankings: List[List[Document]], k: int, rrf_k: int) -> List[Document]:
+        scores: Dict[str, float] = {}
+        docs: Dict[str, Document] = {}
+        for ranking in rankings:
+            for rank, doc in enumerate(ranking):
+                key = doc.id or doc.page_content
+                scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+                docs.setdefault(key, doc)
+        return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)[:k]]
+
+    def health_check(self) -> dict:
+        """
+        가벼운 상태 확인 (임베딩 API 호출 없이 컬렉션 문서 수만 조회)
+        """
+        start = time.perf_counter()
+        try:
+            count = self.get_db()._collection.count()
+            return {
+                "status": "ok",
+                "collection": self.collection_name,
+                "documents": count,
+                "lexical_documents": len(self.lexical.get()),
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        except Exception as e:
+            return {"status": "error", "collection": self.collection_name, "error": str(e)}
+
+
+# 프로세스 전역 서비스 인스턴스
+_vector_store_service = VectorStoreService()
+
+def get_vector_store_service() -> VectorStoreService:
+    return _vector_store_service
+
 
 def save_to_vector_db(all_splits):
     logger.info(f"[VECTOR DB] Chroma DB 저장 중: {CHROMA_PATH}")
-    vector_db = Chroma.from_documents(
-        collection_name="example_collection",
-        embedding=get_embedding(),
-        persist_directory=CHROMA_PATH
-    )
+    os.makedirs(CHROMA_PATH, exist_ok=True)
+    vector_db = get_vector_db()
     vector_db.add_documents(documents=all_splits)
-    
+
     return vector_db
 
 def get_vector_db():
-    """저장된 벡터 DB 불러오기"""
-    if not os.path.exists(CHROMA_PATH):
-        logger.info(f"[VECTOR DB] '{CHROMA_PATH}' 가 존재하지 않습니다. 먼저 문서를 로드하세요.")
-        raise FileNotFoundError(f"'{CHROMA_PATH}' 가 존재하지 않습니다. 먼저 문서를 로드하세요.")
-        
-    return Chroma(
-        persist_directory=CHROMA_PATH,
-        embedding_function=get_embedding()
-    )
\ No newline at end of file
+    """저장된 벡터 DB 불러오기 (프로세스 내 공유 핸들)"""
+    return _vector_store_service.get_db()
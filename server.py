@@ -1,25 +1,50 @@
-from fastapi import FastAPI, Request, Depends
-from fastapi.responses import HTMLResponse
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from langchain_core.messages import HumanMessage, AIMessage
+from langgraph.graph import END
 from common.logger import get_logger 
 from config.settings import setting  # settings 객체 가져오기
 from agents import create_my_agent
-import traceback 
-from datetime import datetime  # 이렇게 바꿔주세요!
 
 # DB 관련 임포트
-from sqlalchemy.orm import Session
-from database.rdm import engine, Base, get_db
-from database.rdm import ChatSession, ChatMessage, RunTrace
+from database.rdm import engine, Base, get_writer
+from database.rdm import get_or_create_session, save_message, save_error_trace, save_cache_trace
 from common.callbacks import DBLoggingCallbackHandler
+from database.verctor.store import get_vector_store_service
+from database.timeseries import get_timeseries_store, get_timeseries_stats
+from services.embedding import get_embedding_cache_stats
+from services.cache import get_answer_cache, get_answer_cache_stats, get_tool_cache_stats
+from services.llm import get_llm_cache_stats, get_model_footprint
+from services.llm.http import get_http_client_pool
+from services.llm.limiter import get_limiter_stats, is_overloaded_error
+from services.llm.router import get_router_stats
+from common.streaming import format_sse, extract_chunk_text, summarize_tool_output
 
 # 환경 설정
 setting
 logger = get_logger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 시작: DB Write-Behind writer 기동
+    writer = get_writer()
+    writer.start()
+    # 코스피 시세 저장소: 로컬 이력 증분 갱신 (백그라운드 스레드)
+    kospi_store = get_timeseries_store("KS11")
+    kospi_store.start()
+    yield
+    # 서버 종료: 큐에 남은 기록을 모두 DB에 반영 + LLM API 커넥션 정리
+    await writer.stop()
+    kospi_store.stop()
+    await get_http_client_pool().aclose()
+
+app = FastAPI(lifespan=lifespan)
 Base.metadata.create_all(bind=engine)
 
 # 1. 정적 파일(CSS, JS) 연결
@@ -30,6 +55,8 @@ templates = Jinja2Templates(directory="templates")
 
 # 3. 에이전트 로드
 agent_app = create_my_agent()
+# 캐시 답변 턴을 State 에 기록할 노드 (END 직전 노드로 기록해야 실행 대기 노드가 남지 않음)
+CACHED_TURN_NODE = next(edge.source for edge in agent_app.get_graph().edges if edge.target == END)
 
 # 데이터 모델
 class ChatRequest(BaseModel):
@@ -37,73 +64,106 @@ class ChatRequest(BaseModel):
     user_id: str = "user_123"
     thread_id: str = "thread_1"
     
-# --- [헬퍼 함수] 세션 관리 ---
-def get_or_create_session(db: Session, session_id: str, user_id: str):
-    session = db.query(ChatSession).filter_by(session_id=session_id).first()
-    if not session:
-        session = ChatSession(session_id=session_id, user_id=user_id)
-        db.add(session)
-        db.commit()
-    return session
-
-# --- [헬퍼 함수] 메시지 저장 ---
-def save_message(db: Session, session_id: str, role: str, content: str):
-    msg = ChatMessage(session_id=session_id, role=role, content=content)
-    db.add(msg)
-    db.commit()
-
-# --- [추가] 에러 발생 시 Trace 테이블에 기록하는 함수 ---
-def save_error_trace(db: Session, session_id: str, error: Exception, query: str):
+# --- [헬퍼 함수] 사용자 안내 오류 메시지 ---
+def error_response_message(error: Exception) -> str:
+    """LLM 과부하(대기열 거절/429)는 재시도 안내, 그 외는 일반 오류 안내"""
+    if is_overloaded_error(error):
+        return "현재 요청이 많아 답변이 지연되고 있습니다. 잠시 후 다시 시도해 주세요."
+    return "죄송합니다. 시스템 오류가 발생하여 답변을 완료할 수 없습니다."
+
+# --- [헬퍼 함수] 답변 캐시 ---
+# 캐시 키는 질문 문장뿐이므로 이전 대화가 없는 스레드(대화의 첫 질문)에서만 조회/저장
+async def thread_history(thread_id: str) -> list:
+    """체크포인터에 저장된 이 스레드의 이전 대화 메시지 (없으면 빈 리스트)"""
+    state = await agent_app.aget_state({"configurable": {"thread_id": thread_id}})
+    return state.values.get("messages", [])
+
+async def answer_from_cache(request: ChatRequest, history: list):
     """
-    시스템 에러가 발생했을 때 RunTrace 테이블에 'error' 상태로 기록합니다.
+    캐시된 답변이 있으면 DB 기록(AI 메시지 + answer_cache Trace) 후 답변 반환, 없으면 None
+    (사용자 메시지는 호출 전에 이미 저장된 상태, history 가 있으면 조회하지 않음)
     """
-    try:
-        # 혹시 앞선 작업에서 DB 트랜잭션이 실패한 상태일 수 있으므로 롤백
-        db.rollback() 
-        
-        trace = RunTrace(
-            session_id=session_id,
-            type="system_error",   # 에러 타입 명시
-            name="chat_endpoint_exception",
-            inputs={"user_query": query}, # 어떤 질문에서 에러가 났는지 저장
-            outputs=None,
-            status="error",
-            error_message=str(error), # 에러 메시지 저장
-            # 필요하다면 traceback.format_exc()로 전체 스택을 저장할 수도 있음
-            start_time=datetime.now(),
-            end_time=datetime.now()
-        )
-        db.add(trace)
-        db.commit()
-        logger.info(f"에러 로그가 DB에 저장되었습니다. (Session: {session_id})")
-        
-    except Exception as e:
-        # 에러 로그 저장조차 실패했을 경우 (최악의 상황)
-        logger.error(f"에러 로그 DB 저장 실패: {e}")  
+    answer_cache = get_answer_cache()
+    if answer_cache is None:
+        return None
+
+    hit = await answer_cache.lookup(request.query, history)
+    if hit is None:
+        return None
+
+    # 에이전트를 거치지 않은 턴도 State 에 기록 → 다음 후속 질문이 이 대화를 이어받고, 캐시도 조회하지 않음
+    await agent_app.aupdate_state(
+        {"configurable": {"thread_id": request.thread_id}},
+        {"messages": [HumanMessage(content=request.query), AIMessage(content=hit.entry.answer)]},
+        as_node=CACHED_TURN_NODE
+    )
+    await save_message(request.thread_id, "ai", hit.entry.answer)
+    await save_cache_trace(
+        request.thread_id, request.query, hit.match, hit.entry.query, hit.similarity,
+        hit.entry.tools, hit.saved_seconds, hit.lookup_seconds
+    )
+    logger.info(f"답변 캐시 적중({hit.match}, 유사도 {hit.similarity}): {request.query}")
+    return hit.entry.answer
+
+async def store_answer_cache(request: ChatRequest, db_callback: DBLoggingCallbackHandler,
+                             answer: str, latency: float, history: list):
+    """도구 에러 없이 끝난 첫 질문의 답변만 캐시에 저장 (TTL은 사용한 도구로 결정)"""
+    answer_cache = get_answer_cache()
+    if answer_cache is not None and not db_callback.has_error:
+        await answer_cache.store(request.query, answer, db_callback.tools_used, latency, history)
 
 # --- [라우터 1] 화면 보여주기 (GET) ---
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+# --- [라우터] 상태 확인 (GET) ---
+@app.get("/health")
+async def health_check():
+    retriever = await run_in_threadpool(get_vector_store_service().health_check)
+    return {"status": "ok", "retriever": retriever}
+
+# --- [라우터] 캐시/성능 지표 (GET) ---
+@app.get("/metrics")
+async def metrics():
+    return {
+        "answer_cache": get_answer_cache_stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "models": get_model_footprint(),
+        "llm_limiter": get_limiter_stats(),
+        "llm_router": get_router_stats(),
+        "tool_cache": get_tool_cache_stats(),
+        "timeseries": get_timeseries_stats(),
+        "retriever": get_vector_store_service().stats
+    }
+
 # --- [라우터 2] 채팅 메시지 처리 (POST) ---
 @app.post("/chat")
-async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat_endpoint(request: ChatRequest):
     logger.info(f"사용자 요청 수신: user_id={request.user_id}, query={request.query}")
     
     try:
         # 1. 세션 확인 및 생성
-        get_or_create_session(db, request.thread_id, request.user_id)
+        await get_or_create_session(request.thread_id, request.user_id)
         
         # 2. 사용자 메시지 DB 저장
-        save_message(db, request.thread_id, "user", request.query)
+        await save_message(request.thread_id, "user", request.query)
+
+        # 2-1. 같은(비슷한) 질문의 유효한 답변이 캐시에 있으면 에이전트 실행 생략
+        history = await thread_history(request.thread_id)
+        cached_answer = await answer_from_cache(request, history)
+        if cached_answer is not None:
+            return {"response": cached_answer, "cached": True}
         
-        # 3. 콜백 핸들러 생성 (DB 세션 주입)
+        # 3. 콜백 핸들러 생성
         # 이 핸들러가 Tool 사용 내역을 RunTrace 테이블에 자동 저장합니다.
-        db_callback = DBLoggingCallbackHandler(session_id=request.thread_id, db=db)
+        db_callback = DBLoggingCallbackHandler(session_id=request.thread_id)
         
         # 4. LangChain 에이전트 실행 (callbacks 전달)
-        result = agent_app.invoke(
+        # - ainvoke: LLM/도구 대기 중에도 이벤트 루프가 다른 요청을 처리
+        start = time.perf_counter()
+        result = await agent_app.ainvoke(
             {"messages": [("user", request.query)]},
             {"configurable": {
                 "thread_id": request.thread_id},
@@ -114,10 +174,11 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         
         ai_message = result["messages"][-1].content
         
-        # 5. AI 응답 메시지 DB 저장
-        save_message(db, request.thread_id, "ai", ai_message)
+        # 5. AI 응답 메시지 DB 저장 + 답변 캐시 저장
+        await save_message(request.thread_id, "ai", ai_message)
+        await store_answer_cache(request, db_callback, ai_message, time.perf_counter() - start, history)
         
-        logger.info(f"AI 응답 생성 완료: {result["messages"][-1].content}")
+        logger.info(f"AI 응답 생성 완료: {ai_message}")
         logger.debug(f"AI 응답 생성 완료: {str(result)}")
         return {"response": ai_message}
     except Exception as e:
@@ -125,9 +186,85 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         logger.error(f"채팅 처리 중 치명적 오류 발생: {str(e)}", exc_info=True)
         
         # 2. DB에 에러 상황 기록 (RunTrace 테이블)
-        save_error_trace(db, request.thread_id, e, request.query)
+        await save_error_trace(request.thread_id, e, request.query)
         
         # 3. (선택 사항) 채팅창에도 '에러가 났다'는 메시지를 남기고 싶다면?
-        save_message(db, request.thread_id, "system", f"오류 발생: {str(e)}")
+        await save_message(request.thread_id, "system", f"오류 발생: {str(e)}")
         
-        return {"response": "죄송합니다. 시스템 오류가 발생하여 답변을 완료할 수 없습니다."}
\ No newline at end of file
+        return {"response": error_response_message(e)}
+
+# --- [라우터 3] 채팅 메시지 스트리밍 처리 (POST, Server-Sent Events) ---
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    에이전트 실행 과정을 SSE로 실시간 전송합니다.
+    - token: LLM 토큰 / tool_start, tool_end: 도구 실행 상태 / final: 최종 답변 / error: 오류
+    """
+    logger.info(f"사용자 스트리밍 요청 수신: user_id={request.user_id}, query={request.query}")
+
+    async def event_generator():
+        try:
+            # 1. 세션 확인 및 사용자 메시지 저장
+            await get_or_create_session(request.thread_id, request.user_id)
+            await save_message(request.thread_id, "user", request.query)
+
+            # 1-1. 캐시 적중 시 에이전트 실행 없이 최종 답변만 전송
+            history = await thread_history(request.thread_id)
+            cached_answer = await answer_from_cache(request, history)
+            if cached_answer is not None:
+                yield format_sse("final", {"response": cached_answer, "cached": True})
+                return
+
+            # 2. 콜백 핸들러 + 실행 설정
+            db_callback = DBLoggingCallbackHandler(session_id=request.thread_id)
+            config = {
+                "configurable": {"thread_id": request.thread_id},
+                "callbacks": [db_callback],
+                "recursion_limit": 100
+            }
+
+            # 3. 에이전트 이벤트 스트리밍
+            start = time.perf_counter()
+            async for event in agent_app.astream_events(
+                {"messages": [("user", request.query)]}, config, version="v2"
+            ):
+                kind = event["event"]
+
+                # (1) LLM 토큰 - 요약 미들웨어 등 내부 LLM 호출은 제외하고 'model' 노드만 전송
+                if kind == "on_chat_model_stream" and event["metadata"].get("langgraph_node") == "model":
+                    token = extract_chunk_text(event["data"]["chunk"])
+                    if token:
+                        yield format_sse("token", {"content": token})
+
+                # (2) 도구 실행 시작/종료
+                elif kind == "on_tool_start":
+                    yield format_sse("tool_start", {
+                        "name": event["name"],
+                        "input": event["data"].get("input")
+                    })
+                elif kind == "on_tool_end":
+                    yield format_sse("tool_end", {
+                        "name": event["name"],
+                        "output": summarize_tool_output(event["data"].get("output"))
+                    })
+
+            # 4. 스트림 완료 후 최종 상태에서 답변 추출 → DB 저장
+            state = await agent_app.aget_state(config)
+            ai_message = state.values["messages"][-1].content
+            await save_message(request.thread_id, "ai", ai_message)
+            await store_answer_cache(request, db_callback, ai_message, time.perf_counter() - start, history)
+
+            logger.info(f"AI 스트리밍 응답 완료: {ai_message}")
+            yield format_sse("final", {"response": ai_message})
+
+        except Exception as e:
+            logger.error(f"스트리밍 처리 중 치명적 오류 발생: {str(e)}", exc_info=True)
+            await save_error_trace(request.thread_id, e, request.query)
+            await save_message(request.thread_id, "system", f"오류 발생: {str(e)}")
+            yield format_sse("error", {"response": error_response_message(e)})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # 프록시 버퍼링 방지
+    )
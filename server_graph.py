@@ -1,22 +1,32 @@
-import traceback
+import time
 import uvicorn # [추가] 서버 실행을 위해 필요
-from datetime import datetime
 
-from fastapi import FastAPI, Request, Depends
-from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 # [LangChain & LangGraph 관련 임포트]
+from langchain_core.agents import AgentFinish
 from langchain_core.messages import HumanMessage
 from agents import create_my_graph_agent # LangGraph 에이전트 로드
 
 # [DB 관련 임포트]
-from sqlalchemy.orm import Session
-from database.rdm import engine, Base, get_db
-from database.rdm import ChatSession, ChatMessage, RunTrace
+from database.rdm import engine, Base, get_writer
+from database.rdm import get_or_create_session, save_message, save_error_trace, save_cache_trace
 from common.callbacks import DBLoggingCallbackHandler
+from database.verctor.store import get_vector_store_service
+from database.timeseries import get_timeseries_store, get_timeseries_stats
+from services.embedding import get_embedding_cache_stats
+from services.cache import get_answer_cache, get_answer_cache_stats, get_tool_cache_stats
+from services.llm import get_llm_cache_stats, get_model_footprint
+from services.llm.http import get_http_client_pool
+from services.llm.limiter import get_limiter_stats, is_overloaded_error
+from services.llm.router import get_router_stats
+from common.streaming import format_sse, extract_chunk_text, summarize_tool_output, FinalAnswerStreamFilter
 
 # [로깅 & 설정]
 from common.logger import get_logger
@@ -26,7 +36,21 @@ from common.logger import get_logger
 logger = get_logger(__name__)
 
 # 앱 초기화
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 시작: DB Write-Behind writer 기동
+    writer = get_writer()
+    writer.start()
+    # 코스피 시세 저장소: 로컬 이력 증분 갱신 (백그라운드 스레드)
+    kospi_store = get_timeseries_store("KS11")
+    kospi_store.start()
+    yield
+    # 서버 종료: 큐에 남은 기록을 모두 DB에 반영 + LLM API 커넥션 정리
+    await writer.stop()
+    kospi_store.stop()
+    await get_http_client_pool().aclose()
+
+app = FastAPI(lifespan=lifespan)
 Base.metadata.create_all(bind=engine)
 
 # 1. 정적 파일 및 템플릿 설정
@@ -49,38 +73,68 @@ class ChatRequest(BaseModel):
 
 # --- [헬퍼 함수] ---
 
-def get_or_create_session(db: Session, session_id: str, user_id: str):
-    session = db.query(ChatSession).filter_by(session_id=session_id).first()
-    if not session:
-        session = ChatSession(session_id=session_id, user_id=user_id)
-        db.add(session)
-        db.commit()
-    return session
+def extract_answer(result: dict) -> str:
+    """그래프 실행 결과(State)에서 최종 답변 텍스트 추출"""
+    try:
+        if result.get("agent_outcome") is not None:
+            return result["agent_outcome"].return_values["output"]
+        elif result.get("messages"):
+            return result["messages"][-1].content
+        else:
+            return "답변을 찾을 수 없습니다."
+    except Exception as parse_error:
+        logger.warning(f"결과 파싱 중 예외 발생: {parse_error}")
+        return str(result)
 
-def save_message(db: Session, session_id: str, role: str, content: str):
-    msg = ChatMessage(session_id=session_id, role=role, content=content)
-    db.add(msg)
-    db.commit()
+# --- [헬퍼 함수] 사용자 안내 오류 메시지 ---
+def error_response_message(error: Exception) -> str:
+    """LLM 과부하(대기열 거절/429)는 재시도 안내, 그 외는 일반 오류 안내"""
+    if is_overloaded_error(error):
+        return "현재 요청이 많아 답변이 지연되고 있습니다. 잠시 후 다시 시도해 주세요."
+    return "죄송합니다. 시스템 오류가 발생하여 답변을 완료할 수 없습니다."
 
-def save_error_trace(db: Session, session_id: str, error: Exception, query: str):
-    try:
-        db.rollback() 
-        trace = RunTrace(
-            session_id=session_id,
-            type="system_error",
-            name="chat_endpoint_exception",
-            inputs={"user_query": query},
-            outputs=None,
-            status="error",
-            error_message=str(error),
-            start_time=datetime.now(),
-            end_time=datetime.now()
-        )
-        db.add(trace)
-        db.commit()
-        logger.info(f"⚠️ 에러 로그 DB 저장 완료 (Session: {session_id})")
-    except Exception as e:
-        logger.error(f"❌ 에러 로그 DB 저장 실패: {e}")
+# --- [헬퍼 함수] 답변 캐시 ---
+# 캐시 키는 질문 문장뿐이므로 이전 대화가 없는 스레드(대화의 첫 질문)에서만 조회/저장
+async def thread_history(thread_id: str) -> list:
+    """체크포인터에 저장된 이 스레드의 이전 대화 메시지 (없으면 빈 리스트)"""
+    state = await agent_app.aget_state({"configurable": {"thread_id": thread_id}})
+    return state.values.get("messages", [])
+
+async def answer_from_cache(request: ChatRequest, history: list):
+    """
+    캐시된 답변이 있으면 DB 기록(AI 메시지 + answer_cache Trace) 후 답변 반환, 없으면 None
+    (사용자 메시지는 호출 전에 이미 저장된 상태, history 가 있으면 조회하지 않음)
+    """
+    answer_cache = get_answer_cache()
+    if answer_cache is None:
+        return None
+
+    hit = await answer_cache.lookup(request.query, history)
+    if hit is None:
+        return None
+
+    # 에이전트를 거치지 않은 턴도 State 에 기록 → 다음 후속 질문이 이 대화를 이어받고, 캐시도 조회하지 않음
+    # ('agent' 노드 + AgentFinish 로 기록 → 조건 분기가 END 로 끝나 실행 대기 노드가 남지 않음)
+    await agent_app.aupdate_state(
+        {"configurable": {"thread_id": request.thread_id}},
+        {"messages": [HumanMessage(content=request.query)],
+         "agent_outcome": AgentFinish({"output": hit.entry.answer}, log="")},
+        as_node="agent"
+    )
+    await save_message(request.thread_id, "ai", hit.entry.answer)
+    await save_cache_trace(
+        request.thread_id, request.query, hit.match, hit.entry.query, hit.similarity,
+        hit.entry.tools, hit.saved_seconds, hit.lookup_seconds
+    )
+    logger.info(f"답변 캐시 적중({hit.match}, 유사도 {hit.similarity}): {request.query}")
+    return hit.entry.answer
+
+async def store_answer_cache(request: ChatRequest, db_callback: DBLoggingCallbackHandler,
+                             answer: str, latency: float, history: list):
+    """도구 에러 없이 끝난 첫 질문의 답변만 캐시에 저장 (TTL은 사용한 도구로 결정)"""
+    answer_cache = get_answer_cache()
+    if answer_cache is not None and not db_callback.has_error:
+        await answer_cache.store(request.query, answer, db_callback.tools_used, latency, history)
 
 # --- [라우터] ---
 
@@ -88,19 +142,46 @@ def save_error_trace(db: Session, session_id: str, error: Exception, query: str)
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+# --- [라우터] 상태 확인 (GET) ---
+@app.get("/health")
+async def health_check():
+    retriever = await run_in_threadpool(get_vector_store_service().health_check)
+    return {"status": "ok", "retriever": retriever}
+
+# --- [라우터] 캐시/성능 지표 (GET) ---
+@app.get("/metrics")
+async def metrics():
+    return {
+        "answer_cache": get_answer_cache_stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "models": get_model_footprint(),
+        "llm_limiter": get_limiter_stats(),
+        "llm_router": get_router_stats(),
+        "tool_cache": get_tool_cache_stats(),
+        "timeseries": get_timeseries_stats(),
+        "retriever": get_vector_store_service().stats
+    }
+
 @app.post("/chat")
-async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat_endpoint(request: ChatRequest):
     logger.info(f"📩 요청 수신: thread_id={request.thread_id}, query={request.query}")
     
     try:
         # 1. 세션 확인
-        get_or_create_session(db, request.thread_id, request.user_id)
+        await get_or_create_session(request.thread_id, request.user_id)
         
         # 2. 사용자 질문 DB 저장
-        save_message(db, request.thread_id, "user", request.query)
+        await save_message(request.thread_id, "user", request.query)
+
+        # 2-1. 같은(비슷한) 질문의 유효한 답변이 캐시에 있으면 그래프 실행 생략
+        history = await thread_history(request.thread_id)
+        cached_answer = await answer_from_cache(request, history)
+        if cached_answer is not None:
+            return {"response": cached_answer, "cached": True}
         
         # 3. 콜백 핸들러
-        db_callback = DBLoggingCallbackHandler(session_id=request.thread_id, db=db)
+        db_callback = DBLoggingCallbackHandler(session_id=request.thread_id)
         
         # 4. LangGraph 에이전트 실행
         # [중요] StateGraph 구조에 맞춰 'messages' 리스트 전달
@@ -115,33 +196,106 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
             "recursion_limit": 50 
         }
         
-        result = agent_app.invoke(inputs, config)
+        # - ainvoke: LLM/도구 대기 중에도 이벤트 루프가 다른 요청을 처리
+        start = time.perf_counter()
+        result = await agent_app.ainvoke(inputs, config)
         
         # 5. 결과 추출
-        ai_message = ""
-        try:
-            if "agent_outcome" in result:
-                ai_message = result["agent_outcome"].return_values["output"]
-            elif "messages" in result:
-                ai_message = result["messages"][-1].content
-            else:
-                ai_message = "답변을 찾을 수 없습니다."
-        except Exception as parse_error:
-            logger.warning(f"결과 파싱 중 예외 발생: {parse_error}")
-            ai_message = str(result)
-
-        # 6. AI 답변 DB 저장
-        save_message(db, request.thread_id, "ai", ai_message)
+        ai_message = extract_answer(result)
+
+        # 6. AI 답변 DB 저장 + 답변 캐시 저장
+        await save_message(request.thread_id, "ai", ai_message)
+        await store_answer_cache(request, db_callback, ai_message, time.perf_counter() - start, history)
         
         logger.info(f"🚀 답변 완료: {ai_message[:50]}...")
         return {"response": ai_message}
 
     except Exception as e:
         logger.error(f"🔥 치명적 오류 발생: {str(e)}", exc_info=True)
-        save_error_trace(db, request.thread_id, e, request.query)
+        await save_error_trace(request.thread_id, e, request.query)
         
-        save_message(db, request.thread_id, "system", f"System Error: {str(e)}")
-        return {"response": "죄송합니다. 시스템 오류가 발생하여 답변을 완료할 수 없습니다."}
+        await save_message(request.thread_id, "system", f"System Error: {str(e)}")
+        return {"response": error_response_message(e)}
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    LangGraph 실행 과정을 SSE로 실시간 전송합니다.
+    - token: 'Final Answer:' 이후의 LLM 토큰 / tool_start, tool_end: 도구 실행 상태
+    - final: 최종 답변 / error: 오류
+    """
+    logger.info(f"📩 스트리밍 요청 수신: thread_id={request.thread_id}, query={request.query}")
+
+    async def event_generator():
+        try:
+            # 1. 세션 확인 및 사용자 질문 저장
+            await get_or_create_session(request.thread_id, request.user_id)
+            await save_message(request.thread_id, "user", request.query)
+
+            # 1-1. 캐시 적중 시 그래프 실행 없이 최종 답변만 전송
+            history = await thread_history(request.thread_id)
+            cached_answer = await answer_from_cache(request, history)
+            if cached_answer is not None:
+                yield format_sse("final", {"response": cached_answer, "cached": True})
+                return
+
+            # 2. 콜백 핸들러 + 실행 설정
+            db_callback = DBLoggingCallbackHandler(session_id=request.thread_id)
+            inputs = {
+                "messages": [HumanMessage(content=request.query)],
+                "intermediate_steps": []
+            }
+            config = {
+                "configurable": {"thread_id": request.thread_id},
+                "callbacks": [db_callback],
+                "recursion_limit": 50
+            }
+
+            # 3. 그래프 이벤트 스트리밍
+            # ReAct 출력(Thought/Action)은 숨기고 최종 답변 부분만 토큰 단위로 전송
+            answer_filter = FinalAnswerStreamFilter()
+            start = time.perf_counter()
+            async for event in agent_app.astream_events(inputs, config, version="v2"):
+                kind = event["event"]
+
+                if kind == "on_chat_model_stream" and event["metadata"].get("langgraph_node") == "agent":
+                    token = answer_filter.feed(event["run_id"], extract_chunk_text(event["data"]["chunk"]))
+                    if token:
+                        yield format_sse("token", {"content": token})
+                elif kind == "on_chat_model_end":
+                    answer_filter.close(event["run_id"])
+
+                elif kind == "on_tool_start":
+                    yield format_sse("tool_start", {
+                        "name": event["name"],
+                        "input": event["data"].get("input")
+                    })
+                elif kind == "on_tool_end":
+                    yield format_sse("tool_end", {
+                        "name": event["name"],
+                        "output": summarize_tool_output(event["data"].get("output"))
+                    })
+
+            # 4. 스트림 완료 후 최종 State에서 답변 추출 → DB 저장
+            state = await agent_app.aget_state(config)
+            ai_message = extract_answer(state.values)
+            await save_message(request.thread_id, "ai", ai_message)
+            await store_answer_cache(request, db_callback, ai_message, time.perf_counter() - start, history)
+
+            logger.info(f"🚀 스트리밍 답변 완료: {ai_message[:50]}...")
+            yield format_sse("final", {"response": ai_message})
+
+        except Exception as e:
+            logger.error(f"🔥 스트리밍 중 치명적 오류 발생: {str(e)}", exc_info=True)
+            await save_error_trace(request.thread_id, e, request.query)
+            await save_message(request.thread_id, "system", f"System Error: {str(e)}")
+            yield format_sse("error", {"response": error_response_message(e)})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # 프록시 버퍼링 방지
+    )
 
 # ---------------------------------------------------------
 # [핵심 추가] 이 부분이 없어서 서버가 안 켜졌던 것입니다!
@@ -0,0 +1,50 @@
+import threading
+from typing import Optional
+from config import answer_cache_configs, tool_cache_configs
+from .answer_cache import SemanticAnswerCache, AnswerCacheHit, normalize_query
+from .tool_cache import ToolResultCache, CachedTool, TOOL_CACHE_EVENT
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_tool_cache: Optional[ToolResultCache] = None
+_lock = threading.Lock()
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """프로세스 전역 답변 캐시 (설정에서 꺼져 있으면 None)"""
+    global _answer_cache
+    conf = answer_cache_configs
+    if not conf.get("enabled"):
+        return None
+
+    if _answer_cache is None:
+        with _lock:
+            if _answer_cache is None:
+                from services.embedding import get_embedding
+
+                _answer_cache = SemanticAnswerCache(
+                    get_embedding(),
+                    similarity_threshold=conf["similarity_threshold"],
+                    max_entries=conf["max_entries"],
+                    min_query_chars=conf["min_query_chars"],
+                    default_ttl=conf["default_ttl"],
+                    unknown_tool_ttl=conf["unknown_tool_ttl"],
+                    tool_ttls=conf["tool_ttls"]
+                )
+    return _answer_cache
+
+def get_answer_cache_stats() -> dict:
+    return _answer_cache.stats() if _answer_cache is not None else {}
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """프로세스 전역 도구 결과 캐시 (설정에서 꺼져 있으면 None)"""
+    global _tool_cache
+    if not tool_cache_configs.get("enabled"):
+        return None
+
+    if _tool_cache is None:
+        with _lock:
+            if _tool_cache is None:
+                _tool_cache = ToolResultCache(max_entries=tool_cache_configs["max_entries"])
+    return _tool_cache
+
+def get_tool_cache_stats() -> dict:
+    return _tool_cache.stats() if _tool_cache is not None else {}
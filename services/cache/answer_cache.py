@@ -0,0 +1,199 @@
+# services/cache/answer_cache.py
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.~…]+$")
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질문 정규화 (전각/반각 통일, 소문자, 공백 정리, 끝의 물음표/마침표 제거)"""
+    text = unicodedata.normalize("NFKC", query).lower().strip()
+    text = _SPACES.sub(" ", text)
+    return _TRAILING.sub("", text)
+
+
+@dataclass
+class CachedAnswer:
+    query: str                      # 정규화된 질문
+    answer: str
+    tools: List[str]
+    expires_at: float
+    latency: float                  # 원래 에이전트 실행에 걸린 시간(초)
+    vector: Optional[np.ndarray] = field(default=None, repr=False)
+
+
+@dataclass
+class AnswerCacheHit:
+    entry: CachedAnswer
+    match: str                      # "exact" 또는 "semantic"
+    similarity: float
+    lookup_seconds: float
+
+    @property
+    def saved_seconds(self) -> float:
+        return max(self.entry.latency - self.lookup_seconds, 0.0)
+
+
+class SemanticAnswerCache:
+    """
+    질문 → 최종 답변 캐시 (프로세스 메모리)
+    1. 정규화된 질문이 완전히 같으면 임베딩 호출 없이 바로 반환
+    2. 아니면 질문 임베딩과 저장된 질문들의 코사인 유사도가 threshold 이상인 답변 반환
+    - 답변마다 사용된 도구에 따라 유효 시간(TTL)이 다름 (시세는 짧게, 문서 검색은 길게)
+    - 키는 질문 문장뿐이므로 대화의 첫 질문만 캐시 (이전 대화가 있으면 같은 문장이라도 맥락에 따라 답이 달라짐)
+      → lookup/store 에 이 질문 이전의 대화(history)를 넘기면, 비어 있지 않을 때 조회/저장하지 않음
+    - 캐시 적중 시 에이전트를 거치지 않으므로 해당 턴의 State 기록은 호출 측에서 처리 (server 의 answer_from_cache)
+    """
+
+    def __init__(self, embedding: Embeddings, similarity_threshold: float = 0.95, max_entries: int = 5000,
+                 min_query_chars: int = 6, default_ttl: float = 3600, unknown_tool_ttl: float = 300,
+                 tool_ttls: Optional[Dict[str, float]] = None):
+        self.embedding = embedding
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.min_query_chars = min_query_chars
+        self.default_ttl = default_ttl
+        self.unknown_tool_ttl = unknown_tool_ttl
+        self.tool_ttls = tool_ttls or {}
+
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None   # 유사도 계산용 (질문 수 x 차원), 변경 시 다시 생성
+        self._matrix_keys: List[str] = []
+        self._lock = threading.Lock()
+
+        self.stats_counter = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stored": 0,
+                              "expired": 0, "skipped": 0, "errors": 0, "saved_seconds": 0.0}
+
+    # --- [TTL] ---
+    def ttl_for(self, tools: Iterable[str]) -> float:
+        """답변에 사용된 도구 중 가장 짧은 유효 시간"""
+        ttls = [self.tool_ttls.get(name, self.unknown_tool_ttl) for name in tools]
+        return min(ttls) if ttls else self.default_ttl
+
+    def is_cacheable(self, query: str) -> bool:
+        return len(normalize_query(query)) >= self.min_query_chars
+
+    # --- [내부 저장소] ---
+    def _purge_expired(self, now: float):
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+            self.stats_counter["expired"] += len(expired)
+
+    def _similar(self, vector: np.ndarray) -> Optional[tuple]:
+        if self._matrix is None:
+            keys = [key for key, entry in self._entries.items() if entry.vector is not None]
+            self._matrix_keys = keys
+            self._matrix = np.stack([self._entries[key].vector for key in keys]) if keys else None
+        if self._matrix is None:
+            return None
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        return self._matrix_keys[best], float(scores[best])
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    # --- [조회 / 저장] ---
+    async def lookup(self, query: str, history: Sequence = ()) -> Optional[AnswerCacheHit]:
+        """유효한 캐시 답변 조회 (실패해도 예외를 올리지 않고 None → 에이전트 정상 실행)"""
+        start = time.perf_counter()
+        key = normalize_query(query)
+        if len(key) < self.min_query_chars or history:
+            self.stats_counter["skipped"] += 1
+            return None
+
+        try:
+            # 1. 정확히 같은 질문
+            with self._lock:
+                self._purge_expired(time.time())
+                entry = self._entries.get(key)
+            if entry is not None:
+                return self._hit(entry, "exact", 1.0, start)
+
+            # 2. 의미가 같은 질문 (임베딩 유사도)
+            with self._lock:
+                has_vectors = any(e.vector is not None for e in self._entries.values())
+            if not has_vectors:
+                self.stats_counter["misses"] += 1
+                return None
+
+            vector = self._unit(await self.embedding.aembed_query(key))
+            with self._lock:
+                found = self._similar(vector)
+                entry = self._entries.get(found[0]) if found else None
+            if entry is not None and found[1] >= self.similarity_threshold:
+                return self._hit(entry, "semantic", found[1], start)
+        except Exception as e:
+            self.stats_counter["errors"] += 1
+            logger.warning(f"[ANSWER CACHE] 조회 실패 (캐시 없이 진행): {e}")
+            return None
+
+        self.stats_counter["misses"] += 1
+        return None
+
+    def _hit(self, entry: CachedAnswer, match: str, similarity: float, start: float) -> AnswerCacheHit:
+        hit = AnswerCacheHit(entry=entry, match=match, similarity=round(similarity, 4),
+                             lookup_seconds=time.perf_counter() - start)
+        self.stats_counter[f"{match}_hits"] += 1
+        self.stats_counter["saved_seconds"] += hit.saved_seconds
+        with self._lock:
+            if entry.query in self._entries:
+                self._entries.move_to_end(entry.query)
+        return hit
+
+    async def store(self, query: str, answer: str, tools: Iterable[str], latency: float, history: Sequence = ()):
+        """에이전트가 만든 최종 답변 저장 (history: 질문 전의 대화 - 있으면 저장하지 않음)"""
+        key = normalize_query(query)
+        if len(key) < self.min_query_chars or not answer or history:
+            return
+        tools = list(dict.fromkeys(tools))
+        try:
+            vector = self._unit(await self.embedding.aembed_query(key))
+        except Exception as e:
+            self.stats_counter["errors"] += 1
+            logger.warning(f"[ANSWER CACHE] 질문 임베딩 실패 (정확 일치로만 조회): {e}")
+            vector = None
+
+        entry = CachedAnswer(query=key, answer=answer, tools=tools,
+                             expires_at=time.time() + self.ttl_for(tools), latency=latency, vector=vector)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+            self.stats_counter["stored"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    # --- [통계] ---
+    def stats(self) -> dict:
+        hits = self.stats_counter["exact_hits"] + self.stats_counter["semantic_hits"]
+        lookups = hits + self.stats_counter["misses"]
+        return {
+            **self.stats_counter,
+            "saved_seconds": round(self.stats_counter["saved_seconds"], 2),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,271 @@
+# services/cache/tool_cache.py
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from inspect import signature
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import (AsyncCallbackManagerForToolRun, CallbackManagerForToolRun,
+                                      adispatch_custom_event, dispatch_custom_event)
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from pydantic import ConfigDict
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# DBLoggingCallbackHandler 가 도구 trace 에 캐시 사용 여부를 남기는 이벤트 이름
+TOOL_CACHE_EVENT = "tool_cache"
+# 이벤트 상태 → 통계 항목 (hit: 캐시 / stale: 이전 값 + 백그라운드 갱신 / miss: 실행 / shared: 동시 실행 결과 공유)
+_STATUS_COUNTERS = {"hit": "hits", "stale": "stale_hits", "miss": "misses", "shared": "shared"}
+
+
+def _normalize(value: Any) -> Any:
+    """인자 정규화 - 공백 차이/None 인자/dict 순서가 달라도 같은 키"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(tool_name: str, args: tuple, kwargs: dict) -> str:
+    return json.dumps([tool_name, _normalize(list(args)), _normalize(kwargs)],
+                      sort_keys=True, ensure_ascii=False, default=str)
+
+
+class ToolResultCache:
+    """
+    도구 실행 결과 캐시 (프로세스 전역, 모든 CachedTool 공용)
+    - TTL: ttl 동안은 그대로 반환(fresh), 이후 stale_ttl 동안은 이전 값을 반환하면서 백그라운드 갱신(stale)
+    - single-flight: 같은 키를 동시에 요청하면 실행은 1번, 나머지는 그 결과를 함께 사용
+    - max_entries 를 넘으면 오래 사용되지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, max_entries: int = 2000, refresh_workers: int = 4):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()  # key → (값, fresh_until, stale_until)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="tool-refresh")
+        self._refresh_tasks: set = set()  # 진행 중인 비동기 갱신 작업 (GC 방지)
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def count(self, tool_name: str, event: str):
+        with self._lock:
+            counter = self._stats.setdefault(tool_name, {"hits": 0, "stale_hits": 0, "misses": 0, "shared": 0,
+                                                         "refreshes": 0, "errors": 0})
+            counter[event] += 1
+
+    def lookup(self, key: str) -> Tuple[str, Any]:
+        """('hit' | 'stale' | 'miss', 값)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return "miss", None
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                return "hit", value
+            if now < stale_until:
+                return "stale", value
+            del self._entries[key]
+            return "miss", None
+
+    def store(self, key: str, value: Any, ttl: float, stale_ttl: float):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (value, now + ttl, now + ttl + stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def join(self, key: str) -> Tuple[Future, bool]:
+        """진행 중인 실행에 합류 - (결과 Future, 직접 실행해야 하는지)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def leave(self, key: str, future: Future, value: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def submit_refresh(self, func, *args):
+        """stale 값 갱신 (동기 도구) - 응답은 기다리지 않음"""
+        self._refresh_executor.submit(func, *args)
+
+    def spawn_refresh(self, coro):
+        """stale 값 갱신 (비동기 도구) - 현재 이벤트 루프에서 실행"""
+        task = asyncio.ensure_future(coro)
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "inflight": len(self._inflight),
+                    "tools": {name: dict(counter) for name, counter in self._stats.items()}}
+
+
+def _call_extras(method, config: RunnableConfig, run_manager) -> dict:
+    """내부 도구 메서드가 받는 경우에만 config / run_manager 전달"""
+    params = signature(method).parameters
+    extras = {}
+    if "config" in params:
+        extras["config"] = config
+    if "run_manager" in params:
+        extras["run_manager"] = run_manager
+    return extras
+
+
+class CachedTool(BaseTool):
+    """
+    도구 결과 캐시 래퍼 - 이름/설명/입력 스키마는 원래 도구 그대로 (LLM 에게는 같은 도구로 보임)
+    - fresh: 캐시 값 반환 / stale: 캐시 값 반환 + 백그라운드 갱신 / miss: 실행(동일 요청 동시 실행은 1번)
+    - skip_if_contains: 결과 문자열에 포함되면 캐시하지 않음 (도구가 예외 대신 오류 문구를 반환하는 경우)
+    - 캐시 사용 여부는 tool_cache 커스텀 이벤트로 콜백 핸들러에 전달
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseTool
+    result_cache: ToolResultCache
+    ttl: float = 60.0
+    stale_ttl: float = 0.0
+    skip_if_contains: List[str] = []
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, cache: ToolResultCache, ttl: float, stale_ttl: float = 0.0,
+             skip_if_contains: Optional[List[str]] = None) -> "CachedTool":
+        return cls(name=tool.name, description=tool.description, args_schema=tool.args_schema,
+                   return_direct=tool.return_direct, response_format=tool.response_format,
+                   inner=tool, result_cache=cache, ttl=ttl, stale_ttl=stale_ttl,
+                   skip_if_contains=skip_if_contains or [])
+
+    def _cacheable(self, value: Any) -> bool:
+        text = value if isinstance(value, str) else str(value[0]) if isinstance(value, tuple) and value else ""
+        return not any(marker in text for marker in self.skip_if_contains)
+
+    def _store(self, key: str, value: Any):
+        if self._cacheable(value):
+            self.result_cache.store(key, value, self.ttl, self.stale_ttl)
+
+    # --- [동기 실행] ---
+    def _notify(self, status: str, config: RunnableConfig):
+        self.result_cache.count(self.name, _STATUS_COUNTERS[status])
+        if config and config.get("callbacks"):
+            try:
+                dispatch_custom_event(TOOL_CACHE_EVENT, {"tool": self.name, "status": status}, config=config)
+            except Exception:
+                pass  # trace 기록 실패가 도구 실행을 막지 않도록
+
+    def _call_inner(self, args: tuple, kwargs: dict, config: RunnableConfig, run_manager=None) -> Any:
+        return self.inner._run(*args, **kwargs, **_call_extras(self.inner._run, config, run_manager))
+
+    def _refresh(self, key: str, args: tuple, kwargs: dict):
+        future, leader = self.result_cache.join(key)
+        if not leader:
+            return
+        try:
+            value = self._call_inner(args, kwargs, RunnableConfig())
+            self._store(key, value)
+            self.result_cache.count(self.name, "refreshes")
+            self.result_cache.leave(key, future, value)
+        except Exception as e:
+            self.result_cache.count(self.name, "errors")
+            logger.warning(f"[TOOL CACHE] {self.name} 백그라운드 갱신 실패: {e}")
+            self.result_cache.leave(key, future, error=e)
+
+    def _run(self, *args: Any, config: RunnableConfig, run_manager: Optional[CallbackManagerForToolRun] = None,
+             **kwargs: Any) -> Any:
+        key = make_key(self.name, args, kwargs)
+        status, value = self.result_cache.lookup(key)
+        if status == "stale":
+            self.result_cache.submit_refresh(self._refresh, key, args, kwargs)
+        if status != "miss":
+            self._notify(status, config)
+            return value
+
+        future, leader = self.result_cache.join(key)
+        if not leader:
+            self._notify("shared", config)
+            return future.result()
+        try:
+            value = self._call_inner(args, kwargs, config, run_manager)
+        except Exception as e:
+            self.result_cache.count(self.name, "errors")
+            self.result_cache.leave(key, future, error=e)
+            raise
+        self._store(key, value)
+        self.result_cache.leave(key, future, value)
+        self._notify("miss", config)
+        return value
+
+    # --- [비동기 실행] ---
+    async def _anotify(self, status: str, config: RunnableConfig):
+        self.result_cache.count(self.name, _STATUS_COUNTERS[status])
+        if config and config.get("callbacks"):
+            try:
+                await adispatch_custom_event(TOOL_CACHE_EVENT, {"tool": self.name, "status": status}, config=config)
+            except Exception:
+                pass
+
+    async def _acall_inner(self, args: tuple, kwargs: dict, config: RunnableConfig, run_manager=None) -> Any:
+        return await self.inner._arun(*args, **kwargs, **_call_extras(self.inner._arun, config, run_manager))
+
+    async def _arefresh(self, key: str, args: tuple, kwargs: dict):
+        future, leader = self.result_cache.join(key)
+        if not leader:
+            return
+        try:
+            value = await self._acall_inner(args, kwargs, RunnableConfig())
+            self._store(key, value)
+            self.result_cache.count(self.name, "refreshes")
+            self.result_cache.leave(key, future, value)
+        except Exception as e:
+            self.result_cache.count(self.name, "errors")
+            logger.warning(f"[TOOL CACHE] {self.name} 백그라운드 갱신 실패: {e}")
+            self.result_cache.leave(key, future, error=e)
+
+    async def _arun(self, *args: Any, config: RunnableConfig,
+                    run_manager: Optional[AsyncCallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        key = make_key(self.name, args, kwargs)
+        status, value = self.result_cache.lookup(key)
+        if status == "stale":
+            self.result_cache.spawn_refresh(self._arefresh(key, args, kwargs))
+        if status != "miss":
+            await self._anotify(status, config)
+            return value
+
+        future, leader = self.result_cache.join(key)
+        if not leader:
+            await self._anotify("shared", config)
+            return await asyncio.wrap_future(future)
+        try:
+            value = await self._acall_inner(args, kwargs, config, run_manager)
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                self.result_cache.count(self.name, "errors")
+            self.result_cache.leave(key, future, error=e)
+            raise
+        self._store(key, value)
+        self.result_cache.leave(key, future, value)
+        await self._anotify("miss", config)
+        return value
@@ -1 +1 @@
-from .factory import get_embedding
\ No newline at end of file
+from .factory import get_embedding, get_embedding_cache_stats
@@ -0,0 +1,177 @@
+# services/embedding/cache.py
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 결과 캐시 래퍼 (메모리 LRU → SQLite 디스크 → 실제 임베딩 API 순으로 조회)
+    - 키: (모델명, 용도(query/doc), 텍스트 SHA-256)
+    - 벡터는 float32 바이트(blob)로 저장해서 메모리/디스크 사용량 절약
+    - 디스크 용량이 disk_max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(self, underlying: Embeddings, model_name: str, db_path: Path,
+                 memory_max_entries: int = 10000, disk_max_bytes: int = 512 * 1024 * 1024):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: OrderedDict = OrderedDict()  # key -> np.ndarray(float32)
+        self._lock = threading.Lock()
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, model TEXT, vector BLOB, bytes INTEGER, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings(last_access)")
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM embeddings").fetchone()[0]
+
+        self.stats_counter = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evicted": 0}
+
+    # --- [키 / 저장소] ---
+    def _key(self, text: str, kind: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{kind}:{digest}"
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """메모리 → 디스크 순으로 조회해서 찾은 벡터만 반환"""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            disk_keys = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.stats_counter["memory_hits"] += 1
+                else:
+                    disk_keys.append(key)
+
+            unique_disk_keys = list(dict.fromkeys(disk_keys))
+            for i in range(0, len(unique_disk_keys), 500):  # SQLite 파라미터 개수 제한 대비
+                chunk = unique_disk_keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vector
+                    self._remember(key, vector)
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(time.time(), key) for key, _ in rows]
+                    )
+                    self._conn.commit()
+            self.stats_counter["disk_hits"] += sum(1 for key in disk_keys if key in found)
+        return found
+
+    def _store(self, items: Dict[str, np.ndarray]):
+        now = time.time()
+        with self._lock:
+            rows = []
+            for key, vector in items.items():
+                self._remember(key, vector)
+                blob = vector.tobytes()
+                rows.append((key, self.model_name, blob, len(blob), now))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, bytes, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._disk_bytes += sum(row[3] for row in rows)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """디스크 용량이 한도를 넘으면 오래된 항목부터 삭제 (한도의 90%까지)"""
+        target = int(self.disk_max_bytes * 0.9)
+        while self._disk_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, bytes FROM embeddings ORDER BY last_access LIMIT 500"
+            ).fetchall()
+            if not rows:
+                break
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in rows])
+            self._disk_bytes -= sum(size for _, size in rows)
+            self.stats_counter["evicted"] += len(rows)
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM embeddings").fetchone()[0]
+
+    # --- [조회 흐름] ---
+    def _split(self, texts: List[str], kind: str):
+        keys = [self._key(text, kind) for text in texts]
+        found = self._lookup(keys)
+        # 캐시에 없는 텍스트만 (중복 제거) 임베딩 요청
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        return keys, found, missing
+
+    def _merge(self, keys: List[str], found: Dict[str, np.ndarray],
+               missing: Dict[str, str], vectors: Optional[List[List[float]]]) -> List[List[float]]:
+        if missing:
+            computed = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, vectors)}
+            self._store(computed)
+            found.update(computed)
+            self.stats_counter["misses"] += len(missing)
+        return [found[key].tolist() for key in keys]
+
+    # --- [Embeddings 인터페이스] ---
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._split(texts, "doc")
+        vectors = self.underlying.embed_documents(list(missing.values())) if missing else None
+        return self._merge(keys, found, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._split([text], "query")
+        vectors = [self.underlying.embed_query(text)] if missing else None
+        return self._merge(keys, found, missing, vectors)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await asyncio.to_thread(self._split, texts, "doc")
+        vectors = await self.underlying.aembed_documents(list(missing.values())) if missing else None
+        return await asyncio.to_thread(self._merge, keys, found, missing, vectors)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = await asyncio.to_thread(self._split, [text], "query")
+        vectors = [await self.underlying.aembed_query(text)] if missing else None
+        return (await asyncio.to_thread(self._merge, keys, found, missing, vectors))[0]
+
+    # --- [통계] ---
+    def stats(self) -> dict:
+        lookups = sum(self.stats_counter[k] for k in ("memory_hits", "disk_hits", "misses"))
+        hits = self.stats_counter["memory_hits"] + self.stats_counter["disk_hits"]
+        return {
+            "model": self.model_name,
+            **self.stats_counter,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
@@ -1,18 +1,59 @@
+import threading
 from config import EmbeddingType, ACTIVE_EMBEDDING, embedding_configs
-from .provider import CloudEmbeddingProvider
+from config.settings import setting
+from .provider import CloudEmbeddingProvider, LocalEmbeddingProvider
+from .cache import CachedEmbeddings
+
+# 생성된 임베딩 클라이언트 캐시 (설정 키 → 객체)
+# 내부 HTTP 커넥션 풀을 프로세스 전체에서 재사용하기 위함
+_embedding_instances = {}
+_lock = threading.Lock()
 
 def get_embedding():
     """
     설정(config)에 맞춰 적절한 임베딩 모델 객체를 반환
+    - 같은 설정이면 프로세스 내에서 같은 객체를 재사용합니다.
     """
     # 1. 현재 활성화된 설정(dict)을 가져옵니다.
     if ACTIVE_EMBEDDING not in embedding_configs:
         raise ValueError(f"설정 파일에 '{ACTIVE_EMBEDDING}'에 대한 정의가 없습니다.")
-        
-    conf = embedding_configs[ACTIVE_EMBEDDING] 
-    
-    # 2. Provider 인스턴스 생성
-    provider = CloudEmbeddingProvider()
-    
-    # 3. [수정 포인트] 설정을 인자로 넘겨주며 메서드 호출
-    return provider.create_embedding(conf)
\ No newline at end of file
+
+    if ACTIVE_EMBEDDING in _embedding_instances:
+        return _embedding_instances[ACTIVE_EMBEDDING]
+
+    with _lock:
+        if ACTIVE_EMBEDDING not in _embedding_instances:
+            conf = embedding_configs[ACTIVE_EMBEDDING] 
+            
+            # 2. Provider 인스턴스 생성
+            if conf["provider"] in ["local"]:
+                provider = LocalEmbeddingProvider()
+            else:
+                provider = CloudEmbeddingProvider()
+            
+            # 3. [수정 포인트] 설정을 인자로 넘겨주며 메서드 호출
+            embedding = provider.create_embedding(conf)
+
+            # 4. 캐시 설정이 켜져 있으면 캐시 래퍼로 감싸기
+            cache_conf = conf.get("cache", {})
+            if cache_conf.get("enabled"):
+                embedding = CachedEmbeddings(
+                    embedding,
+                    model_name=conf["model_name"],
+                    db_path=setting.CACHE_DIR / "embeddings.db",
+                    memory_max_entries=cache_conf.get("memory_max_entries", 10000),
+                    disk_max_bytes=cache_conf.get("disk_max_mb", 512) * 1024 * 1024
+                )
+
+            _embedding_instances[ACTIVE_EMBEDDING] = embedding
+
+    return _embedding_instances[ACTIVE_EMBEDDING]
+
+
+def get_embedding_cache_stats():
+    """생성된 임베딩 캐시들의 hit/miss 통계"""
+    return {
+        key: embedding.stats()
+        for key, embedding in _embedding_instances.items()
+        if isinstance(embedding, CachedEmbeddings)
+    }
@@ -0,0 +1,129 @@
+# services/embedding/local.py
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+import torch
+from langchain_core.embeddings import Embeddings
+from sentence_transformers import SentenceTransformer
+from config.settings import setting
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# ONNX int8 양자화 결과 파일 (sentence-transformers export 규칙)
+ONNX_QINT8_FILE = "onnx/model_qint8_avx2.onnx"
+
+
+def load_sentence_transformer(model_name: str, backend: str = "torch", quantize_int8: bool = False,
+                              device: str = "cpu", num_threads: Optional[int] = None) -> SentenceTransformer:
+    """
+    sentence-transformers 모델 로드
+    - backend="onnx" 는 optimum[onnxruntime] 패키지가 추가로 필요합니다.
+    - backend="onnx" + quantize_int8=True: 처음 한 번만 ONNX 변환 + int8 동적 양자화 후
+      CACHE_DIR/onnx/<모델명> 에 저장하고, 이후에는 저장된 파일을 바로 로드
+    """
+    model_kwargs = {}
+    if backend == "onnx" and num_threads:
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = num_threads  # ONNX Runtime 추론 스레드 수
+        model_kwargs["session_options"] = session_options
+
+    if backend != "onnx" or not quantize_int8:
+        return SentenceTransformer(model_name, device=device, backend=backend, model_kwargs=model_kwargs or None)
+
+    export_dir = setting.CACHE_DIR / "onnx" / model_name.replace("/", "__")
+    if not (export_dir / ONNX_QINT8_FILE).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logger.info(f"[EMBEDDING] ONNX int8 변환 시작 (최초 1회): {model_name} → {export_dir}")
+        model = SentenceTransformer(model_name, device=device, backend="onnx")
+        model.save_pretrained(str(export_dir))
+        export_dynamic_quantized_onnx_model(model, quantization_config="avx2", model_name_or_path=str(export_dir))
+
+    return SentenceTransformer(
+        str(export_dir), device=device, backend="onnx",
+        model_kwargs={**model_kwargs, "file_name": ONNX_QINT8_FILE}
+    )
+
+
+class LocalSentenceEmbeddings(Embeddings):
+    """
+    CPU 로컬 임베딩 (sentence-transformers / ONNX Runtime)
+    - embed_documents: batch_size 단위로 나누어 인코딩 (길이가 비슷한 문장끼리 묶여 패딩 최소화)
+    - embed_query: 여러 요청이 동시에 들어오면 max_wait_ms 동안 모아서 한 번에 인코딩 (micro-batching)
+    """
+
+    def __init__(self, model: SentenceTransformer, batch_size: int = 32, max_wait_ms: float = 5.0,
+                 query_prefix: str = "", document_prefix: str = "", normalize: bool = True):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.query_prefix = query_prefix
+        self.document_prefix = document_prefix
+        self.normalize = normalize
+
+        self._queries: "queue.Queue[tuple[str, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._batch_queries, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def _batch_queries(self):
+        """질문 임베딩 요청을 모아서 한 번에 처리하는 백그라운드 작업"""
+        while True:
+            batch = [self._queries.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queries.get(timeout=self.max_wait))
+            except queue.Empty:
+                pass
+
+            try:
+                vectors = self._encode([text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode([self.document_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        future: Future = Future()
+        self._queries.put((self.query_prefix + text, future))
+        return future.result()
+
+
+def create_local_embedding(config: dict) -> LocalSentenceEmbeddings:
+    num_threads: Optional[int] = config.get("num_threads")
+    if num_threads:
+        torch.set_num_threads(num_threads)  # CPU 추론 스레드 수 제한
+
+    model = load_sentence_transformer(
+        config["model_name"],
+        backend=config.get("backend", "torch"),
+        quantize_int8=config.get("quantize_int8", False),
+        device=config.get("device", "cpu"),
+        num_threads=num_threads
+    )
+    return LocalSentenceEmbeddings(
+        model,
+        batch_size=config.get("batch_size", 32),
+        max_wait_ms=config.get("max_wait_ms", 5.0),
+        query_prefix=config.get("query_prefix", ""),
+        document_prefix=config.get("document_prefix", ""),
+        normalize=config.get("normalize", True)
+    )
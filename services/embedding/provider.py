@@ -28,4 +28,13 @@ class CloudEmbeddingProvider(BaseEmbeddingProvider):
             # logger.info(f"지원하지 않는 Cloud Provider: {config['provider']}")
             logger.info(f"지원하지 않는 Cloud Provider: {config['provider']}")
             raise ValueError(f"지원하지 않는 Cloud Provider: {config['provider']}")
-        
\ No newline at end of file
+
+# 3. [Local] sentence-transformers / ONNX Runtime (CPU)
+class LocalEmbeddingProvider(BaseEmbeddingProvider):
+    def create_embedding(self, config: dict) -> Embeddings:
+        logger.info(f"로컬 임베딩 모델 로딩 중: {config['model_name']}")
+        logger.info(f"로컬 임베딩 모델 로딩 중: {config}")
+
+        # torch, sentence-transformers 는 무거우므로 로컬 임베딩을 사용할 때만 import
+        from .local import create_local_embedding
+        return create_local_embedding(config)
@@ -1 +1 @@
-from .factory import get_llm, get_middleware_summary_llm
\ No newline at end of file
+from .factory import get_llm, get_middleware_summary_llm, get_llm_cache_stats, get_model_footprint, model_registry
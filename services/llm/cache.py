@@ -0,0 +1,152 @@
+# services/llm/cache.py
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LLM 응답 캐시 (모델 키별 네임스페이스, SQLite 디스크 저장)
+    - 키: SHA-256(모델 키 + llm_string + 프롬프트)
+      · 프롬프트: LangChain이 직렬화한 전체 메시지 목록
+      · llm_string: 모델 파라미터 + bind된 인자(stop, tools 등)
+    - 값: 직렬화된 Generation 목록 (zlib 압축)
+    - ttl_seconds가 지난 항목은 조회 시 삭제하고, 모델별 용량이 max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(self, model_key: str, db_path: Path, ttl_seconds: Optional[float] = 86400,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.model_key = model_key
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, model TEXT, value BLOB, bytes INTEGER, created_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses(model, last_access)")
+        self._conn.commit()
+        self._bytes = self._stored_bytes()
+
+        self.stats_counter = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "errors": 0}
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        raw = f"{self.model_key}\0{llm_string}\0{prompt}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM llm_responses WHERE model = ?", (self.model_key,)
+        ).fetchone()[0]
+
+    # --- [BaseCache 인터페이스] ---
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, bytes, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats_counter["misses"] += 1
+                return None
+
+            value, size, created_at = row
+            if self.ttl_seconds is not None and created_at + self.ttl_seconds < now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._bytes -= size
+                self.stats_counter["expired"] += 1
+                self.stats_counter["misses"] += 1
+                return None
+
+            self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        try:
+            generations = loads(zlib.decompress(value).decode("utf-8"))
+        except Exception as e:
+            # 라이브러리 버전 변경 등으로 복원 실패 시 캐시 미스로 처리
+            logger.warning(f"[LLM CACHE] 캐시 값 복원 실패 ({self.model_key}): {e}")
+            self.stats_counter["errors"] += 1
+            self.stats_counter["misses"] += 1
+            return None
+
+        self.stats_counter["hits"] += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        try:
+            value = zlib.compress(dumps(return_val).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"[LLM CACHE] 응답 직렬화 실패 ({self.model_key}): {e}")
+            self.stats_counter["errors"] += 1
+            return
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT bytes FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, value, bytes, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.model_key, value, len(value), now, now)
+            )
+            self._conn.commit()
+            self._bytes += len(value) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses WHERE model = ?", (self.model_key,))
+            self._conn.commit()
+            self._bytes = 0
+
+    def _evict(self):
+        """만료 항목 삭제 후에도 용량이 한도를 넘으면 오래된 항목부터 삭제 (한도의 90%까지)"""
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_responses WHERE model = ? AND created_at < ?",
+                (self.model_key, time.time() - self.ttl_seconds)
+            )
+            self.stats_counter["expired"] += cursor.rowcount
+            self._bytes = self._stored_bytes()
+
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, bytes FROM llm_responses WHERE model = ? ORDER BY last_access LIMIT 200",
+                (self.model_key,)
+            ).fetchall()
+            if not rows:
+                break
+            self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", [(key,) for key, _ in rows])
+            self._bytes -= sum(size for _, size in rows)
+            self.stats_counter["evicted"] += len(rows)
+        self._conn.commit()
+        self._bytes = self._stored_bytes()
+
+    # --- [통계] ---
+    def stats(self) -> dict:
+        lookups = self.stats_counter["hits"] + self.stats_counter["misses"]
+        return {
+            **self.stats_counter,
+            "hit_rate": round(self.stats_counter["hits"] / lookups, 4) if lookups else 0.0,
+            "bytes_stored": self._bytes,
+        }
@@ -1,5 +1,49 @@
-from config.llm_config import llm_configs, ACTIVE_MODEL, MIDDLEWARE_SUMMARY_MODEL
+import threading
+from config.llm_config import llm_configs, ACTIVE_MODEL, MIDDLEWARE_SUMMARY_MODEL, MODEL_ROLE_OVERRIDES
+from config.settings import setting
+from common.logger import get_logger
 from .provider import CloudLLMProvider, LocalLLMProvider, APILLMProvider
+from .cache import SQLiteLLMCache
+from .registry import ModelRegistry
+
+logger = get_logger(__name__)
+
+# 모델 키별 응답 캐시 (같은 모델이면 생성된 LLM 객체가 여러 개여도 캐시는 공유)
+_llm_caches = {}
+_cache_lock = threading.Lock()
+
+
+def _get_temperature(conf: dict) -> float:
+    """설정의 temperature (로컬 모델은 pipeline_kwargs 안에 있음, 역할별 override 는 최상위 값이 우선)"""
+    if "temperature" in conf:
+        return conf["temperature"]
+    return conf.get("pipeline_kwargs", {}).get("temperature", 1.0)
+
+
+def _get_llm_cache(target_model_key: str, conf: dict):
+    """
+    설정에서 cache가 켜져 있고 temperature가 max_temperature 이하일 때만 응답 캐시 반환
+    (temperature가 높으면 같은 프롬프트라도 다른 답을 기대하므로 캐시하지 않음)
+    - 모델 생성 시(기본 설정)와 역할별 view 생성 시(기본 설정 + MODEL_ROLE_OVERRIDES) 각각 호출
+    """
+    cache_conf = conf.get("cache", {})
+    if not cache_conf.get("enabled"):
+        return None
+
+    temperature = _get_temperature(conf)
+    if temperature > cache_conf.get("max_temperature", 0.3):
+        logger.info(f"[LLM CACHE] '{target_model_key}' temperature={temperature} → 캐시 사용 안 함")
+        return None
+
+    with _cache_lock:
+        if target_model_key not in _llm_caches:
+            _llm_caches[target_model_key] = SQLiteLLMCache(
+                target_model_key,
+                db_path=setting.CACHE_DIR / "llm_responses.db",
+                ttl_seconds=cache_conf.get("ttl_seconds", 86400),
+                max_bytes=cache_conf.get("max_mb", 256) * 1024 * 1024
+            )
+    return _llm_caches[target_model_key]
 
 def _create_llm_instance(target_model_key: str):
     """
@@ -26,18 +70,40 @@ def _create_llm_instance(target_model_key: str):
         raise ValueError(f"❌ 알 수 없는 Provider 설정입니다: {provider_type}")
 
     # 3. Provider에게 설정(conf)을 넘겨주며 생성 요청
-    return provider.create_llm(conf)
+    llm = provider.create_llm(conf)
+
+    # 4. 응답 캐시 연결 (설정에서 켠 모델만)
+    llm_cache = _get_llm_cache(target_model_key, conf)
+    if llm_cache is not None:
+        llm.cache = llm_cache
+
+    return llm
+
+
+# 프로세스 전역 모델 레지스트리 (같은 설정의 모델은 한 번만 생성/로드)
+model_registry = ModelRegistry(_create_llm_instance, llm_configs, cache_factory=_get_llm_cache)
 
 
 def get_llm():
     """
-    메인 LLM 생성 (ACTIVE_MODEL 사용)
+    메인 LLM 반환 (ACTIVE_MODEL 사용, 프로세스 내 공유 객체)
     """
-    return _create_llm_instance(ACTIVE_MODEL)
+    return model_registry.get(ACTIVE_MODEL, **MODEL_ROLE_OVERRIDES.get("main", {}))
 
 
 def get_middleware_summary_llm():
     """
-    요약용 LLM 생성 (MIDDLEWARE_SUMMARY_MODEL 사용)
+    요약용 LLM 반환 (MIDDLEWARE_SUMMARY_MODEL 사용)
+    - 메인 모델과 같은 설정이면 같은 객체(또는 파라미터만 다른 view)를 공유
     """
-    return _create_llm_instance(MIDDLEWARE_SUMMARY_MODEL)
+    return model_registry.get(MIDDLEWARE_SUMMARY_MODEL, **MODEL_ROLE_OVERRIDES.get("summary", {}))
+
+
+def get_model_footprint():
+    """생성된 모델별 메모리 사용량"""
+    return model_registry.footprint()
+
+
+def get_llm_cache_stats():
+    """모델 키별 LLM 응답 캐시 hit/miss 통계"""
+    return {key: cache.stats() for key, cache in _llm_caches.items()}
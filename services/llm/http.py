@@ -0,0 +1,108 @@
+# services/llm/http.py
+import importlib.util
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from common.logger import get_logger
+from .limiter import get_limiter, LimitedTransport, AsyncLimitedTransport
+from .router import get_router, RoutingTransport, AsyncRoutingTransport
+
+logger = get_logger(__name__)
+
+OPENAI_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# HTTP/2는 h2 패키지가 설치되어 있을 때만 사용 (없으면 HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def build_timeout(http_conf: dict) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=http_conf.get("connect_timeout", 5.0),
+        read=http_conf.get("read_timeout", 120.0),
+        write=http_conf.get("write_timeout", 30.0),
+        pool=http_conf.get("pool_timeout", 10.0),
+    )
+
+
+def build_limits(http_conf: dict) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=http_conf.get("max_connections", 100),
+        max_keepalive_connections=http_conf.get("max_keepalive_connections", 20),
+        keepalive_expiry=http_conf.get("keepalive_expiry", 60.0),
+    )
+
+
+class HttpClientPool:
+    """
+    LLM API용 httpx 클라이언트 공유 풀 (base_url + 설정 별로 sync/async 클라이언트 1쌍)
+    - 같은 엔드포인트를 쓰는 모든 모델/역할이 커넥션 풀을 공유 → TLS 핸드셰이크/연결 생성 최소화
+    - keep-alive, 최대 연결 수, 타임아웃, HTTP/2 여부는 llm_configs 의 "http" 항목에서 설정
+    - limiter 설정이 있으면 모델별 동시 호출 한도(AIMD)를 전송 계층에 적용
+    - base_urls 에 복제 서버가 여러 개면 router 설정으로 지연 시간 기반 분산/장애 조치
+      (전송 계층 순서: limiter → router → 커넥션 풀, 재시도/hedge 도 한도 1자리 안에서 처리)
+    """
+
+    def __init__(self):
+        self._clients: Dict[tuple, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _enabled_conf(conf: Optional[dict]) -> Optional[dict]:
+        return {k: v for k, v in conf.items() if k != "enabled"} if (conf or {}).get("enabled") else None
+
+    @staticmethod
+    def _key(base_url: str, http_conf: dict, limiter_name: Optional[str], base_urls: tuple) -> tuple:
+        return (base_url.rstrip("/"), tuple(sorted(http_conf.items())), limiter_name, base_urls)
+
+    def get_clients(self, base_url: Optional[str], http_conf: dict, limiter_name: Optional[str] = None,
+                    limiter_conf: Optional[dict] = None, base_urls: Optional[List[str]] = None,
+                    router_conf: Optional[dict] = None) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        base_url = base_url or OPENAI_DEFAULT_BASE_URL
+        limiter_conf = self._enabled_conf(limiter_conf)
+        router_conf = self._enabled_conf(router_conf) if len(base_urls or []) > 1 else None
+        routed_urls = tuple(url.rstrip("/") for url in base_urls) if router_conf else ()
+        key = self._key(base_url, http_conf, limiter_name if (limiter_conf or router_conf) else None, routed_urls)
+        if key in self._clients:
+            return self._clients[key]
+
+        with self._lock:
+            if key not in self._clients:
+                http2 = http_conf.get("http2", True) and HTTP2_AVAILABLE
+                limits = build_limits(http_conf)
+                transport = httpx.HTTPTransport(limits=limits, http2=http2)
+                async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+                if router_conf:
+                    router = get_router(limiter_name or base_url, list(routed_urls), router_conf)
+                    transport = RoutingTransport(transport, router, base_url)
+                    async_transport = AsyncRoutingTransport(async_transport, router, base_url)
+                if limiter_conf:
+                    limiter = get_limiter(limiter_name or base_url, limiter_conf)
+                    transport = LimitedTransport(transport, limiter)
+                    async_transport = AsyncLimitedTransport(async_transport, limiter)
+
+                timeout = build_timeout(http_conf)
+                self._clients[key] = (
+                    httpx.Client(transport=transport, timeout=timeout),
+                    httpx.AsyncClient(transport=async_transport, timeout=timeout)
+                )
+                logger.info(f"[LLM HTTP] 커넥션 풀 생성: {base_url} (http2={http2}, "
+                            f"max_connections={limits.max_connections}, limiter={bool(limiter_conf)}, "
+                            f"endpoints={len(routed_urls) or 1})")
+        return self._clients[key]
+
+    async def aclose(self):
+        """서버 종료 시 모든 커넥션 정리"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for sync_client, async_client in clients:
+            sync_client.close()
+            await async_client.aclose()
+
+
+# 프로세스 전역 풀
+_http_client_pool = HttpClientPool()
+
+def get_http_client_pool() -> HttpClientPool:
+    return _http_client_pool
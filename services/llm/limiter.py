@@ -0,0 +1,291 @@
+# services/llm/limiter.py
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import httpx
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 과부하로 보는 응답 코드 (한도 감소 신호)
+OVERLOAD_STATUS = {429, 502, 503, 504}
+
+
+class LLMOverloadedError(Exception):
+    """대기열이 가득 찼거나 대기 시간(deadline)을 넘겨 LLM 호출을 거절한 경우"""
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+        self.granted = False
+
+    def wake(self):
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(True))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 방식 동시 호출 한도 (모델별 1개, 동기/비동기 호출 공용)
+    - 성공 + 지연 시간이 기준(장기 평균 지연 × latency_tolerance) 이내: 한도 += 1/한도 (천천히 증가)
+    - 과부하 응답(429/5xx)/타임아웃/지연 급증: 한도 × backoff (빠르게 감소)
+    - 한도를 넘는 요청은 최대 max_queue 개까지 대기, queue_timeout 안에 자리가 안 나면 거절
+    """
+
+    def __init__(self, name: str, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 max_queue: int = 100, queue_timeout: float = 30.0, latency_tolerance: float = 3.0,
+                 backoff: float = 0.7):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._baseline_latency: Optional[float] = None  # 지연 시간 장기 이동 평균
+        self._last_decrease = 0.0
+
+        self.stats_counter = {"accepted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0,
+                              "overloads": 0, "decreases": 0}
+
+    # --- [자리 확보 / 반환] ---
+    def _try_acquire(self, loop=None) -> Optional[_Waiter]:
+        """바로 실행 가능하면 None, 대기해야 하면 대기 객체 반환 (대기열이 가득 차면 거절)"""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                self.stats_counter["accepted"] += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self.stats_counter["rejected_full"] += 1
+                raise LLMOverloadedError(f"[{self.name}] LLM 대기열이 가득 찼습니다 ({self.max_queue}건)")
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+            self.stats_counter["queued"] += 1
+            return waiter
+
+    def _give_up(self, waiter: _Waiter) -> bool:
+        """대기 시간 초과 처리 - 이미 자리를 받았다면 False (그대로 실행)"""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            self.stats_counter["rejected_timeout"] += 1
+        return True
+
+    def _release_locked(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            self.stats_counter["accepted"] += 1
+            self._waiters.popleft().wake()
+
+    def acquire(self):
+        waiter = self._try_acquire()
+        if waiter is not None and not waiter.event.wait(self.queue_timeout) and self._give_up(waiter):
+            raise LLMOverloadedError(f"[{self.name}] LLM 대기 시간 초과 ({self.queue_timeout}초)")
+
+    async def aacquire(self):
+        waiter = self._try_acquire(asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if self._give_up(waiter):
+                raise LLMOverloadedError(f"[{self.name}] LLM 대기 시간 초과 ({self.queue_timeout}초)")
+        except asyncio.CancelledError:
+            # 요청이 취소되면 대기열에서 빼고, 이미 받은 자리는 반환
+            if not self._give_up(waiter):
+                self.release(latency=None, overloaded=False)
+            raise
+
+    def release(self, latency: Optional[float], overloaded: bool):
+        """호출 완료 - 지연 시간/과부하 여부로 한도 조정 후 다음 대기 요청 실행"""
+        with self._lock:
+            if overloaded:
+                self.stats_counter["overloads"] += 1
+                self._decrease()
+            elif latency is not None:
+                if self._baseline_latency is None:
+                    self._baseline_latency = latency
+                if latency > self._baseline_latency * self.latency_tolerance:
+                    self._decrease()
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self._baseline_latency += (latency - self._baseline_latency) * 0.05
+            self._release_locked()
+
+    def _decrease(self):
+        # 같은 원인으로 연속 감소하지 않도록 최근 감소 후 기준 지연 시간 동안은 한 번만
+        now = time.monotonic()
+        if now - self._last_decrease < (self._baseline_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self.stats_counter["decreases"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "baseline_latency_ms": round(self._baseline_latency * 1000, 1) if self._baseline_latency else None,
+            **self.stats_counter,
+        }
+
+
+def _overloaded_response(request: httpx.Request, error: LLMOverloadedError) -> httpx.Response:
+    """
+    거절을 429 응답으로 변환 (x-should-retry: false → OpenAI SDK가 재시도하지 않고 바로 RateLimitError)
+    """
+    body = json.dumps({"error": {"message": str(error), "type": "llm_overloaded", "code": "llm_overloaded"}})
+    return httpx.Response(429, headers={"content-type": "application/json", "x-should-retry": "false"},
+                          content=body.encode("utf-8"), request=request)
+
+
+class ReleasingStream(httpx.SyncByteStream):
+    """응답 본문을 다 읽거나 닫을 때 한도 자리 반환 (스트리밍 응답 포함)"""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+def call_once(func):
+    called = False
+
+    def wrapper():
+        nonlocal called
+        if not called:
+            called = True
+            func()
+    return wrapper
+
+
+class LimitedTransport(httpx.BaseTransport):
+    """동시 호출 한도를 적용하는 httpx 전송 계층 (동기)"""
+
+    def __init__(self, inner: httpx.BaseTransport, limiter: AdaptiveConcurrencyLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            self.limiter.acquire()
+        except LLMOverloadedError as e:
+            return _overloaded_response(request, e)
+
+        start = time.perf_counter()
+        try:
+            response = self.inner.handle_request(request)
+        except Exception:
+            self.limiter.release(latency=None, overloaded=True)  # 연결 실패/타임아웃
+            raise
+        latency = time.perf_counter() - start  # 응답 헤더까지의 시간
+        overloaded = response.status_code in OVERLOAD_STATUS
+        release = call_once(lambda: self.limiter.release(latency, overloaded))
+        return httpx.Response(response.status_code, headers=response.headers,
+                              stream=ReleasingStream(response.stream, release),
+                              extensions=response.extensions, request=request)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncLimitedTransport(httpx.AsyncBaseTransport):
+    """동시 호출 한도를 적용하는 httpx 전송 계층 (비동기)"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, limiter: AdaptiveConcurrencyLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            await self.limiter.aacquire()
+        except LLMOverloadedError as e:
+            return _overloaded_response(request, e)
+
+        start = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException as e:
+            # 취소(CancelledError)는 과부하 신호가 아님
+            self.limiter.release(latency=None, overloaded=not isinstance(e, asyncio.CancelledError))
+            raise
+        latency = time.perf_counter() - start
+        overloaded = response.status_code in OVERLOAD_STATUS
+        release = call_once(lambda: self.limiter.release(latency, overloaded))
+        return httpx.Response(response.status_code, headers=response.headers,
+                              stream=AsyncReleasingStream(response.stream, release),
+                              extensions=response.extensions, request=request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def is_overloaded_error(error: BaseException) -> bool:
+    """예외 체인 안에 과부하(대기열 거절/429) 원인이 있는지"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, LLMOverloadedError) or getattr(error, "status_code", None) == 429:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+# 모델별 한도 (이름 → limiter)
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name: str, limiter_conf: dict) -> AdaptiveConcurrencyLimiter:
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = AdaptiveConcurrencyLimiter(name, **limiter_conf)
+        return _limiters[name]
+
+def get_limiter_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
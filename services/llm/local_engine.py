@@ -0,0 +1,314 @@
+# services/llm/local_engine.py
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from langchain_core.outputs import Generation, LLMResult
+from langchain_huggingface import HuggingFacePipeline, ChatHuggingFace
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class GenerationRequest:
+    prompt: str
+    input_ids: List[int]
+    gen_kwargs: Dict[str, Any]
+    stop: Optional[List[str]]
+    future: Future = field(default_factory=Future)
+    prefix: Optional[Tuple[int, ...]] = None  # 재사용할 prefix KV (prefix 캐시 hit)
+
+    @property
+    def suffix_length(self) -> int:
+        """prefix KV 이후 새로 prefill 할 토큰 수 (패딩 계산 기준)"""
+        return len(self.input_ids) - (len(self.prefix) if self.prefix else 0)
+
+    @property
+    def group_key(self):
+        """생성 파라미터가 같은 요청끼리만 한 배치로 묶음"""
+        return tuple(sorted((k, repr(v)) for k, v in self.gen_kwargs.items()))
+
+
+def truncate_at_stop(text: str, stop: Optional[List[str]]) -> str:
+    """stop 문자열이 처음 나타나는 위치에서 자르기"""
+    if not stop:
+        return text
+    positions = [text.find(s) for s in stop if s and s in text]
+    return text[:min(positions)] if positions else text
+
+
+class BatchedGenerationEngine:
+    """
+    로컬 모델 동적 micro-batching 엔진
+    - 동시에 들어온 생성 요청을 큐에 모았다가 max_wait_ms 안에 도착한 요청을 한 번의 generate로 처리
+    - 같은 생성 파라미터끼리, 입력 길이가 비슷한 요청끼리 묶어서 패딩 낭비 최소화
+      (가장 긴 입력 기준 패딩 토큰이 실제 토큰의 max_padding_ratio 를 넘으면 배치를 나눔)
+    - 디코더 모델이므로 왼쪽 패딩(left padding) 사용
+    - prefix_cache 가 있으면 같은 prefix KV를 재사용하는 요청끼리 한 배치로 묶음
+      (prefix KV를 배치 크기만큼 펼치고, prefix 뒤 새 토큰 앞쪽에 패딩 → [prefix][pad..][새 토큰] 형태로 오른쪽 정렬)
+    """
+
+    def __init__(self, model, tokenizer, default_gen_kwargs: Optional[dict] = None, max_batch_size: int = 8,
+                 max_wait_ms: float = 10.0, max_padding_ratio: float = 0.3, prefix_cache=None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.prefix_cache = prefix_cache
+        self.default_gen_kwargs = default_gen_kwargs or {}
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_padding_ratio = max_padding_ratio
+
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token_id is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        self._queue: "queue.Queue[GenerationRequest]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="local-llm-batcher", daemon=True)
+        self._worker.start()
+
+        self.stats_counter = {"requests": 0, "batches": 0, "generated_tokens": 0, "padding_tokens": 0,
+                              "generate_seconds": 0.0}
+
+    # --- [요청 제출] ---
+    def submit(self, prompt: str, stop: Optional[List[str]] = None, **gen_kwargs) -> Future:
+        request = GenerationRequest(
+            prompt=prompt,
+            input_ids=self.tokenizer(prompt, add_special_tokens=False)["input_ids"],
+            gen_kwargs={**self.default_gen_kwargs, **gen_kwargs},
+            stop=stop
+        )
+        self._queue.put(request)
+        return request.future
+
+    def generate(self, prompt: str, stop: Optional[List[str]] = None, **gen_kwargs) -> str:
+        return self.submit(prompt, stop, **gen_kwargs).result()
+
+    async def agenerate(self, prompt: str, stop: Optional[List[str]] = None, **gen_kwargs) -> str:
+        return await asyncio.wrap_future(self.submit(prompt, stop, **gen_kwargs))
+
+    def close(self):
+        """작업 스레드 종료 (모델 언로드 시 엔진이 모델을 계속 붙잡고 있지 않도록)"""
+        self._queue.put(None)
+        self._worker.join(timeout=30)
+
+    # --- [배치 구성] ---
+    def _collect(self) -> Optional[List[GenerationRequest]]:
+        """첫 요청이 들어오면 max_wait 동안 추가 요청을 모음 (종료 신호(None)를 받으면 None)"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size * 4:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # 모아 둔 요청을 처리한 뒤 종료
+                break
+            batch.append(request)
+        return batch
+
+    def _group(self, requests: List[GenerationRequest]) -> List[List[GenerationRequest]]:
+        """생성 파라미터별 → 입력 길이순 정렬 → 패딩 비율/배치 크기 한도 안에서 묶기 (prefix 이후 길이 기준)"""
+        by_params: Dict[tuple, List[GenerationRequest]] = {}
+        for request in requests:
+            by_params.setdefault(request.group_key, []).append(request)
+
+        groups = []
+        for same_params in by_params.values():
+            current: List[GenerationRequest] = []
+            actual_tokens = 0
+            for request in sorted(same_params, key=lambda r: r.suffix_length):
+                length = request.suffix_length
+                padded = length * (len(current) + 1)  # 정렬되어 있으므로 새 요청이 가장 긺
+                if current and (len(current) >= self.max_batch_size
+                                or padded > (actual_tokens + length) * (1 + self.max_padding_ratio)):
+                    groups.append(current)
+                    current, actual_tokens = [], 0
+                current.append(request)
+                actual_tokens += length
+            if current:
+                groups.append(current)
+        return groups
+
+    # --- [실행] ---
+    def _run(self):
+        while True:
+            requests = self._collect()
+            if requests is None:
+                break
+            # prefix 캐시 hit 은 같은 prefix 끼리, 나머지는 일반 배치로 분류
+            by_prefix: Dict[Optional[Tuple[int, ...]], List[GenerationRequest]] = {}
+            for request in requests:
+                if self.prefix_cache is not None:
+                    try:
+                        request.prefix = self.prefix_cache.match(request.input_ids)
+                    except Exception as e:
+                        logger.warning(f"[LOCAL LLM] prefix 캐시 조회 실패 → 일반 배치로 처리: {e}")
+                by_prefix.setdefault(request.prefix, []).append(request)
+
+            for prefix, same_prefix in by_prefix.items():
+                for group in self._group(same_prefix):
+                    try:
+                        past_key_values = self.prefix_cache.kv_for(prefix, len(group)) if prefix else None
+                        if past_key_values is None:
+                            for request in group:
+                                request.prefix = None
+                            self._generate_batch(group)
+                        else:
+                            self._generate_batch_with_prefix(group, past_key_values)
+                    except Exception as e:
+                        self._fail(group, e)
+
+    def _fail(self, group: List[GenerationRequest], error: Exception):
+        logger.error(f"[LOCAL LLM] 생성 실패 (요청 {len(group)}건): {error}", exc_info=True)
+        for request in group:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _finish(self, request: GenerationRequest, tokens: torch.Tensor):
+        """새로 생성된 토큰 디코딩 → stop 처리 → 결과 전달"""
+        self.stats_counter["generated_tokens"] += int((tokens != self.tokenizer.pad_token_id).sum())
+        text = self.tokenizer.decode(tokens, skip_special_tokens=True)
+        request.future.set_result(truncate_at_stop(text, request.stop))
+        self.stats_counter["requests"] += 1
+
+    @torch.inference_mode()
+    def _generate_batch_with_prefix(self, group: List[GenerationRequest], past_key_values):
+        """
+        같은 prefix KV를 이어 받아 뒷부분만 prefill 후 배치 생성
+        - 입력: [prefix][pad...][새 토큰] (새 토큰을 오른쪽 정렬, 패딩은 attention_mask 0)
+        - 위치(position)는 attention_mask 누적합으로 계산되므로 패딩이 중간에 있어도 새 토큰 위치가 맞음
+        """
+        start = time.perf_counter()
+        prefix = list(group[0].prefix)
+        suffix_length = max(request.suffix_length for request in group)
+        pad_token_id = self.tokenizer.pad_token_id
+
+        rows, masks = [], []
+        for request in group:
+            suffix = request.input_ids[len(prefix):]
+            padding = suffix_length - len(suffix)
+            rows.append(prefix + [pad_token_id] * padding + suffix)
+            masks.append([1] * len(prefix) + [0] * padding + [1] * len(suffix))
+        input_ids = torch.tensor(rows, device=self.model.device)
+        attention_mask = torch.tensor(masks, device=self.model.device)
+
+        output = self.model.generate(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            past_key_values=past_key_values,
+            pad_token_id=pad_token_id,
+            **group[0].gen_kwargs
+        )
+        for request, tokens in zip(group, output[:, input_ids.shape[1]:]):
+            self._finish(request, tokens)
+
+        self.stats_counter["batches"] += 1
+        self.stats_counter["padding_tokens"] += int((attention_mask == 0).sum())
+        self.stats_counter["generate_seconds"] += time.perf_counter() - start
+
+    @torch.inference_mode()
+    def _generate_batch(self, group: List[GenerationRequest]):
+        start = time.perf_counter()
+        encoded = self.tokenizer.pad(
+            {"input_ids": [request.input_ids for request in group]},
+            padding=True,
+            return_tensors="pt"
+        ).to(self.model.device)
+
+        output = self.model.generate(
+            **encoded,
+            pad_token_id=self.tokenizer.pad_token_id,
+            **group[0].gen_kwargs
+        )
+
+        # 입력 부분을 제외한 새로 생성된 토큰만 디코딩
+        input_length = encoded["input_ids"].shape[1]
+        new_tokens = output[:, input_length:]
+        for request, tokens in zip(group, new_tokens):
+            self._finish(request, tokens)
+
+        self.stats_counter["batches"] += 1
+        self.stats_counter["padding_tokens"] += int((encoded["attention_mask"] == 0).sum())
+        self.stats_counter["generate_seconds"] += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        batches = self.stats_counter["batches"]
+        seconds = self.stats_counter["generate_seconds"]
+        return {
+            **self.stats_counter,
+            "generate_seconds": round(seconds, 2),
+            "avg_batch_size": round(self.stats_counter["requests"] / batches, 2) if batches else 0.0,
+            "tokens_per_sec": round(self.stats_counter["generated_tokens"] / seconds, 2) if seconds else 0.0,
+            "prefix_cache": self.prefix_cache.stats() if self.prefix_cache is not None else None,
+        }
+
+
+def create_generation_engine(model, tokenizer, config: dict) -> BatchedGenerationEngine:
+    """모델 설정("batching", "prefix_cache", "pipeline_kwargs")대로 생성 엔진 구성 (provider/벤치마크 공용)"""
+    from .prefix_cache import PrefixKVCache
+
+    batching = config.get("batching", {})
+    prefix_conf = config.get("prefix_cache", {})
+    prefix_cache = None
+    if prefix_conf.get("enabled"):
+        prefix_cache = PrefixKVCache(
+            model,
+            max_entries=prefix_conf.get("max_entries", 8),
+            min_prefix_tokens=prefix_conf.get("min_prefix_tokens", 64)
+        )
+
+    return BatchedGenerationEngine(
+        model,
+        tokenizer,
+        default_gen_kwargs=config["pipeline_kwargs"],
+        # batching 을 끈 경우에도 prefix 캐시용으로 엔진을 쓰되 요청은 1건씩 처리
+        max_batch_size=batching.get("max_batch_size", 8) if batching.get("enabled") else 1,
+        max_wait_ms=batching.get("max_wait_ms", 10) if batching.get("enabled") else 0,
+        max_padding_ratio=batching.get("max_padding_ratio", 0.3),
+        prefix_cache=prefix_cache
+    )
+
+
+class MicroBatchHuggingFacePipeline(HuggingFacePipeline):
+    """
+    HuggingFacePipeline 대체 - 생성 요청을 BatchedGenerationEngine 으로 보냄
+    (여러 요청이 동시에 들어오면 엔진이 한 번의 forward로 묶어서 처리)
+    """
+    engine: Any = None
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> LLMResult:
+        gen_kwargs = kwargs.get("pipeline_kwargs", {})
+        futures = [self.engine.submit(prompt, stop, **gen_kwargs) for prompt in prompts]
+        return LLMResult(generations=[[Generation(text=future.result())] for future in futures])
+
+    async def _agenerate(self, prompts: List[str], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs) -> LLMResult:
+        gen_kwargs = kwargs.get("pipeline_kwargs", {})
+        texts = await asyncio.gather(*(self.engine.agenerate(prompt, stop, **gen_kwargs) for prompt in prompts))
+        return LLMResult(generations=[[Generation(text=text)] for text in texts])
+
+
+class MicroBatchChatHuggingFace(ChatHuggingFace):
+    """
+    ChatHuggingFace 대체 - 비동기 호출(ainvoke)도 스레드를 점유하지 않고 엔진 결과를 기다림
+    - 배치 생성은 완성된 텍스트 단위로 반환되므로 토큰 스트리밍은 사용하지 않음(disable_streaming)
+    """
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        llm_input = self._to_chat_prompt(messages)
+        llm_result = await self.llm._agenerate(prompts=[llm_input], stop=stop, **kwargs)
+        return self._to_chat_result(llm_result)
@@ -0,0 +1,166 @@
+# services/llm/prefix_cache.py
+import copy
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Set, Tuple
+
+import torch
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def common_prefix_length(a: Tuple[int, ...], b: Tuple[int, ...]) -> int:
+    length = min(len(a), len(b))
+    for i in range(length):
+        if a[i] != b[i]:
+            return i
+    return length
+
+
+class PrefixKVCache:
+    """
+    공통 프롬프트 앞부분(시스템 메시지, few-shot 예시, ReAct 템플릿 등)의 KV 캐시 보관
+    - 서로 다른 요청 min_repeats 개 이상에서 반복된 앞부분(min_prefix_tokens 이상)만 자동으로 찾아 KV를 계산/저장
+      (같은 대화의 다음 단계 프롬프트는 이전 프롬프트를 거의 전부 포함하므로 history 에서 교체 → 반복으로 세지 않음)
+    - 새 요청은 저장된 prefix 중 가장 긴 것을 찾아, 뒤에 붙은 새 토큰만 prefill
+    - 이번 요청으로 새로 계산한 prefix 는 절약이 없으므로 miss(build) 로 집계하고, 다음 요청부터 재사용
+    - 저장 개수는 max_entries 로 제한 (가장 오래 사용하지 않은 prefix부터 삭제, warm() 한 prefix는 삭제하지 않음)
+    - generate가 KV 캐시를 이어서 쓰므로 요청마다 복사본을 넘깁니다. (배치 크기만큼 펼친 복사본)
+    """
+
+    def __init__(self, model, max_entries: int = 8, min_prefix_tokens: int = 64, history_size: int = 32,
+                 min_repeats: int = 2, continuation_slack: int = 8):
+        self.model = model
+        self.max_entries = max_entries
+        self.min_prefix_tokens = min_prefix_tokens
+        self.min_repeats = min_repeats
+        self.continuation_slack = continuation_slack
+
+        self._entries: "OrderedDict[Tuple[int, ...], object]" = OrderedDict()  # prefix 토큰 → KV 캐시
+        self._pinned: Set[Tuple[int, ...]] = set()                              # warm() 한 prefix (LRU 삭제 제외)
+        self._history: Deque[Tuple[int, ...]] = deque(maxlen=history_size)     # 최근 프롬프트 (대화별 최신 1개)
+        self._lock = threading.Lock()
+
+        self.stats_counter = {"hits": 0, "misses": 0, "prefixes_built": 0, "evicted": 0,
+                              "reused_tokens": 0, "prefill_tokens": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- [조회] ---
+    def _longest_cached(self, ids: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        best = None
+        for prefix in self._entries:
+            # 최소 1개 토큰은 새로 prefill 해야 다음 토큰을 예측할 수 있음
+            if len(prefix) < len(ids) and ids[:len(prefix)] == prefix:
+                if best is None or len(prefix) > len(best):
+                    best = prefix
+        return best
+
+    def _remember(self, ids: Tuple[int, ...]) -> List[int]:
+        """
+        history 갱신 후, 다른 요청(대화)들과 겹치는 앞부분 길이 목록 반환
+        - 이전 프롬프트를 끝의 continuation_slack 토큰(생성 프롬프트 꼬리) 외에 모두 포함하면
+          같은 대화의 다음 단계로 보고 교체 (다른 질문은 질문 시작 위치에서 갈라짐)
+        """
+        shared = []
+        for previous in list(self._history):
+            length = common_prefix_length(ids, previous)
+            if length >= len(previous) - self.continuation_slack:
+                self._history.remove(previous)
+            else:
+                shared.append(length)
+        self._history.append(ids)
+        return shared
+
+    def _detect_prefix(self, shared: List[int], ids: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        """다른 요청 min_repeats 개 이상과 공통인 가장 긴 앞부분 (min_prefix_tokens 이상일 때만)"""
+        if len(shared) < self.min_repeats:
+            return None
+        length = min(sorted(shared, reverse=True)[self.min_repeats - 1], len(ids) - 1)
+        return ids[:length] if length >= self.min_prefix_tokens else None
+
+    def _store(self, prefix: Tuple[int, ...]):
+        self._entries[prefix] = self._build(prefix)
+        self.stats_counter["prefixes_built"] += 1
+        while len(self._entries) > self.max_entries:
+            victim = next((key for key in self._entries if key not in self._pinned), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+            self.stats_counter["evicted"] += 1
+
+    def match(self, input_ids: List[int]) -> Optional[Tuple[int, ...]]:
+        """
+        재사용할 prefix (없으면 None)
+        - 저장된 prefix가 없지만 여러 요청에서 반복된 앞부분이 있으면 이번에 계산해서 저장 (이번 요청은 miss)
+        """
+        ids = tuple(input_ids)
+        with self._lock:
+            prefix = self._longest_cached(ids)
+            candidate = self._detect_prefix(self._remember(ids), ids)
+            if candidate is not None and (prefix is None or len(candidate) > len(prefix)):
+                self._store(candidate)
+                prefix = None  # 계산 비용을 이번 요청이 이미 치렀으므로 절약 없음
+
+            if prefix is None:
+                self.stats_counter["misses"] += 1
+                self.stats_counter["prefill_tokens"] += len(ids)
+                return None
+
+            self._entries.move_to_end(prefix)
+            self.stats_counter["hits"] += 1
+            self.stats_counter["reused_tokens"] += len(prefix)
+            self.stats_counter["prefill_tokens"] += len(ids) - len(prefix)
+            return prefix
+
+    def kv_for(self, prefix: Tuple[int, ...], batch_size: int = 1):
+        """prefix KV 복사본 (batch_size 개 요청이 함께 쓰도록 배치 차원으로 펼침, 그 사이 삭제됐으면 None)"""
+        with self._lock:
+            if prefix not in self._entries:
+                return None
+            past_key_values = copy.deepcopy(self._entries[prefix])
+        if batch_size > 1:
+            past_key_values.batch_repeat_interleave(batch_size)
+        return past_key_values
+
+    def lookup(self, input_ids: List[int]):
+        """(prefix 길이, KV 캐시 복사본) 반환, 재사용할 prefix가 없으면 (0, None)"""
+        prefix = self.match(input_ids)
+        past_key_values = self.kv_for(prefix) if prefix is not None else None
+        if past_key_values is None:
+            return 0, None
+        return len(prefix), past_key_values
+
+    def warm(self, input_ids: List[int]):
+        """자주 쓰는 prefix(시스템 프롬프트 등)를 미리 계산해 두기 (LRU 삭제 대상에서 제외)"""
+        prefix = tuple(input_ids)
+        with self._lock:
+            self._pinned.add(prefix)
+            if prefix not in self._entries:
+                self._store(prefix)
+
+    @torch.inference_mode()
+    def _build(self, prefix: Tuple[int, ...]):
+        start = time.perf_counter()
+        input_ids = torch.tensor([prefix], device=self.model.device)
+        past_key_values = self.model(input_ids=input_ids, use_cache=True).past_key_values
+        logger.info(f"[PREFIX CACHE] prefix {len(prefix)} 토큰 KV 계산 ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return past_key_values
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self._history.clear()
+
+    def stats(self) -> dict:
+        lookups = self.stats_counter["hits"] + self.stats_counter["misses"]
+        return {
+            **self.stats_counter,
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "hit_rate": round(self.stats_counter["hits"] / lookups, 4) if lookups else 0.0,
+        }
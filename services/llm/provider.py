@@ -1,11 +1,12 @@
-import torch
 from abc import ABC, abstractmethod
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+from transformers import AutoTokenizer, pipeline
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_huggingface import HuggingFacePipeline, ChatHuggingFace
 from langchain_core.language_models import BaseChatModel
 from common.logger import get_logger
+from .quantization import load_causal_lm
+from .http import get_http_client_pool
 
 logger = get_logger(__name__)
 
@@ -16,6 +17,29 @@ class BaseLLMProvider(ABC):
         """설정(config)을 받아서 LangChain LLM 객체를 반환"""
         pass
 
+def _openai_client_kwargs(config: dict) -> dict:
+    """
+    ChatOpenAI 공통 HTTP 설정 (같은 base_url 이면 프로세스 내 커넥션 풀 공유)
+    - config["http"]: keep-alive / 연결 수 / 타임아웃 / HTTP2 / 재시도 횟수
+    - config["limiter"]: 모델별 동시 호출 한도 + 대기열 (메인/요약 등 같은 모델의 모든 역할에 공통 적용)
+    - config["base_urls"] + config["router"]: 복제 서버 여러 대에 지연 시간 기반 분산/장애 조치
+    """
+    http_conf = config.get("http", {})
+    http_client, http_async_client = get_http_client_pool().get_clients(
+        config.get("base_url"),
+        {k: v for k, v in http_conf.items() if k != "max_retries"},
+        limiter_name=config["model_name"],
+        limiter_conf=config.get("limiter"),
+        base_urls=config.get("base_urls"),
+        router_conf=config.get("router")
+    )
+    return {
+        "http_client": http_client,
+        "http_async_client": http_async_client,
+        "timeout": http_async_client.timeout,
+        "max_retries": http_conf.get("max_retries", 2),
+    }
+
 # 2. [클라우드] OpenAI, Google 등 외부 API 통합
 class CloudLLMProvider(BaseLLMProvider):
     def create_llm(self, config: dict) -> BaseChatModel:
@@ -27,14 +51,19 @@ class CloudLLMProvider(BaseLLMProvider):
             return ChatOpenAI(
                 model=config["model_name"],
                 temperature=config["temperature"],
-                api_key=config["api_key"]
+                api_key=config["api_key"],
+                **_openai_client_kwargs(config)
             )
         
         elif provider_type == "google":
+            # Google SDK는 자체 전송 계층을 사용하므로 타임아웃/재시도만 설정
+            http_conf = config.get("http", {})
             return ChatGoogleGenerativeAI(
                 model=config["model_name"],
                 temperature=config["temperature"],
-                google_api_key=config["api_key"]
+                google_api_key=config["api_key"],
+                timeout=http_conf.get("read_timeout"),
+                max_retries=http_conf.get("max_retries", 2)
             )
         
         else:
@@ -56,17 +85,19 @@ class LocalLLMProvider(BaseLLMProvider):
 
         # (2) 모델 로드
         # config['model_kwargs']에 있는 설정(device_map, torch_dtype 등)을 언팩(**)해서 전달
-        # 주의: torch_dtype이 문자열("float16")로 왔다면 실제 torch 타입으로 변환 필요할 수 있음
-        model_kwargs = config["model_kwargs"].copy()
-        if model_kwargs.get("torch_dtype") == "float16":
-            model_kwargs["torch_dtype"] = torch.float16
-
-        model = AutoModelForCausalLM.from_pretrained(
+        # config['quantization'] 이 있으면 양자화 모델 사용 (변환 결과는 캐시해 두고 재사용)
+        model = load_causal_lm(
             model_path,
-            **model_kwargs
+            config["model_kwargs"],
+            quantization=config.get("quantization")
         )
 
         # (3) 파이프라인 생성
+        # 동시 요청 micro-batching / 공통 prefix KV 캐시 사용 시 엔진 기반 래퍼로 변환
+        batching = config.get("batching", {})
+        if batching.get("enabled") or config.get("prefix_cache", {}).get("enabled"):
+            return self._create_batched_llm(model, tokenizer, config, batching)
+
         pipe = pipeline(
             "text-generation",
             model=model,
@@ -82,6 +113,17 @@ class LocalLLMProvider(BaseLLMProvider):
         logger.info(f"로컬 모델 로딩 완료")
         return ChatHuggingFace(llm=hf_pipeline)
 
+    def _create_batched_llm(self, model, tokenizer, config: dict, batching: dict) -> BaseChatModel:
+        from .local_engine import create_generation_engine, MicroBatchHuggingFacePipeline, MicroBatchChatHuggingFace
+
+        engine = create_generation_engine(model, tokenizer, config)
+        # 파이프라인은 토크나이저/모델 정보 참조용으로만 유지 (실제 생성은 엔진이 담당)
+        pipe = pipeline("text-generation", model=model, tokenizer=tokenizer, return_full_text=False)
+        hf_pipeline = MicroBatchHuggingFacePipeline(pipeline=pipe, engine=engine)
+
+        logger.info(f"로컬 모델 로딩 완료 (micro-batching: 최대 {engine.max_batch_size}건 / {batching.get('max_wait_ms', 10)}ms)")
+        return MicroBatchChatHuggingFace(llm=hf_pipeline, tokenizer=tokenizer, disable_streaming=True)
+
 
 # 4. [클라우드] Hanwha System API LLM
 class APILLMProvider(BaseLLMProvider):
@@ -95,7 +137,8 @@ class APILLMProvider(BaseLLMProvider):
                 base_url=config["base_url"],      # vLLM 주소
                 api_key=config["api_key"],        # API Key
                 model=config["model_name"],       # 타겟 모델명
-                temperature=config["temperature"]         
+                temperature=config["temperature"],
+                **_openai_client_kwargs(config)   # 공유 커넥션 풀 (keep-alive)
             )
         else:
             logger.info(f"지원하지 않는 Cloud Provider: {provider_type}")
@@ -0,0 +1,105 @@
+# services/llm/quantization.py
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import torch
+import transformers
+from transformers import AutoConfig, AutoModelForCausalLM
+from config.settings import setting
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DTYPES = {"float16": torch.float16, "bfloat16": torch.bfloat16, "float32": torch.float32}
+
+
+class QuantizationMode:
+    NONE = None
+    INT8_DYNAMIC = "int8_dynamic"   # torch 동적 양자화 (Linear 가중치 int8, CPU 전용)
+
+
+def _resolve_model_kwargs(model_kwargs: dict, on_cpu: bool) -> dict:
+    """
+    문자열 dtype → torch dtype 변환
+    - CPU에는 fp16 연산 커널이 거의 없어 오히려 느리므로 CPU 실행 시에는 fp32로 바꿈
+    """
+    kwargs = model_kwargs.copy()
+    dtype = kwargs.get("torch_dtype")
+    if isinstance(dtype, str):
+        dtype = _DTYPES.get(dtype, dtype)
+    if on_cpu and dtype in (torch.float16, torch.bfloat16):
+        logger.info(f"[LOCAL LLM] CPU 실행이므로 {dtype} 대신 float32 사용")
+        dtype = torch.float32
+    if dtype is not None:
+        kwargs["torch_dtype"] = dtype
+    return kwargs
+
+
+def _cache_paths(model_path: str, mode: str):
+    cache_dir = setting.CACHE_DIR / "quantized" / Path(model_path).name
+    return cache_dir / f"{mode}.pt", cache_dir / f"{mode}.json"
+
+
+def _cache_signature(model_path: str, mode: str) -> dict:
+    """원본 가중치/라이브러리 버전이 바뀌면 다시 변환하도록 비교하는 값"""
+    weights = sorted(Path(model_path).glob("*.safetensors")) or sorted(Path(model_path).glob("*.bin"))
+    return {
+        "mode": mode,
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "weights": {p.name: os.path.getmtime(p) for p in weights},
+    }
+
+
+def _load_int8_dynamic(model_path: str, model_kwargs: dict) -> torch.nn.Module:
+    """
+    int8 동적 양자화 모델 로드
+    - 최초 1회: fp32 로드 → quantize_dynamic → 모델 전체를 CACHE_DIR/quantized 에 저장
+    - 이후: 저장된 양자화 모델을 바로 로드 (fp32 가중치를 다시 읽지 않음)
+    """
+    cache_file, meta_file = _cache_paths(model_path, QuantizationMode.INT8_DYNAMIC)
+    signature = _cache_signature(model_path, QuantizationMode.INT8_DYNAMIC)
+    trust_remote_code = model_kwargs.get("trust_remote_code", False)
+
+    if cache_file.exists() and meta_file.exists() and json.loads(meta_file.read_text()) == signature:
+        # trust_remote_code 모델은 클래스 정의 모듈이 먼저 등록되어 있어야 역직렬화 가능
+        AutoConfig.from_pretrained(model_path, trust_remote_code=trust_remote_code)
+        logger.info(f"[LOCAL LLM] 저장된 int8 양자화 모델 로드: {cache_file}")
+        return torch.load(cache_file, weights_only=False).eval()
+
+    logger.info(f"[LOCAL LLM] int8 동적 양자화 변환 시작 (최초 1회): {model_path}")
+    start = time.perf_counter()
+    model_kwargs = {**model_kwargs, "device_map": "cpu", "torch_dtype": torch.float32}
+    model = AutoModelForCausalLM.from_pretrained(model_path, **model_kwargs).eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    torch.save(model, tmp_file)
+    os.replace(tmp_file, cache_file)
+    meta_file.write_text(json.dumps(signature))
+    logger.info(f"[LOCAL LLM] int8 양자화 모델 저장 완료 ({time.perf_counter() - start:.1f}초): {cache_file}")
+    return model
+
+
+def load_causal_lm(model_path: str, model_kwargs: dict, quantization: Optional[dict] = None) -> torch.nn.Module:
+    """
+    로컬 CausalLM 로드 (설정의 quantization 항목에 따라 실행 방식 선택)
+    - mode=None: 원본 가중치 (CPU에서는 fp32)
+    - mode="int8_dynamic": CPU int8 동적 양자화 (변환 결과 캐시 재사용)
+    """
+    quantization = quantization or {}
+    mode = quantization.get("mode")
+    if quantization.get("num_threads"):
+        torch.set_num_threads(quantization["num_threads"])
+
+    if mode == QuantizationMode.INT8_DYNAMIC:
+        return _load_int8_dynamic(model_path, _resolve_model_kwargs(model_kwargs, on_cpu=True))
+    if mode is not None:
+        raise ValueError(f"❌ 지원하지 않는 양자화 방식입니다: {mode}")
+
+    on_cpu = not torch.cuda.is_available() or model_kwargs.get("device_map") == "cpu"
+    return AutoModelForCausalLM.from_pretrained(model_path, **_resolve_model_kwargs(model_kwargs, on_cpu))
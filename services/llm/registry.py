@@ -0,0 +1,136 @@
+# services/llm/registry.py
+import gc
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.language_models import BaseChatModel
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def config_identity(conf: dict) -> str:
+    """설정 내용 기반 식별자 (이름이 달라도 설정이 같으면 같은 모델로 취급)"""
+    return hashlib.sha256(repr(sorted(conf.items(), key=lambda item: item[0])).encode("utf-8")).hexdigest()[:16]
+
+
+def _tensor_bytes(value) -> int:
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return value.element_size() * value.nelement()
+    if isinstance(value, (tuple, list)):  # 양자화 Linear의 packed params (weight, bias)
+        return sum(_tensor_bytes(v) for v in value)
+    return 0
+
+
+def estimate_model_bytes(llm: BaseChatModel) -> Optional[int]:
+    """로컬 모델 가중치 메모리 (원격 API 모델은 None)"""
+    pipeline = getattr(getattr(llm, "llm", None), "pipeline", None)
+    model = getattr(pipeline, "model", None)
+    if model is None:
+        return None
+    state = model.state_dict()
+    return sum(_tensor_bytes(value) for value in state.values())
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 LLM 레지스트리
+    - 설정 식별자(config_identity) 별로 객체를 하나만 만들고 모든 사용처(메인 에이전트, 요약 미들웨어 등)가 공유
+    - 처음 요청될 때 생성(로컬 모델은 이때 가중치 로드)
+    - 역할별로 파라미터만 다른 경우(temperature 등) model_copy 로 얇은 view를 만들어 내부 클라이언트/가중치 공유
+      (응답 캐시는 view 의 설정(기본 설정 + overrides)으로 다시 결정 → cache_factory)
+    - unload() 로 명시적 해제, footprint() 로 모델별 메모리 사용량 조회
+    """
+
+    def __init__(self, factory: Callable[[str], BaseChatModel], configs: Dict[str, dict],
+                 cache_factory: Optional[Callable[[str, dict], Optional[BaseCache]]] = None):
+        self.factory = factory
+        self.configs = configs
+        self.cache_factory = cache_factory              # (모델 키, 설정) → 응답 캐시 또는 None
+        self._models: Dict[str, dict] = {}              # identity → {"llm", "keys", "loaded_at", "load_seconds"}
+        self._views: Dict[Tuple[str, tuple], BaseChatModel] = {}
+        self._lock = threading.RLock()
+
+    def _identity(self, model_key: str) -> str:
+        if model_key not in self.configs:
+            raise ValueError(f"❌ 설정 파일(llm_config.py)에 '{model_key}'에 대한 정의가 없습니다.")
+        return config_identity(self.configs[model_key])
+
+    def get(self, model_key: str, **overrides: Any) -> BaseChatModel:
+        """모델 키에 해당하는 공유 객체 (overrides가 있으면 해당 파라미터만 바꾼 view)"""
+        identity = self._identity(model_key)
+        entry = self._models.get(identity)
+        if entry is None:
+            with self._lock:
+                entry = self._models.get(identity)
+                if entry is None:
+                    start = time.perf_counter()
+                    entry = {"llm": self.factory(model_key), "keys": set(), "loaded_at": time.time(),
+                             "load_seconds": round(time.perf_counter() - start, 2)}
+                    self._models[identity] = entry
+                    logger.info(f"[MODEL REGISTRY] 모델 생성: {model_key} ({entry['load_seconds']}초)")
+        entry["keys"].add(model_key)
+
+        if not overrides:
+            return entry["llm"]
+
+        view_key = (identity, tuple(sorted((k, repr(v)) for k, v in overrides.items())))
+        if view_key not in self._views:
+            with self._lock:
+                if view_key not in self._views:
+                    update = dict(overrides)
+                    # 기본 객체의 캐시를 그대로 물려받지 않도록 합친 설정(temperature 등)으로 다시 결정
+                    if self.cache_factory is not None and "cache" not in update:
+                        update["cache"] = self.cache_factory(model_key, {**self.configs[model_key], **overrides})
+                    self._views[view_key] = entry["llm"].model_copy(update=update)
+        return self._views[view_key]
+
+    def is_loaded(self, model_key: str) -> bool:
+        return self._identity(model_key) in self._models
+
+    def unload(self, model_key: str) -> bool:
+        """모델과 관련 view 해제 (로컬 모델은 엔진 스레드 종료 후 메모리 반환)"""
+        identity = self._identity(model_key)
+        with self._lock:
+            entry = self._models.pop(identity, None)
+            for view_key in [key for key in self._views if key[0] == identity]:
+                del self._views[view_key]
+        if entry is None:
+            return False
+
+        engine = getattr(getattr(entry["llm"], "llm", None), "engine", None)
+        if engine is not None:
+            engine.close()
+        del entry
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        logger.info(f"[MODEL REGISTRY] 모델 해제: {model_key}")
+        return True
+
+    def footprint(self) -> Dict[str, dict]:
+        """생성된 모델별 메모리 사용량 / 사용처 정보"""
+        with self._lock:
+            items = list(self._models.items())
+            view_counts = {}
+            for identity, _ in self._views:
+                view_counts[identity] = view_counts.get(identity, 0) + 1
+        report = {}
+        for identity, entry in items:
+            model_bytes = estimate_model_bytes(entry["llm"])
+            report[identity] = {
+                "model_keys": sorted(entry["keys"]),
+                "type": type(entry["llm"]).__name__,
+                "weights_mb": round(model_bytes / 1024 / 1024, 1) if model_bytes is not None else None,
+                "views": view_counts.get(identity, 0),
+                "load_seconds": entry["load_seconds"],
+                "loaded_at": entry["loaded_at"],
+            }
+        return report
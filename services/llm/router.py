@@ -0,0 +1,311 @@
+# services/llm/router.py
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+import httpx
+from common.logger import get_logger
+from .limiter import ReleasingStream, AsyncReleasingStream, call_once
+
+logger = get_logger(__name__)
+
+# 다른 복제 서버로 다시 보낼 응답 코드 (서버/게이트웨이 장애)
+RETRY_STATUS = {502, 503, 504}
+# 요청이 서버에 닿지 못했거나 응답이 오지 않은 경우
+RETRY_ERRORS = (httpx.TransportError,)
+# 재시도해도 부작용이 없는 요청 (LLM 생성/임베딩 POST는 상태를 바꾸지 않음)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+IDEMPOTENT_PATHS = ("/chat/completions", "/completions", "/embeddings")
+
+
+class Endpoint:
+    """복제 서버 1개의 상태 (지연 EWMA, 진행 중 요청 수, 연속 실패, 격리 시각)"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.ewma_latency: Optional[float] = None
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.stats_counter = {"requests": 0, "errors": 0, "ejections": 0}
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def score(self) -> float:
+        # 측정값이 없는 서버는 0 → 먼저 시도해 지연 시간을 학습
+        return (self.ewma_latency or 0.0) * (self.in_flight + 1)
+
+    def stats(self, now: float) -> dict:
+        return {
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "ejected_for": round(self.ejected_until - now, 1) if self.is_ejected(now) else 0,
+            **self.stats_counter,
+        }
+
+
+class EndpointRouter:
+    """
+    같은 모델을 서빙하는 여러 복제 서버(vLLM 등) 사이의 지연 시간 기반 라우팅
+    - 선택: EWMA 지연 × (진행 중 요청 + 1) 이 가장 작은 서버
+    - 격리: eject_after 번 연속 실패하면 cooldown 초 동안 제외 (모두 격리되면 가장 먼저 풀릴 서버로 시도)
+    - 재시도: 연결 실패/타임아웃/502·503·504 는 다른 서버로 최대 max_attempts 번까지
+    - hedge: 첫 응답이 최근 p95 지연(최소 hedge_min_delay)을 넘기면 다른 서버에도 보내고 먼저 온 응답 사용
+    """
+
+    def __init__(self, name: str, base_urls: List[str], ewma_alpha: float = 0.3,
+                 eject_after: int = 3, cooldown: float = 30.0, max_attempts: int = 2,
+                 hedge: bool = False, hedge_min_delay: float = 2.0, latency_window: int = 200):
+        self.name = name
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.ewma_alpha = ewma_alpha
+        self.eject_after = eject_after
+        self.cooldown = cooldown
+        self.max_attempts = max(1, min(max_attempts, len(self.endpoints)))
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+
+        self._latencies: Deque[float] = deque(maxlen=latency_window)  # hedge 지연 계산용 (p95)
+        self._lock = threading.Lock()
+        self.stats_counter = {"retries": 0, "hedged": 0, "hedge_wins": 0, "fail_open": 0}
+
+    def pick(self, exclude: Optional[Set[str]] = None) -> Optional[Endpoint]:
+        """요청을 보낼 서버 선택 (선택된 서버의 진행 중 요청 수 +1)"""
+        exclude = exclude or set()
+        now = time.monotonic()
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if ep.url not in exclude]
+            healthy = [ep for ep in candidates if not ep.is_ejected(now)]
+            if healthy:
+                endpoint = min(healthy, key=Endpoint.score)
+            elif candidates:
+                # 모든 서버가 격리 중이면 요청을 버리지 않고 가장 먼저 풀릴 서버로 시도
+                endpoint = min(candidates, key=lambda ep: ep.ejected_until)
+                self.stats_counter["fail_open"] += 1
+            else:
+                return None
+            endpoint.in_flight += 1
+            endpoint.stats_counter["requests"] += 1
+            return endpoint
+
+    def record(self, endpoint: Endpoint, latency: Optional[float], ok: bool):
+        """응답 결과 반영 - 성공이면 지연 EWMA 갱신, 실패가 이어지면 격리"""
+        with self._lock:
+            if ok:
+                endpoint.failures = 0
+                if latency is not None:
+                    if endpoint.ewma_latency is None:
+                        endpoint.ewma_latency = latency
+                    else:
+                        endpoint.ewma_latency += (latency - endpoint.ewma_latency) * self.ewma_alpha
+                    self._latencies.append(latency)
+                return
+
+            endpoint.failures += 1
+            endpoint.stats_counter["errors"] += 1
+            if endpoint.failures >= self.eject_after:
+                endpoint.ejected_until = time.monotonic() + self.cooldown
+                endpoint.stats_counter["ejections"] += 1
+                logger.warning(f"[LLM ROUTER] {self.name}: {endpoint.url} 격리 "
+                               f"(연속 실패 {endpoint.failures}회, {self.cooldown}초)")
+
+    def done(self, endpoint: Endpoint):
+        """응답 본문까지 끝난 요청 정리 (진행 중 요청 수 -1)"""
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return self.hedge_min_delay
+        return max(self.hedge_min_delay, latencies[max(0, int(len(latencies) * 0.95) - 1)])
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "endpoints": {ep.url: ep.stats(now) for ep in self.endpoints},
+                **self.stats_counter,
+            }
+
+
+def _is_idempotent(request: httpx.Request) -> bool:
+    return request.method in IDEMPOTENT_METHODS or request.url.path.rstrip("/").endswith(IDEMPOTENT_PATHS)
+
+
+class _RoutingBase:
+    def __init__(self, inner, router: EndpointRouter, primary_url: str):
+        self.inner = inner
+        self.router = router
+        self.primary_url = primary_url.rstrip("/")
+
+    def _route(self, request: httpx.Request, endpoint: Endpoint) -> httpx.Request:
+        """클라이언트의 base_url(primary) 부분을 선택된 서버 주소로 교체"""
+        url = str(request.url)
+        if url.startswith(self.primary_url):
+            url = endpoint.url + url[len(self.primary_url):]
+        # Host 헤더는 새 주소 기준으로 다시 계산
+        headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"host"]
+        return httpx.Request(request.method, url, headers=headers, content=request.content,
+                             extensions=request.extensions)
+
+    def _attempts(self, request: httpx.Request) -> int:
+        return self.router.max_attempts if _is_idempotent(request) else 1
+
+
+class RoutingTransport(_RoutingBase, httpx.BaseTransport):
+    """여러 복제 서버로 요청을 분산/재시도하는 httpx 전송 계층 (동기)"""
+
+    def _send(self, endpoint: Endpoint, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = self.inner.handle_request(self._route(request, endpoint))
+        except BaseException:
+            self.router.record(endpoint, None, ok=False)
+            self.router.done(endpoint)
+            raise
+        self.router.record(endpoint, time.perf_counter() - start, ok=response.status_code not in RETRY_STATUS)
+        release = call_once(lambda: self.router.done(endpoint))
+        return httpx.Response(response.status_code, headers=response.headers,
+                              stream=ReleasingStream(response.stream, release),
+                              extensions=response.extensions, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()  # 재전송을 위해 본문을 메모리에 보관
+        tried: Set[str] = set()
+        response, error = None, None
+        for attempt in range(self._attempts(request)):
+            endpoint = self.router.pick(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.url)
+            if attempt > 0:
+                self.router.stats_counter["retries"] += 1
+                if response is not None:
+                    response.close()
+            response, error = None, None
+            try:
+                response = self._send(endpoint, request)
+            except RETRY_ERRORS as e:
+                error = e
+                continue
+            if response.status_code not in RETRY_STATUS:
+                return response
+        if response is not None:
+            return response
+        raise error or httpx.ConnectError(f"[{self.router.name}] 사용 가능한 LLM 서버가 없습니다", request=request)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncRoutingTransport(_RoutingBase, httpx.AsyncBaseTransport):
+    """여러 복제 서버로 요청을 분산/재시도/hedge 하는 httpx 전송 계층 (비동기)"""
+
+    async def _send(self, endpoint: Endpoint, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(self._route(request, endpoint))
+        except BaseException as e:
+            # hedge 패자 취소(CancelledError)는 서버 실패가 아님
+            if not isinstance(e, asyncio.CancelledError):
+                self.router.record(endpoint, None, ok=False)
+            self.router.done(endpoint)
+            raise
+        self.router.record(endpoint, time.perf_counter() - start, ok=response.status_code not in RETRY_STATUS)
+        release = call_once(lambda: self.router.done(endpoint))
+        return httpx.Response(response.status_code, headers=response.headers,
+                              stream=AsyncReleasingStream(response.stream, release),
+                              extensions=response.extensions, request=request)
+
+    async def _hedged(self, endpoint: Endpoint, request: httpx.Request, tried: Set[str]) -> httpx.Response:
+        """첫 서버 응답이 hedge 지연을 넘기면 다른 서버에도 보내고 먼저 성공한 응답 사용"""
+        first = asyncio.ensure_future(self._send(endpoint, request))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.router.hedge_delay())
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        backup = self.router.pick(exclude=tried)
+        if backup is None:
+            return await first
+        tried.add(backup.url)
+        self.router.stats_counter["hedged"] += 1
+        second = asyncio.ensure_future(self._send(backup, request))
+
+        # 1. 먼저 정상 응답을 준 쪽을 채택 (한쪽이 실패하면 나머지를 기다림)
+        winner, pending = None, {first, second}
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if not task.exception()
+                               and task.result().status_code not in RETRY_STATUS), None)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # 2. 둘 다 실패하면 늦게 끝난 쪽 결과를 그대로 사용 (바깥 재시도 루프가 처리)
+        if winner is None:
+            winner = second if not second.exception() or first.exception() else first
+        if winner is second:
+            self.router.stats_counter["hedge_wins"] += 1
+
+        # 3. 채택되지 않은 응답은 연결 반환
+        loser = first if winner is second else second
+        if loser.done() and not loser.cancelled() and not loser.exception():
+            await loser.result().aclose()
+        return winner.result()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        attempts = self._attempts(request)
+        tried: Set[str] = set()
+        response, error = None, None
+        for attempt in range(attempts):
+            endpoint = self.router.pick(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.url)
+            if attempt > 0:
+                self.router.stats_counter["retries"] += 1
+                if response is not None:
+                    await response.aclose()
+            response, error = None, None
+            try:
+                if attempt == 0 and self.router.hedge and attempts > 1:
+                    response = await self._hedged(endpoint, request, tried)
+                else:
+                    response = await self._send(endpoint, request)
+            except RETRY_ERRORS as e:
+                error = e
+                continue
+            if response.status_code not in RETRY_STATUS:
+                return response
+        if response is not None:
+            return response
+        raise error or httpx.ConnectError(f"[{self.router.name}] 사용 가능한 LLM 서버가 없습니다", request=request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+# 모델별 라우터 (이름 → router)
+_routers: Dict[str, EndpointRouter] = {}
+_routers_lock = threading.Lock()
+
+def get_router(name: str, base_urls: List[str], router_conf: dict) -> EndpointRouter:
+    with _routers_lock:
+        if name not in _routers:
+            _routers[name] = EndpointRouter(name, base_urls, **router_conf)
+        return _routers[name]
+
+def get_router_stats() -> dict:
+    return {name: router.stats() for name, router in _routers.items()}
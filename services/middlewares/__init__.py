@@ -1,13 +1,13 @@
 from .middleware_llm import summarization_middleware
 
 from .base_middleware import *
-from .pii_detection import *
-from .message_middleware import *
+from .guardrail_middleware import guardrail_middleware
+from .context_middleware import context_budget_middleware
 
 def get_all_middleware():
     return [*get_middleware_llm(),
             *get_base_middleware(),
-            *get_PII_middleware(),
+            *get_guardrail_middleware(),
             *get_message_middleware()
             ]
     
@@ -23,21 +23,16 @@ def get_base_middleware():
         #toolcall_limiter()
     ]
 
-def get_PII_middleware():
-    """에이전트가 사용할 PII= Middleware 를 반환합니다."""
+def get_guardrail_middleware():
+    """PII(email/card/api key) + 보안 금칙어 + 응답 검증 통합 Middleware 를 반환합니다."""
     return [
-        email_detection(),
-        card_detection(),
-        api_detection()
+        guardrail_middleware()
     ]
     
 
 def get_message_middleware():
-    """메세지 trim 및 delete 처리 및 securty, 종료"""
+    """토큰 예산 기반 이력 관리"""
     return [
-        trim_messages,
-        delete_old_messages,
-        check_security,
-        validate_response
+        context_budget_middleware()
     ]
     
\ No newline at end of file
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, List, Optional, Tuple
+
+from langchain.agents import AgentState
+from langchain.agents.middleware import AgentMiddleware
+from langchain.messages import HumanMessage, RemoveMessage
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, get_buffer_string
+from langgraph.config import get_config
+from langgraph.runtime import Runtime
+
+from common.logger import get_logger
+from .context_middleware import get_token_counter
+
+logger = get_logger(__name__)
+
+SUMMARY_PREFIX = "[이전 대화 요약]\n"
+
+# 요약 결과: (요약한 메시지 id 목록, 요약문)
+SummaryResult = Tuple[List[str], str]
+
+
+def _thread_id() -> Optional[str]:
+    try:
+        thread_id = get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:  # 그래프 실행 밖 (checkpointer 없이 직접 호출)
+        return None
+    return str(thread_id) if thread_id is not None else None
+
+
+class BackgroundSummarizationMiddleware(AgentMiddleware):
+    """
+    대화 이력 요약을 응답 경로 밖(백그라운드)에서 수행하는 미들웨어
+    - 실행 종료 후(after_agent): 이력이 max_tokens_before_summary 를 넘으면 최근 messages_to_keep 개를 제외한
+      앞부분 요약을 백그라운드 작업으로 등록 (thread_id 별 1개)
+    - 다음 턴 모델 호출 전(before_model): 완료된 요약이 있으면 적용
+      (요약한 첫 메시지 id 를 요약 메시지로 교체 + 나머지 RemoveMessage → 전체 재작성 없음)
+    - 동기 fallback: 이력이 max_tokens_before_sync 를 넘었는데 적용할 요약이 없으면 그 자리에서 요약
+      (진행 중인 백그라운드 작업이 있으면 그 결과를 기다려 사용)
+    """
+
+    def __init__(self, model: BaseChatModel, summary_prompt: str, max_tokens_before_summary: int = 4000,
+                 max_tokens_before_sync: int = 7000, messages_to_keep: int = 20, max_threads: int = 1000,
+                 max_workers: int = 2):
+        super().__init__()
+        self.model = model
+        self.summary_prompt = summary_prompt
+        self.max_tokens_before_summary = max_tokens_before_summary
+        self.max_tokens_before_sync = max_tokens_before_sync
+        self.messages_to_keep = messages_to_keep
+        self.max_threads = max_threads
+        self.counter = get_token_counter()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary")
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()  # thread_id → 요약 작업 (완료 후 다음 턴에 적용)
+        self._lock = threading.Lock()
+        self.stats_counter = {"scheduled": 0, "applied": 0, "sync_fallback": 0, "discarded": 0, "failed": 0}
+
+    # --- [요약 대상 선택 / 요약] ---
+    def _cut_index(self, messages: List[BaseMessage]) -> Optional[int]:
+        """최근 messages_to_keep 개를 남기되, 남는 구간이 사용자 메시지로 시작하도록 (도구 호출/결과 짝 유지)"""
+        cut = len(messages) - self.messages_to_keep
+        while cut > 0 and not isinstance(messages[cut], HumanMessage):
+            cut -= 1
+        return cut if cut > 1 else None
+
+    def _summary_request(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        transcript = get_buffer_string(messages)
+        return [HumanMessage(content=f"{self.summary_prompt}\n\n<대화>\n{transcript}\n</대화>")]
+
+    def _summarize(self, messages: List[BaseMessage]) -> SummaryResult:
+        response = self.model.invoke(self._summary_request(messages))
+        return [m.id for m in messages if m.id], str(response.content).strip()
+
+    async def _asummarize(self, messages: List[BaseMessage]) -> SummaryResult:
+        response = await self.model.ainvoke(self._summary_request(messages))
+        return [m.id for m in messages if m.id], str(response.content).strip()
+
+    def _apply(self, messages: List[BaseMessage], result: SummaryResult) -> dict[str, Any] | None:
+        covered_ids, summary = result
+        covered = set(covered_ids)
+        present = [m for m in messages if m.id in covered]
+        if not present or not summary:
+            self.stats_counter["discarded"] += 1
+            return None
+        self.stats_counter["applied"] += 1
+        logger.info(f"[SUMMARY] 요약 적용: 메시지 {len(present)}개 → 1개")
+        return {"messages": [
+            HumanMessage(content=SUMMARY_PREFIX + summary, id=present[0].id),  # 같은 id 교체 (위치 유지)
+            *[RemoveMessage(id=m.id) for m in present[1:]],
+        ]}
+
+    def _pop_job(self, thread_id: str) -> Optional[Future]:
+        with self._lock:
+            return self._jobs.pop(thread_id, None)
+
+    def _total_tokens(self, messages: List[BaseMessage]) -> int:
+        return sum(self.counter.count(message) for message in messages)
+
+    def _apply_job(self, messages: List[BaseMessage], job: Future) -> dict[str, Any] | None:
+        """완료된 요약 작업 결과 적용 (실패/버려진 경우 None)"""
+        try:
+            return self._apply(messages, job.result())
+        except Exception as e:
+            self.stats_counter["failed"] += 1
+            logger.warning(f"[SUMMARY] 백그라운드 요약 실패: {e}")
+            return None
+
+    def _apply_finished(self, thread_id: Optional[str],
+                        messages: List[BaseMessage]) -> Tuple[dict[str, Any] | None, Optional[Future]]:
+        """
+        1단계: 완료된 백그라운드 요약 적용 → (state 변경, 아직 진행 중인 작업)
+        요약 대상이 이미 지워져 결과가 버려지면 변경 없음 → 호출 측이 초과 검사로 진행
+        """
+        job = self._jobs.get(thread_id) if thread_id else None
+        if job is None or not job.done():
+            return None, job
+        self._pop_job(thread_id)
+        return self._apply_job(messages, job), None
+
+    # --- [훅] ---
+    # invoke 용 동기 훅과 ainvoke/astream 용 비동기 훅 (비동기 훅은 요약 대기/동기 요약 중에도 이벤트 루프를 막지 않음)
+    def before_model(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        thread_id = _thread_id()
+        messages = state["messages"]
+
+        # 1. 완료된 백그라운드 요약 적용
+        update, job = self._apply_finished(thread_id, messages)
+        if update is not None:
+            return update
+
+        # 2. 컨텍스트가 넘칠 상황이면 동기 요약 (진행 중 작업이 있으면 그 결과 사용)
+        if self._total_tokens(messages) < self.max_tokens_before_sync:
+            return None
+        self.stats_counter["sync_fallback"] += 1
+        if job is not None:
+            self._pop_job(thread_id)
+            wait([job])  # 결과가 나올 때까지 대기 (invoke 호출 - 스레드 블로킹)
+            update = self._apply_job(messages, job)
+            if update is not None:
+                return update
+        cut = self._cut_index(messages)
+        if cut is None:
+            return None
+        logger.info(f"[SUMMARY] 동기 요약 실행 (thread={thread_id})")
+        return self._apply(messages, self._summarize(list(messages[:cut])))
+
+    async def abefore_model(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        thread_id = _thread_id()
+        messages = state["messages"]
+
+        # 1. 완료된 백그라운드 요약 적용
+        update, job = self._apply_finished(thread_id, messages)
+        if update is not None:
+            return update
+
+        # 2. 컨텍스트가 넘칠 상황이면 요약 (진행 중 작업은 await 로 대기, 없으면 ainvoke 로 요약)
+        if self._total_tokens(messages) < self.max_tokens_before_sync:
+            return None
+        self.stats_counter["sync_fallback"] += 1
+        if job is not None:
+            self._pop_job(thread_id)
+            try:
+                update = self._apply(messages, await asyncio.wrap_future(job))
+                if update is not None:
+                    return update
+            except Exception as e:
+                self.stats_counter["failed"] += 1
+                logger.warning(f"[SUMMARY] 백그라운드 요약 실패 → 동기 요약: {e}")
+        cut = self._cut_index(messages)
+        if cut is None:
+            return None
+        logger.info(f"[SUMMARY] 동기 요약 실행 (thread={thread_id})")
+        return self._apply(messages, await self._asummarize(list(messages[:cut])))
+
+    def after_agent(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        thread_id = _thread_id()
+        if thread_id is None or thread_id in self._jobs:
+            return None
+        messages = state["messages"]
+        if self._total_tokens(messages) < self.max_tokens_before_summary:
+            return None
+        cut = self._cut_index(messages)
+        if cut is None:
+            return None
+
+        with self._lock:
+            if thread_id in self._jobs:
+                return None
+            self._jobs[thread_id] = self._executor.submit(self._summarize, list(messages[:cut]))
+            while len(self._jobs) > self.max_threads:  # 오래 돌아오지 않는 대화의 작업 정리
+                _, stale = self._jobs.popitem(last=False)
+                stale.cancel()
+            self.stats_counter["scheduled"] += 1
+        logger.info(f"[SUMMARY] 백그라운드 요약 등록 (thread={thread_id}, 메시지 {cut}개)")
+        return None
+
+    async def aafter_agent(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        # 작업 등록만 하므로 (토큰 수는 캐시) 동기 훅 그대로 사용
+        return self.after_agent(state, runtime)
+
+    def stats(self) -> dict:
+        return {"pending": len(self._jobs), **self.stats_counter}
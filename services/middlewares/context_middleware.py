@@ -0,0 +1,222 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.agents import AgentState
+from langchain.agents.middleware import AgentMiddleware
+from langchain.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langchain_core.messages import BaseMessage
+from langgraph.runtime import Runtime
+
+from config import llm_configs, ACTIVE_MODEL
+from config.llm_config import LLM_CONTEXT_DEFAULT
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 메시지마다 붙는 역할/구분자 토큰 (chat 포맷 근사값)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# 현재 턴이 예산을 넘을 때 이전 도구 결과를 대신하는 문구
+COMPACTED_TOOL_RESULT = "(이전 도구 결과 생략 - {tokens} 토큰, 필요하면 도구를 다시 호출하세요)"
+
+
+def _message_text(message: BaseMessage) -> str:
+    """토큰 수 계산용 문자열 (본문 + 도구 호출 인자)"""
+    content = message.content if isinstance(message.content, str) \
+        else json.dumps(message.content, ensure_ascii=False)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        content += json.dumps([(call["name"], call["args"]) for call in tool_calls], ensure_ascii=False)
+    return content
+
+
+class MessageTokenCounter:
+    """
+    메시지별 토큰 수 계산 + 캐시
+    - 캐시 키: (메시지 id, 본문 hash) → 이미 센 메시지는 다시 토큰화하지 않고, 본문이 바뀐 경우(PII 마스킹 등)만 다시 계산
+    - 토크나이저는 처음 사용할 때 로드 (tiktoken / 로컬 모델 토크나이저, 둘 다 안 되면 글자 수 근사)
+    """
+
+    def __init__(self, context_conf: dict, model_path: Optional[str] = None):
+        self.context_conf = context_conf
+        self.model_path = model_path
+        self.cache_size = context_conf.get("cache_size", 10000)
+        self._encode: Optional[Callable[[str], int]] = None
+        self._cache: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()  # 여러 요청/미들웨어가 같은 카운터 공유
+        self.stats_counter = {"hits": 0, "tokenized": 0}
+
+    def _load_encoder(self) -> Callable[[str], int]:
+        if self.context_conf.get("tokenizer") == "model" and self.model_path:
+            try:
+                from transformers import AutoTokenizer
+                tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+                return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+            except Exception as e:
+                logger.warning(f"[CONTEXT] 모델 토크나이저 로드 실패 → tiktoken 사용: {e}")
+        try:
+            import tiktoken
+            encoding = tiktoken.get_encoding(self.context_conf.get("encoding", "o200k_base"))
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception as e:
+            logger.warning(f"[CONTEXT] tiktoken 사용 불가 → 글자 수로 근사: {e}")
+            return lambda text: len(text) // 2 + 1
+
+    def count(self, message: BaseMessage) -> int:
+        text = _message_text(message)
+        key = (message.id, hash(text)) if message.id else None
+        if key is not None:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.stats_counter["hits"] += 1
+                    return self._cache[key]
+
+        if self._encode is None:
+            self._encode = self._load_encoder()
+        tokens = self._encode(text) + MESSAGE_OVERHEAD_TOKENS
+        self.stats_counter["tokenized"] += 1
+        if key is not None:
+            with self._lock:
+                self._cache[key] = tokens
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return tokens
+
+    def forget(self, message_ids: set):
+        """삭제된 메시지 캐시 정리"""
+        with self._lock:
+            for key in [key for key in self._cache if key[0] in message_ids]:
+                del self._cache[key]
+
+
+# 모델별 공유 카운터 (컨텍스트 예산 / 요약 미들웨어가 같은 캐시 사용)
+_token_counters: Dict[str, MessageTokenCounter] = {}
+_token_counters_lock = threading.Lock()
+
+def get_token_counter(model_key: str = ACTIVE_MODEL) -> MessageTokenCounter:
+    with _token_counters_lock:
+        if model_key not in _token_counters:
+            model_conf = llm_configs[model_key]
+            model_path = model_conf.get("model_path")
+            _token_counters[model_key] = MessageTokenCounter({**LLM_CONTEXT_DEFAULT, **model_conf.get("context", {})},
+                                                             str(model_path) if model_path else None)
+        return _token_counters[model_key]
+
+
+def _group_units(messages: List[BaseMessage]) -> List[List[int]]:
+    """
+    메시지를 함께 남기거나 지울 단위로 묶기
+    - 도구 호출 AIMessage + 그 결과 ToolMessage 들은 한 단위 (짝이 깨지면 모델 API 오류)
+    - 호출 메시지 없이 남은 ToolMessage 는 단독 단위 (잘라낼 때 함께 제거)
+    """
+    units: List[List[int]] = []
+    open_call_ids: set = set()
+    for idx, message in enumerate(messages):
+        if isinstance(message, ToolMessage) and message.tool_call_id in open_call_ids:
+            units[-1].append(idx)
+            continue
+        units.append([idx])
+        open_call_ids = {call["id"] for call in message.tool_calls} \
+            if isinstance(message, AIMessage) and message.tool_calls else set()
+    return units
+
+
+class ContextBudgetMiddleware(AgentMiddleware):
+    """
+    대화 이력을 모델별 토큰 예산 안으로 유지하는 미들웨어 (모델 호출 전)
+    - 예산 이하: 아무 변경 없음 (state/체크포인트 변경 없음)
+    - 예산 초과: 오래된 메시지부터 target_ratio 까지 RemoveMessage 로 삭제 (남는 메시지는 다시 쓰지 않음)
+    - 고정: 앞쪽 SystemMessage, keep_first 이면 첫 메시지(요약/초기 지시), 현재 턴(마지막 HumanMessage 부터 끝까지)
+    - 현재 턴만으로도 예산을 넘으면 현재 턴의 이전 도구 결과를 짧은 문구로 교체 (같은 id → 해당 메시지만 교체)
+    """
+
+    def __init__(self, model_key: str = ACTIVE_MODEL):
+        super().__init__()
+        model_conf = llm_configs[model_key]
+        self.context_conf = {**LLM_CONTEXT_DEFAULT, **model_conf.get("context", {})}
+        self.max_tokens = self.context_conf["max_history_tokens"]
+        self.target_tokens = int(self.max_tokens * self.context_conf["target_ratio"])
+        self.counter = get_token_counter(model_key)
+
+    def _pinned_count(self, messages: List[BaseMessage]) -> int:
+        pinned = 0
+        while pinned < len(messages) and isinstance(messages[pinned], SystemMessage):
+            pinned += 1
+        if self.context_conf.get("keep_first") and pinned < len(messages) \
+                and not isinstance(messages[pinned], (AIMessage, ToolMessage)):
+            pinned += 1
+        return pinned
+
+    @staticmethod
+    def _turn_start(messages: List[BaseMessage], pinned: int) -> int:
+        """현재 턴 시작 위치 - 마지막 HumanMessage (없으면 가장 최근 단위)"""
+        for idx in range(len(messages) - 1, pinned - 1, -1):
+            if isinstance(messages[idx], HumanMessage):
+                return idx
+        units = _group_units(messages[pinned:])
+        return pinned + units[-1][0]
+
+    def before_model(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        messages = state["messages"]
+        counts = [self.counter.count(message) for message in messages]
+        total = sum(counts)
+        if total <= self.max_tokens:
+            return None
+
+        # 1. 고정 메시지 + 현재 턴은 항상 유지, 그 앞의 이전 턴은 최신 단위부터 목표 크기까지 채우기
+        pinned = self._pinned_count(messages)
+        if pinned >= len(messages):
+            return None
+        turn_start = self._turn_start(messages, pinned)
+        units = _group_units(messages[pinned:turn_start])
+        kept_tokens = sum(counts[:pinned]) + sum(counts[turn_start:])
+        first_kept_unit = len(units)
+        for unit_idx in range(len(units) - 1, -1, -1):
+            unit_tokens = sum(counts[pinned + idx] for idx in units[unit_idx])
+            if kept_tokens + unit_tokens > self.target_tokens:
+                break
+            kept_tokens += unit_tokens
+            first_kept_unit = unit_idx
+
+        # 2. 남는 구간이 결과만 남은 ToolMessage 로 시작하지 않도록 정리
+        while first_kept_unit < len(units) and isinstance(messages[pinned + units[first_kept_unit][0]], ToolMessage):
+            kept_tokens -= sum(counts[pinned + idx] for idx in units[first_kept_unit])
+            first_kept_unit += 1
+
+        # 3. 현재 턴만으로도 예산 초과 → 현재 턴의 이전 도구 결과부터 요약 문구로 교체 (가장 최근 단위는 유지)
+        compacted = []
+        if kept_tokens > self.max_tokens:
+            turn_units = _group_units(messages[turn_start:])
+            for unit in turn_units[:-1]:
+                for idx in unit:
+                    message = messages[turn_start + idx]
+                    if kept_tokens <= self.target_tokens:
+                        break
+                    if not isinstance(message, ToolMessage) or not message.id:
+                        continue
+                    placeholder = ToolMessage(
+                        content=COMPACTED_TOOL_RESULT.format(tokens=counts[turn_start + idx]),
+                        tool_call_id=message.tool_call_id, name=message.name, id=message.id,
+                    )
+                    kept_tokens -= counts[turn_start + idx] - self.counter.count(placeholder)
+                    compacted.append(placeholder)
+
+        # 4. 잘려나간 메시지만 삭제 (id 없는 메시지는 삭제 불가 → 유지)
+        removed = [pinned + idx for unit in units[:first_kept_unit] for idx in unit if messages[pinned + idx].id]
+        if not removed and not compacted:
+            return None
+        self.counter.forget({messages[idx].id for idx in removed})
+        logger.info(f"[CONTEXT] 이력 {total} → {kept_tokens} 토큰 "
+                    f"(메시지 {len(removed)}개 삭제, 도구 결과 {len(compacted)}개 생략, 예산 {self.max_tokens})")
+        return {"messages": [RemoveMessage(id=messages[idx].id) for idx in removed] + compacted}
+
+
+def context_budget_middleware(model_key: str = ACTIVE_MODEL):
+    '''
+    모델별 토큰 예산(llm_configs 의 "context")에 맞게 대화 이력 유지
+    메시지별 토큰 수는 캐시되어 매 턴 새 메시지만 토큰화
+    '''
+    return ContextBudgetMiddleware(model_key)
@@ -0,0 +1,191 @@
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain.agents import AgentState
+from langchain.agents.middleware import AgentMiddleware, PIIDetectionError
+from langchain.messages import AIMessage, HumanMessage, RemoveMessage
+from langchain_core.messages import BaseMessage
+from langgraph.runtime import Runtime
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# --- PII 탐지기 (유형, 정규식, 처리 방식) ---
+# 앞에 있을수록 우선 (같은 위치에서 겹치면 먼저 적힌 탐지기가 채택)
+# - redact: "[REDACTED_유형]" 으로 치환 / mask: 마지막 4자리만 표시 / block: PIIDetectionError 로 실행 중단
+PII_DETECTORS = [
+    ("api_key", r"sk-[a-zA-Z0-9]{32}", "block"),                                   # 예: sk-xxxxxxxx...
+    ("email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "redact"),    # test@example.com → [REDACTED_EMAIL]
+    ("credit_card", r"\b(?:\d[ -]*?){13,19}\b", "mask"),                           # 1234-5678-9012-3456 → ****-****-****-3456
+]
+
+# --- 회사 정책 금칙어 (사용자 입력, 대소문자 무시) ---
+POLICY_WORDS = [
+    "password", "apikey", "api_key", "api-key", "secret",
+    "주민등록번호", "internal", "confidential"
+]
+
+# --- 정치/종교 금칙어 (모델 응답, 대소문자 무시) ---
+POLITICAL_OR_RELIGIOUS_WORDS = [
+    "정치", "대통령", "선거", "정부", "야당", "여당",
+    "보수", "진보", "민주당", "국민의힘", "정당",
+    "종교", "기독교", "천주교", "불교", "이슬람", "힌두교",
+    "신앙", "예수", "하느님", "알라", "교회", "성당", "사찰"
+]
+
+SECURITY_WARNING = (
+    "보안 정책 위반 가능성이 있는 내용이 감지되었습니다!!!\n"
+    "비밀번호, API 키, 주민등록번호 등 민감한 정보를 포함하지 말아주세요."
+)
+
+
+class WordMatcher:
+    """
+    금칙어 목록을 keyword trie(Aho-Corasick 의 goto 트리)로 만들어 정규식 하나로 컴파일
+    - 공통 접두어를 한 번만 비교하므로 단어 수가 늘어도 텍스트를 한 번만 훑음
+    - 순수 Python 상태 전이 루프보다 re 엔진(C) 실행이 빠르므로 trie → 정규식으로 변환해 사용
+    """
+
+    def __init__(self, words: Iterable[str]):
+        trie: dict = {}
+        for word in words:
+            node = trie
+            for ch in word.lower():
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self.pattern = re.compile(self._compile(trie), re.IGNORECASE)
+
+    @classmethod
+    def _compile(cls, node: dict) -> str:
+        branches = [re.escape(ch) + cls._compile(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    def search(self, text: str) -> Optional[str]:
+        match = self.pattern.search(text)
+        return match.group(0) if match else None
+
+
+def _mask(value: str) -> str:
+    """마지막 4자리 숫자만 남기고 나머지 숫자는 * 처리 (구분자 유지)"""
+    digits = sum(ch.isdigit() for ch in value)
+    seen = 0
+    masked = []
+    for ch in value:
+        if ch.isdigit():
+            seen += 1
+            masked.append(ch if seen > digits - 4 else "*")
+        else:
+            masked.append(ch)
+    return "".join(masked)
+
+
+class GuardrailScanner:
+    """모든 PII 탐지기를 정규식 하나(named group 결합)로, 금칙어는 WordMatcher 로 1회 컴파일"""
+
+    def __init__(self, detectors=PII_DETECTORS, policy_words=POLICY_WORDS,
+                 output_words=POLITICAL_OR_RELIGIOUS_WORDS):
+        self.strategies = {pii_type: strategy for pii_type, _, strategy in detectors}
+        self.pii_pattern = re.compile("|".join(f"(?P<{pii_type}>{pattern})" for pii_type, pattern, _ in detectors))
+        self.policy = WordMatcher(policy_words)
+        self.output = WordMatcher(output_words)
+
+    def apply_pii(self, text: str) -> str:
+        """한 번 훑으면서 redact/mask 치환, block 유형이 있으면 PIIDetectionError"""
+        blocked: Dict[str, List[dict]] = {}
+        parts, last = [], 0
+        for match in self.pii_pattern.finditer(text):
+            pii_type = match.lastgroup
+            strategy = self.strategies[pii_type]
+            if strategy == "block":
+                blocked.setdefault(pii_type, []).append(
+                    {"type": pii_type, "value": match.group(), "start": match.start(), "end": match.end()})
+                continue
+            parts.append(text[last:match.start()])
+            parts.append(f"[REDACTED_{pii_type.upper()}]" if strategy == "redact" else _mask(match.group()))
+            last = match.end()
+        if blocked:
+            pii_type, matches = next(iter(blocked.items()))
+            raise PIIDetectionError(pii_type, matches)
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+
+class GuardrailMiddleware(AgentMiddleware):
+    """
+    입력/출력 가드레일 통합 미들웨어 (PII 3종 + 보안 금칙어 + 정치/종교 응답 필터)
+    - 모델 호출 전: 마지막 사용자 입력 PII 처리 → 마지막 메시지 보안 금칙어 검사
+      (위반 시 해당 메시지 삭제 + 경고 메시지 추가)
+    - 모델 호출 후: 응답에 정치/종교 금칙어가 있으면 응답 삭제
+    - 이미 검사한 메시지 id 는 다시 검사하지 않음 (긴 대화에서도 턴당 새 메시지만 검사)
+    """
+
+    def __init__(self, scanner: Optional[GuardrailScanner] = None, max_tracked: int = 10000):
+        super().__init__()
+        self.scanner = scanner or GuardrailScanner()
+        self.max_tracked = max_tracked
+        self._scanned_input: "OrderedDict[str, None]" = OrderedDict()
+        self._scanned_output: "OrderedDict[str, None]" = OrderedDict()
+
+    def _is_new(self, tracked: "OrderedDict[str, None]", message: BaseMessage) -> bool:
+        return message.id is None or message.id not in tracked
+
+    def _mark(self, tracked: "OrderedDict[str, None]", message: BaseMessage):
+        if message.id is None:
+            return
+        tracked[message.id] = None
+        if len(tracked) > self.max_tracked:
+            tracked.popitem(last=False)
+
+    def before_model(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        messages = state["messages"]
+        if not messages:
+            return None
+        last = messages[-1]
+        updates: List[BaseMessage] = []
+
+        # 1. 마지막 사용자 입력 PII 처리 (치환된 메시지는 같은 id 로 교체, block 이면 예외)
+        last_human = next((m for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        if last_human is not None and self._is_new(self._scanned_input, last_human) \
+                and isinstance(last_human.content, str):
+            content = self.scanner.apply_pii(last_human.content)
+            if content != last_human.content:
+                redacted = last_human.model_copy(update={"content": content})
+                updates.append(redacted)
+                if last is last_human:
+                    last = redacted
+            if last.id != last_human.id:
+                self._mark(self._scanned_input, last_human)
+
+        # 2. 마지막 메시지 보안 금칙어 검사
+        if self._is_new(self._scanned_input, last):
+            self._mark(self._scanned_input, last)
+            if self.scanner.policy.search(str(last.content)):
+                return {"messages": [RemoveMessage(id=last.id), AIMessage(content=SECURITY_WARNING)]}
+
+        return {"messages": updates} if updates else None
+
+    def after_model(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        last = state["messages"][-1]
+        if not self._is_new(self._scanned_output, last):
+            return None
+        self._mark(self._scanned_output, last)
+        word = self.scanner.output.search(str(last.content))
+        if word:
+            logger.info(f"[GUARDRAIL] 정치/종교 관련 응답 감지 ('{word}') → 메시지 제거")
+            return {"messages": [RemoveMessage(id=last.id)]}
+        return None
+
+
+def guardrail_middleware():
+    '''
+    PII(이메일 redact / 카드번호 mask / API 키 block) + 보안 금칙어 + 정치/종교 응답 필터
+    탐지기는 1회 컴파일, 메시지는 처음 볼 때 한 번만 검사
+    '''
+    return GuardrailMiddleware()
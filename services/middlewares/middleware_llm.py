@@ -1,21 +1,30 @@
-from langchain.agents.middleware import SummarizationMiddleware
+from config import llm_configs, ACTIVE_MODEL
+from config.llm_config import LLM_CONTEXT_DEFAULT
 from services.llm import get_middleware_summary_llm
+from .background_summary import BackgroundSummarizationMiddleware
 
-def summarization_middleware():
+def summarization_middleware(model_key: str = ACTIVE_MODEL):
     """
     메시지 이력이 너무 길어지면 요약하여 컨텍스트를 압축함
+    요약은 응답 후 백그라운드에서 수행하고 다음 턴에 적용 (컨텍스트가 넘칠 때만 요청 중 동기 요약)
+    요약 기준은 모델별 토큰 예산(llm_configs 의 "context")에서 계산 → 예산 미들웨어가 이력을 지우기 전에 요약
     """
     model = get_middleware_summary_llm()
-    
-    return SummarizationMiddleware(          # 요약 미들웨어 추가
-            model=model,                  # 요약에 사용할 모델
-            max_tokens_before_summary=4000,  # 토큰 수가 4000에 도달하면 요약 실행
-            messages_to_keep=20,             # 요약 후 최근 2개의 메시지만 유지
+    context_conf = {**LLM_CONTEXT_DEFAULT, **llm_configs[model_key].get("context", {})}
+    max_history_tokens = context_conf["max_history_tokens"]
+
+    return BackgroundSummarizationMiddleware(   # 요약 미들웨어 추가
+            model=model,                      # 요약에 사용할 모델
+            # 예산 × summary_ratio 에 도달하면 백그라운드 요약 등록 (기본 8000 → 4000)
+            max_tokens_before_summary=int(max_history_tokens * context_conf["summary_ratio"]),
+            # 요약이 아직 없는데 예산 × summary_sync_ratio 를 넘으면 요청 중 동기 요약 (기본 8000 → 7000)
+            max_tokens_before_sync=int(max_history_tokens * context_conf["summary_sync_ratio"]),
+            messages_to_keep=20,              # 요약 후 최근 20개의 메시지만 유지
             summary_prompt="""
             이전 대화 내용을 간결하게 요약하되, 핵심 정보와 결론을 유지하세요.
             불필요한 인사말, 반복된 문장은 생략하고, 사용자의 의도와 모델의 주요 응답만 포함하세요.
             요약 형식:
-            - 주요 내용 요약: 
+            - 주요 내용 요약:
             """  # 선택적 요약 프롬프트
             )
-    
\ No newline at end of file
+
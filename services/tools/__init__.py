@@ -1,15 +1,23 @@
+from .registry import ToolRegistry, LazyResource
 from .utils import get_current_date
-from .stock import get_kospi_index
+from .stock import get_kospi_index, get_kospi_trend
 from .search import get_tavily_tool
 from .retriever import get_retrieve_context
 from .db_test import search_service_requests
 
+# 도구 등록 (실제 생성은 처음 사용할 때 한 번만)
+tool_registry = ToolRegistry()
+tool_registry.register("get_current_date", lambda: get_current_date)
+tool_registry.register("get_kospi_index", lambda: get_kospi_index)
+tool_registry.register("get_kospi_trend", lambda: get_kospi_trend)
+tool_registry.register("tavily_search", lambda: get_tavily_tool(max_results=3))  # 검색 결과 개수 설정
+tool_registry.register("get_retrieve_context", lambda: get_retrieve_context)
+tool_registry.register("search_service_requests", lambda: search_service_requests)
+
 def get_all_tools():
-    """에이전트가 사용할 모든 도구 리스트를 반환합니다."""
-    return [
-        get_current_date,
-        get_kospi_index,
-        get_tavily_tool(max_results=3),  # 검색 결과 개수 설정
-        get_retrieve_context,
-        search_service_requests
-    ]
\ No newline at end of file
+    """에이전트가 사용할 모든 도구 리스트를 반환합니다. (프로세스 내 동일 객체 재사용)"""
+    return tool_registry.get_all()
+
+def get_tool_map():
+    """도구 이름 → 도구 객체 인덱스를 반환합니다."""
+    return tool_registry.get_tool_map()
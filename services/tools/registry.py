@@ -0,0 +1,84 @@
+# services/tools/registry.py
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+from langchain_core.tools import BaseTool
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LazyResource:
+    """
+    처음 사용할 때 한 번만 생성되는 자원 (검색 클라이언트, 벡터 DB 핸들, 라이브러리 모듈 등)
+    - 여러 스레드가 동시에 get() 해도 factory는 한 번만 실행됩니다.
+    - 생성에 실패하면 캐시하지 않고, 다음 호출 때 다시 시도합니다.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        self.factory = factory
+        self.name = name or getattr(factory, "__name__", "resource")
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                logger.info(f"[TOOLS] 자원 생성: {self.name}")
+                self._value = self.factory()
+                self._loaded = True
+        return self._value
+
+    def reset(self):
+        """다음 get() 때 다시 생성되도록 초기화"""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+
+class ToolRegistry:
+    """
+    도구 레지스트리 - 도구를 프로세스당 한 번만 생성해서 재사용합니다.
+    - register(): 도구를 만드는 factory만 등록 (import 시점에는 생성하지 않음)
+    - get_all() / get_tool_map(): 처음 호출될 때 생성하고 이후에는 같은 객체 반환
+    - cache: 결과 캐시 옵션 (None=tool_cache_configs 설정 따름 / False=캐시 안 함 / dict=직접 지정)
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, LazyResource] = {}  # 등록 순서 유지
+
+    def register(self, name: str, factory: Callable[[], BaseTool], cache: Optional[Union[bool, dict]] = None):
+        self._resources[name] = LazyResource(lambda: self._with_cache(name, factory(), cache), name=name)
+
+    @staticmethod
+    def _with_cache(name: str, tool: BaseTool, cache: Optional[Union[bool, dict]]) -> BaseTool:
+        from config import tool_cache_configs
+        from services.cache import get_tool_cache, CachedTool
+
+        if cache is False:
+            return tool
+        conf = cache if isinstance(cache, dict) else tool_cache_configs["tools"].get(name)
+        result_cache = get_tool_cache()
+        if not conf or result_cache is None:
+            return tool
+        logger.info(f"[TOOLS] 결과 캐시 적용: {name} (ttl={conf['ttl']}s, stale={conf.get('stale_ttl', 0)}s)")
+        return CachedTool.wrap(tool, result_cache, ttl=conf["ttl"], stale_ttl=conf.get("stale_ttl", 0.0),
+                               skip_if_contains=conf.get("skip_if_contains"))
+
+    def get(self, name: str) -> BaseTool:
+        if name not in self._resources:
+            raise KeyError(f"등록되지 않은 도구입니다: {name}")
+        return self._resources[name].get()
+
+    def get_all(self) -> List[BaseTool]:
+        return [resource.get() for resource in self._resources.values()]
+
+    def get_tool_map(self) -> Dict[str, BaseTool]:
+        """도구 이름(tool.name) → 도구 객체 인덱스"""
+        return {tool.name: tool for tool in self.get_all()}
@@ -1,5 +1,8 @@
-import FinanceDataReader as fdr
 from langchain_core.tools import tool
+from database.timeseries import get_timeseries_store
+
+def _signed(value: float) -> str:
+    return f"{'+' if value > 0 else ''}{value:.2f}"
 
 @tool
 def get_kospi_index() -> str:
@@ -8,21 +11,39 @@ def get_kospi_index() -> str:
     주식 시장의 전반적인 흐름을 파악할 때 사용합니다.
     """
     try:
-        df = fdr.DataReader('KS11')
-        if df.empty:
+        # 로컬 저장소의 메모리 스냅샷에서 조회 (전체 이력을 매번 받지 않음, 갱신은 백그라운드)
+        latest = get_timeseries_store("KS11").change(1)
+        if latest is None:
             return "코스피 데이터를 찾을 수 없습니다."
-            
-        last_row = df.iloc[-1]
-        prev_row = df.iloc[-2]
-        
-        current_price = last_row['Close']
-        prev_price = prev_row['Close']
-        change = current_price - prev_price
-        change_percent = (change / prev_price) * 100
-        date_str = df.index[-1].strftime('%Y-%m-%d')
-        
-        return (f"[{date_str} 기준] 현재 KOSPI 지수: {current_price:.2f} "
-                f"({'+' if change > 0 else ''}{change:.2f}, "
-                f"{'+' if change > 0 else ''}{change_percent:.2f}%)")
+
+        return (f"[{latest['date']} 기준] 현재 KOSPI 지수: {latest['close']:.2f} "
+                f"({_signed(latest['change'])}, {_signed(latest['change_percent'])}%)")
+    except Exception as e:
+        return f"코스피 지수 조회 중 오류 발생: {str(e)}"
+
+@tool
+def get_kospi_trend(days: int = 20) -> str:
+    """
+    최근 N 거래일 동안의 코스피(KOSPI) 지수 변화와 이동평균(5/20/60/120일)을 알려줍니다.
+    지수의 추세(상승/하락 흐름)나 기간 수익률을 물을 때 사용합니다. days 는 1 이상, 기본값은 20 거래일입니다.
+    """
+    if days < 1:
+        return f"days 는 1 이상의 거래일 수여야 합니다. (입력값: {days})"
+    try:
+        store = get_timeseries_store("KS11")
+        trend = store.change(days)
+        if trend is None:
+            return f"최근 {days} 거래일 코스피 데이터가 부족합니다."
+
+        averages = []
+        for window in (5, 20, 60, 120):
+            average = store.moving_average(window)
+            if average is not None:
+                averages.append(f"{window}일 {average:.2f}")
+
+        return (f"[{trend['base_date']} ~ {trend['date']}, {days} 거래일] KOSPI "
+                f"{trend['base_close']:.2f} → {trend['close']:.2f} "
+                f"({_signed(trend['change'])}, {_signed(trend['change_percent'])}%)\n"
+                f"이동평균: {', '.join(averages)}")
     except Exception as e:
-        return f"코스피 지수 조회 중 오류 발생: {str(e)}"
\ No newline at end of file
+        return f"코스피 추세 조회 중 오류 발생: {str(e)}"
@@ -0,0 +1,86 @@
+"""
+HyperCLOVAX 로컬 모델 CPU 실행 방식 비교: fp32 vs int8 동적 양자화
+- test_0_5b.py / test_1_5b.py 와 같은 로컬 모델 폴더를 사용합니다.
+- 방식마다 별도 프로세스에서 측정해서 메모리(RSS)가 서로 섞이지 않게 합니다.
+- int8 은 첫 실행 때 변환 후 database/cache/quantized 에 저장하므로, 두 번째 실행부터의 로드 시간이 실제 재시작 시간입니다.
+
+실행: python slm/naver-hyperclovax/bench_quantization.py [--model 0.5B|1.5B] [--max-new-tokens 64]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+current_folder_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(current_folder_path, "..", "..")))  # 프로젝트 루트
+
+PROMPT = "안녕하세요! 자기소개 좀 해주세요."
+MODES = {"fp32": None, "int8_dynamic": "int8_dynamic"}
+
+
+def rss_mb() -> float:
+    """현재 프로세스 최대 RSS (MB, Linux 기준 KB 단위)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(model_folder: str, mode: str, max_new_tokens: int) -> dict:
+    import torch
+    from transformers import AutoTokenizer
+    from services.llm.quantization import load_causal_lm
+
+    local_model_path = os.path.join(current_folder_path, model_folder)
+
+    start = time.perf_counter()
+    tokenizer = AutoTokenizer.from_pretrained(local_model_path, trust_remote_code=True)
+    model = load_causal_lm(
+        local_model_path,
+        {"device_map": "cpu", "trust_remote_code": True},
+        quantization={"mode": MODES[mode]}
+    )
+    load_seconds = time.perf_counter() - start
+
+    inputs = tokenizer(PROMPT, return_tensors="pt")
+    with torch.inference_mode():
+        model.generate(**inputs, max_new_tokens=8, do_sample=False)  # 워밍업
+        start = time.perf_counter()
+        output = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+        generate_seconds = time.perf_counter() - start
+
+    new_tokens = output.shape[1] - inputs["input_ids"].shape[1]
+    return {
+        "mode": mode,
+        "load_seconds": round(load_seconds, 2),
+        "rss_mb": round(rss_mb(), 1),
+        "tokens_per_sec": round(new_tokens / generate_seconds, 2),
+        "sample": tokenizer.decode(output[0, inputs["input_ids"].shape[1]:], skip_special_tokens=True)[:60],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", choices=["0.5B", "1.5B"], default="0.5B")
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--mode", choices=list(MODES), help="(내부용) 한 가지 방식만 측정하고 JSON 출력")
+    args = parser.parse_args()
+
+    model_folder = f"HyperCLOVAX-SEED-Text-Instruct-{args.model}"
+    if args.mode:
+        print(json.dumps(measure(model_folder, args.mode, args.max_new_tokens), ensure_ascii=False))
+        return
+
+    print(f"📊 {model_folder} / CPU / max_new_tokens={args.max_new_tokens}")
+    for mode in MODES:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--model", args.model, "--max-new-tokens", str(args.max_new_tokens), "--mode", mode],
+            capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f" - [{mode:>12}] 로드 {result['load_seconds']:6.2f}초 / RSS {result['rss_mb']:8.1f} MB "
+              f"/ {result['tokens_per_sec']:6.2f} tokens/sec / 답변: {result['sample']!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,21 @@
 async function sendMessage() {
     const inputField = document.getElementById("user-input");
     const messageText = inputField.value.trim();
-    
+
     if (messageText === "") return;
 
     // 1. 내 메시지 화면에 추가
     addMessage(messageText, "user");
     inputField.value = ""; // 입력창 비우기
 
-    // 2. 로딩 표시 (선택사항)
-    // const loadingId = addMessage("생각 중...", "ai");
+    // 2. AI 말풍선을 미리 만들어 두고, 토큰이 올 때마다 채워 넣음
+    const bubble = addMessage("", "ai");
+    const status = addStatus(bubble);
+    let answer = "";
 
     try {
-        // 3. 서버로 전송 (Fetch API)
-        const response = await fetch("/chat", {
+        // 3. 서버로 전송 (Fetch API + Server-Sent Events 스트림)
+        const response = await fetch("/chat/stream", {
             method: "POST",
             headers: {
                 "Content-Type": "application/json"
@@ -27,21 +29,62 @@ async function sendMessage() {
             })
         });
 
-        const data = await response.json();
-
-        // 4. AI 응답 화면에 추가
-        addMessage(data.response, "ai");
+        // 4. 이벤트 단위로 읽어서 화면에 점진적으로 반영
+        await readEventStream(response, (event, data) => {
+            if (event === "token") {
+                answer += data.content;
+                setBubbleText(bubble, answer);
+            } else if (event === "tool_start") {
+                status.innerText = `🛠️ ${data.name} 실행 중...`;
+            } else if (event === "tool_end") {
+                status.innerText = `✅ ${data.name} 완료`;
+            } else if (event === "final" || event === "error") {
+                // 최종 답변이 기준 (토큰 누적본과 다를 수 있음)
+                setBubbleText(bubble, data.response);
+                status.remove();
+            }
+        });
 
     } catch (error) {
         console.error("Error:", error);
-        addMessage("서버 오류가 발생했습니다.", "ai");
+        setBubbleText(bubble, "서버 오류가 발생했습니다.");
+        status.remove();
+    }
+}
+
+// SSE 응답(event/data 프레임)을 파싱해서 콜백으로 전달하는 함수
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder("utf-8");
+    let buffer = "";
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        // 프레임 구분자(빈 줄) 기준으로 완성된 이벤트만 처리
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) >= 0) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = "message";
+            let data = "";
+            for (const line of frame.split("\n")) {
+                if (line.startsWith("event: ")) event = line.slice(7);
+                else if (line.startsWith("data: ")) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
     }
 }
 
-// 화면에 말풍선 추가하는 함수
+// 화면에 말풍선 추가하는 함수 (말풍선 요소 반환)
 function addMessage(text, sender) {
     const chatBox = document.getElementById("chat-box");
-    
+
     const messageDiv = document.createElement("div");
     messageDiv.classList.add("message");
     messageDiv.classList.add(sender === "user" ? "user-message" : "ai-message");
@@ -55,6 +98,23 @@ function addMessage(text, sender) {
 
     // 스크롤 맨 아래로 이동
     chatBox.scrollTop = chatBox.scrollHeight;
+    return bubbleDiv;
+}
+
+// 말풍선 아래에 도구 실행 상태 표시줄 추가
+function addStatus(bubble) {
+    const statusDiv = document.createElement("div");
+    statusDiv.classList.add("status");
+    statusDiv.innerText = "생각 중...";
+    bubble.parentElement.appendChild(statusDiv);
+    return statusDiv;
+}
+
+// 말풍선 텍스트 갱신 + 스크롤 유지
+function setBubbleText(bubble, text) {
+    bubble.innerText = text;
+    const chatBox = document.getElementById("chat-box");
+    chatBox.scrollTop = chatBox.scrollHeight;
 }
 
 // 엔터키 입력 시 전송
@@ -62,4 +122,4 @@ function handleKeyPress(event) {
     if (event.key === "Enter") {
         sendMessage();
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,45 @@
+# tests/test_answer_cache.py
+"""답변 캐시 - 질문 문장만 키로 쓰므로 이전 대화가 없는 스레드(첫 질문)에서만 조회/저장"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.messages import AIMessage, HumanMessage
+
+from services.cache.answer_cache import SemanticAnswerCache
+
+QUERY = "삼성전자 최근 실적 알려줘"
+HISTORY = [HumanMessage(content="SK하이닉스 최근 실적 알려줘"), AIMessage(content="SK하이닉스 실적은 ...")]
+
+
+def make_cache() -> SemanticAnswerCache:
+    return SemanticAnswerCache(DeterministicFakeEmbedding(size=16))
+
+
+def test_first_turn_answer_is_reused_in_new_thread():
+    cache = make_cache()
+    asyncio.run(cache.store(QUERY, "삼성전자 실적은 ...", [], 3.0, history=[]))
+
+    hit = asyncio.run(cache.lookup(QUERY, history=[]))
+
+    assert hit is not None and hit.entry.answer == "삼성전자 실적은 ..."
+
+
+def test_follow_up_in_non_empty_thread_misses_cache():
+    cache = make_cache()
+    asyncio.run(cache.store(QUERY, "삼성전자 실적은 ...", [], 3.0))
+
+    # 같은 문장이라도 대화 중 후속 질문이면 조회하지 않음
+    assert asyncio.run(cache.lookup(QUERY, history=HISTORY)) is None
+    assert cache.stats()["exact_hits"] == 0
+
+
+def test_follow_up_answer_is_not_stored():
+    cache = make_cache()
+    asyncio.run(cache.store(QUERY, "앞 대화 맥락에 따른 답변", [], 3.0, history=HISTORY))
+
+    assert cache.stats()["entries"] == 0
+    assert asyncio.run(cache.lookup(QUERY)) is None
@@ -0,0 +1,54 @@
+# tests/test_graph_tool_routing.py
+"""그래프 에이전트 도구 실행 경로 - 동기 도구는 제한된 스레드 풀(_tool_executor), async 도구는 이벤트 루프"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.agents import AgentAction
+from langchain_core.tools import tool
+
+import agents.graph as graph
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@tool
+def sync_tool(query: str = "") -> str:
+    """동기 도구"""
+    return "sync"
+
+
+@tool
+async def async_tool(query: str = "") -> str:
+    """async 도구"""
+    return "async"
+
+
+def test_is_async_tool():
+    assert graph._is_async_tool(sync_tool) is False
+    assert graph._is_async_tool(async_tool) is True
+
+
+def test_sync_tool_runs_on_tool_executor(monkeypatch):
+    executor = CountingExecutor()
+    monkeypatch.setattr(graph, "_tool_executor", executor)
+    execute_tools = graph.make_execute_tools({"sync_tool": sync_tool, "async_tool": async_tool})
+
+    actions = [AgentAction(tool="sync_tool", tool_input="", log=""),
+               AgentAction(tool="async_tool", tool_input="", log="")]
+    result = asyncio.run(execute_tools({"agent_outcome": actions}))
+
+    assert [output for _, output in result["intermediate_steps"]] == ["sync", "async"]
+    assert executor.submitted == 1
+    executor.shutdown()
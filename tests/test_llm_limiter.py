@@ -0,0 +1,125 @@
+# tests/test_llm_limiter.py
+"""LLM 동시 호출 한도(AIMD) - 성능이 나빠졌다 회복되는 stub 전송 계층으로 한도 감소/회복과 거절(429) 확인"""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from services.llm.limiter import AdaptiveConcurrencyLimiter, AsyncLimitedTransport
+
+URL = "http://llm.test/v1/chat/completions"
+
+
+class DegradingTransport(httpx.AsyncBaseTransport):
+    """latency/status 를 바꿔 가며 응답하는 stub (gate 가 있으면 열릴 때까지 응답을 붙잡음)"""
+
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.status = 200
+        self.gate = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.latency)
+        return httpx.Response(self.status, json={"choices": []}, request=request)
+
+
+def make_client(limiter: AdaptiveConcurrencyLimiter, stub: DegradingTransport) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=AsyncLimitedTransport(stub, limiter))
+
+
+async def send(client: httpx.AsyncClient, count: int):
+    for _ in range(count):
+        await client.post(URL, json={})
+
+
+def test_limit_decreases_on_latency_spike_and_recovers():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+        stub = DegradingTransport(latency=0.005)
+        async with make_client(limiter, stub) as client:
+            await send(client, 10)
+            healthy = limiter.limit
+            assert healthy > 8
+
+            stub.latency = 0.05   # 응답 지연 10배
+            await send(client, 15)
+            degraded = limiter.limit
+            assert degraded < healthy
+            assert limiter.stats_counter["decreases"] >= 1
+
+            stub.latency = 0.005
+            await send(client, 20)
+            assert limiter.limit > degraded
+
+    asyncio.run(scenario())
+
+
+def test_limit_decreases_on_overload_responses_and_recovers():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+        stub = DegradingTransport(latency=0.005)
+        async with make_client(limiter, stub) as client:
+            await send(client, 5)
+            healthy = limiter.limit
+
+            stub.status = 503
+            await send(client, 5)
+            degraded = limiter.limit
+            assert degraded <= healthy * limiter.backoff
+            assert limiter.stats_counter["overloads"] == 5
+
+            stub.status = 200
+            await send(client, 10)
+            assert limiter.limit > degraded
+
+    asyncio.run(scenario())
+
+
+def assert_rejected(response: httpx.Response):
+    assert response.status_code == 429
+    assert response.headers["x-should-retry"] == "false"
+    assert response.json()["error"]["code"] == "llm_overloaded"
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, max_queue=1, queue_timeout=5.0)
+        stub = DegradingTransport()
+        stub.gate = asyncio.Event()
+        async with make_client(limiter, stub) as client:
+            running = asyncio.create_task(client.post(URL, json={}))   # 한도 1자리 사용
+            await asyncio.sleep(0.01)
+            queued = asyncio.create_task(client.post(URL, json={}))    # 대기열 1자리 사용
+            await asyncio.sleep(0.01)
+
+            assert_rejected(await client.post(URL, json={}))
+            assert limiter.stats_counter["rejected_full"] == 1
+
+            stub.gate.set()
+            assert (await running).status_code == 200
+            assert (await queued).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_missed_deadline_is_rejected_with_429():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, queue_timeout=0.05)
+        stub = DegradingTransport()
+        stub.gate = asyncio.Event()
+        async with make_client(limiter, stub) as client:
+            running = asyncio.create_task(client.post(URL, json={}))
+            await asyncio.sleep(0.01)
+
+            assert_rejected(await client.post(URL, json={}))
+            assert limiter.stats_counter["rejected_timeout"] == 1
+            assert limiter.stats()["queue_depth"] == 0
+
+            stub.gate.set()
+            assert (await running).status_code == 200
+            assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+# tests/test_model_registry.py
+"""모델 레지스트리 - 역할별 view 의 응답 캐시는 기본 객체에서 물려받지 않고 view 설정(temperature)으로 결정"""
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from services.llm.registry import ModelRegistry
+
+MAX_TEMPERATURE = 0.3
+
+
+def make_registry(temperature: float) -> ModelRegistry:
+    caches = {}
+
+    def cache_factory(model_key: str, conf: dict):
+        if conf["temperature"] > MAX_TEMPERATURE:
+            return None
+        return caches.setdefault(model_key, InMemoryCache())
+
+    def factory(model_key: str):
+        llm = FakeListChatModel(responses=["ok"])
+        llm.cache = cache_factory(model_key, configs[model_key])
+        return llm
+
+    configs = {"main": {"provider": "fake", "temperature": temperature}}
+    return ModelRegistry(factory, configs, cache_factory=cache_factory)
+
+
+def test_low_temperature_view_of_uncached_model_gets_cache():
+    registry = make_registry(temperature=1.0)
+
+    assert registry.get("main").cache is None
+    assert isinstance(registry.get("main", temperature=0.0).cache, InMemoryCache)
+
+
+def test_high_temperature_view_of_cached_model_drops_cache():
+    registry = make_registry(temperature=0.0)
+
+    assert isinstance(registry.get("main").cache, InMemoryCache)
+    assert registry.get("main", temperature=0.9).cache is None
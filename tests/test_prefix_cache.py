@@ -0,0 +1,89 @@
+# tests/test_prefix_cache.py
+"""공통 prefix KV 캐시 - 반복 prefix 탐지 기준과 prefix hit 요청의 배치 생성 결과"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from services.llm.local_engine import BatchedGenerationEngine
+from services.llm.prefix_cache import PrefixKVCache
+
+SYSTEM = "You are a helpful advisor. Follow the ReAct format strictly. " * 3
+QUESTIONS = ["What is the weather today?", "Summarize the quarterly report.", "List open service requests.",
+             "Explain KV caching briefly.", "How do I reset my password?", "Compare Nike and Adidas revenue.",
+             "Translate hello to Korean.", "Give me three stock tips."]
+
+
+class FakeBuildCache(PrefixKVCache):
+    """KV 계산 없이 탐지/집계만 확인"""
+
+    def _build(self, prefix):
+        return object()
+
+
+def test_react_steps_do_not_build_prefixes():
+    cache = FakeBuildCache(None, min_prefix_tokens=32)
+    system, tail = list(range(1000, 1200)), [1, 2, 3]
+    prompt = system + [5, 6, 7, 8, 9]
+    for step in range(8):  # 한 대화의 ReAct 단계 - 매번 이전 프롬프트를 포함하며 길어짐
+        assert cache.match(prompt + tail) is None
+        prompt = prompt + list(range(3000 + step * 40, 3040 + step * 40))
+    assert cache.stats()["prefixes_built"] == 0
+
+    # 다른 요청 2개 이상에서 반복된 앞부분만 저장, 계산한 요청은 miss
+    for question in range(3):
+        cache.match(system + [7000 + question * 10 + i for i in range(12)] + tail)
+    stats = cache.stats()
+    assert stats["prefixes_built"] == 1 and stats["hits"] == 1
+    assert [len(prefix) for prefix in cache._entries] == [200]
+
+
+def test_warmed_prefix_is_not_evicted():
+    cache = FakeBuildCache(None, max_entries=1, min_prefix_tokens=4)
+    cache.warm([1, 2, 3, 4, 5])
+    for base in (100, 200, 300):  # 반복 prefix 여러 개 → LRU 삭제 발생
+        for question in range(3):
+            cache.match([base] * 10 + [base + 50 + question] * 12)
+    assert (1, 2, 3, 4, 5) in cache._entries
+
+
+def _tiny_model_and_tokenizer():
+    vocab = {"<pad>": 0, "<eos>": 1, "<unk>": 2}
+    for code in range(32, 127):
+        vocab.setdefault(chr(code), len(vocab))
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.Split("", "isolated")
+    backend.decoder = tokenizers.decoders.Fuse()
+    tokenizer = transformers.PreTrainedTokenizerFast(tokenizer_object=backend, pad_token="<pad>",
+                                                     eos_token="<eos>", unk_token="<unk>")
+    torch.manual_seed(0)
+    config = transformers.LlamaConfig(vocab_size=len(vocab), hidden_size=64, intermediate_size=128,
+                                      num_hidden_layers=2, num_attention_heads=4, num_key_value_heads=2,
+                                      max_position_embeddings=1024)
+    return transformers.LlamaForCausalLM(config).eval(), tokenizer
+
+
+def test_prefix_hits_are_batched_with_same_output():
+    model, tokenizer = _tiny_model_and_tokenizer()
+    gen_kwargs = {"max_new_tokens": 8, "do_sample": False}
+    plain = BatchedGenerationEngine(model, tokenizer, default_gen_kwargs=gen_kwargs, max_batch_size=8, max_wait_ms=50)
+    cache = PrefixKVCache(model, min_prefix_tokens=32)
+    cached = BatchedGenerationEngine(model, tokenizer, default_gen_kwargs=gen_kwargs, max_batch_size=8,
+                                     max_wait_ms=50, prefix_cache=cache)
+    try:
+        expected = [plain.generate(SYSTEM + question) for question in QUESTIONS]
+        for question in QUESTIONS[:3]:  # 공통 prefix 탐지/계산
+            cached.generate(SYSTEM + question)
+        batches_before = cached.stats_counter["batches"]
+        with ThreadPoolExecutor(max_workers=len(QUESTIONS)) as executor:
+            results = list(executor.map(lambda question: cached.generate(SYSTEM + question), QUESTIONS))
+
+        assert results == expected
+        assert cache.stats()["hits"] >= len(QUESTIONS) - 1
+        assert cached.stats_counter["batches"] - batches_before < len(QUESTIONS)  # 단독 실행이 아니라 배치
+    finally:
+        plain.close()
+        cached.close()
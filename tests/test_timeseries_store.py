@@ -0,0 +1,121 @@
+# tests/test_timeseries_store.py
+"""시세 저장소(TimeSeriesStore) - 최초 전체 이력 1회 + 마지막 저장일부터 증분 갱신, 실패 시 이전 데이터 유지, Parquet 재적재"""
+import time
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import numpy as np
+
+from database.timeseries.store import TimeSeriesStore
+
+
+class StubSource:
+    """FinanceDataReader.DataReader 와 같은 형태의 가짜 데이터 소스 (요청 구간/행 수 기록)"""
+
+    def __init__(self, request_latency: float = 0.0, row_latency: float = 0.0, end: str = "2025-01-02",
+                 begin: str = "1990-01-03"):
+        self.request_latency = request_latency
+        self.row_latency = row_latency
+        self.begin = pd.Timestamp(begin)
+        self.end = pd.Timestamp(end)
+        self.closes = {}      # 날짜 → 종가 (장중 값이 종가로 바뀌는 상황 흉내)
+        self.fail = False
+        self.requests = []
+
+    def frame(self, start=None) -> pd.DataFrame:
+        dates = pd.bdate_range(self.begin, self.end)
+        closes = 700 + np.cumsum(np.random.default_rng(0).normal(0, 8, len(dates))).clip(-600)
+        frame = pd.DataFrame({"Open": closes, "High": closes + 5, "Low": closes - 5, "Close": closes,
+                              "Volume": 1e8, "UpDown": "1"}, index=dates)
+        for date, close in self.closes.items():
+            frame.loc[pd.Timestamp(date), "Close"] = close
+        return frame.loc[start:] if start else frame
+
+    def __call__(self, symbol, start=None, end=None) -> pd.DataFrame:
+        if self.fail:
+            self.requests.append((start, None))
+            raise ConnectionError("stub source down")
+        frame = self.frame(start)
+        time.sleep(self.request_latency + self.row_latency * len(frame))
+        self.requests.append((start, len(frame)))
+        return frame
+
+
+def make_store(source: StubSource, directory) -> TimeSeriesStore:
+    return TimeSeriesStore("KS11", directory, source=source, refresh_interval=3600, snapshot_size=30)
+
+
+def test_full_fetch_once_then_incremental_from_last_stored_date(tmp_path):
+    source = StubSource(end="2025-01-02")
+    store = make_store(source, tmp_path)
+
+    store.ensure_loaded()
+    assert source.requests == [(None, len(source.frame()))]
+
+    source.end = pd.Timestamp("2025-01-06")
+    assert store.refresh(wait=True)
+    assert source.requests[1] == ("2025-01-02", 3)   # 마지막 저장일(01-02)부터 01-03, 01-06 까지
+    assert store.change(1)["date"] == "2025-01-06"
+    assert store.stats()["full_fetches"] == 1
+    assert len(store.history()) == len(source.frame())
+
+
+def test_refetched_last_day_overwrites_stored_row(tmp_path):
+    source = StubSource(end="2025-01-02")
+    source.closes["2025-01-02"] = 2400.0   # 장중 값
+    store = make_store(source, tmp_path)
+    store.ensure_loaded()
+
+    source.closes["2025-01-02"] = 2450.0   # 장 마감 후 종가
+    store.refresh(wait=True)
+
+    history = store.history("2025-01-02")
+    assert len(history) == 1 and history["Close"].iloc[0] == 2450.0
+    assert store.change(1)["close"] == 2450.0
+
+
+def test_failed_refresh_keeps_previous_snapshot(tmp_path):
+    source = StubSource(end="2025-01-02")
+    store = make_store(source, tmp_path)
+    store.ensure_loaded()
+    before = store.change(5)
+
+    source.fail = True
+    source.end = pd.Timestamp("2025-01-06")
+    assert store.refresh(wait=True) is False
+
+    assert store.change(5) == before
+    assert store.stats()["failures"] == 1
+    assert store.stats()["last_date"] == "2025-01-02"
+
+
+def test_queries_return_none_when_data_is_short_and_reject_days_below_one(tmp_path):
+    source = StubSource(begin="2024-12-27", end="2025-01-02")   # 5 거래일
+    store = make_store(source, tmp_path)
+
+    assert store.change(4) is not None
+    assert store.change(5) is None
+    assert store.moving_average(5) is not None
+    assert store.moving_average(6) is None
+    with pytest.raises(ValueError):
+        store.change(0)
+    with pytest.raises(ValueError):
+        store.moving_average(0)
+
+
+def test_new_instance_reloads_from_parquet_without_calling_source(tmp_path):
+    source = StubSource(end="2025-01-02")
+    store = make_store(source, tmp_path)
+    store.ensure_loaded()
+    expected = store.change(20)
+
+    source.requests.clear()
+    restarted = make_store(source, tmp_path)
+
+    assert restarted.change(20) == expected
+    assert restarted.stats()["rows"] == len(source.frame())
+    time.sleep(0.05)   # 파일이 최신이므로 조회 쪽 백그라운드 갱신도 예약되지 않음
+    assert source.requests == []